@@ -0,0 +1,138 @@
+"""
+A2A client benchmark
+
+Serves a scripted news agent over A2A in this process (uvicorn on a
+background thread, no network or API key needed) and calls it through:
+
+- ``stock``: a new ``RemoteA2aAgent`` per call, i.e. a new HTTP client, a
+  new connection and an agent card request every time, which is what each
+  synthesis paid before the client layer;
+- ``pooled``: the synthesizer's ``LazyRemoteA2aAgent``, which reuses its
+  keep-alive connection pool and the cached agent card.
+
+It reports the call latency, the number of HTTP requests the server saw and
+how many card lookups hit the cache.
+
+Run from the ``11-parallel-agent`` directory:
+
+    python -m benchmarks.bench_a2a_client --calls 50 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import threading
+import time
+from typing import Dict, List
+
+import uvicorn
+from google.adk.a2a.utils.agent_to_a2a import to_a2a
+from google.adk.agents import LlmAgent
+from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from system_monitor_agent.metrics import registry
+from system_monitor_agent.offline import ScriptedLlm
+from system_monitor_agent.subagents.synthesizer_agent.a2a_client import card_cache
+from system_monitor_agent.subagents.synthesizer_agent.remote import LazyRemoteA2aAgent
+
+from .bench_pipeline import percentile
+
+CARD_PATH = "/.well-known/agent-card.json"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, latency: float) -> uvicorn.Server:
+    news_agent = LlmAgent(
+        name="news_agent",
+        model=ScriptedLlm(latency=latency, output_chars=400),
+        description="Scripted local news",
+        instruction="Give the latest local news.",
+    )
+    app = to_a2a(news_agent, host="127.0.0.1", port=port)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def call(agent, text: str) -> float:
+    runner = InMemoryRunner(agent=agent, app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="user")
+    start = time.perf_counter()
+    async for event in runner.run_async(
+        user_id="user",
+        session_id=session.id,
+        new_message=types.Content(role="user", parts=[types.Part(text=text)]),
+    ):
+        if event.error_message:
+            raise RuntimeError(event.error_message)
+    return time.perf_counter() - start
+
+
+async def run_mode(mode: str, url: str, calls: int, concurrency: int) -> Dict[str, float]:
+    pooled = LazyRemoteA2aAgent(name="remote_news_agent", agent_card=url)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            if mode == "pooled":
+                latencies.append(await call(pooled, f"news {i}"))
+                return
+            agent = RemoteA2aAgent(name="remote_news_agent", agent_card=url)
+            try:
+                latencies.append(await call(agent, f"news {i}"))
+            finally:
+                await agent.cleanup()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    wall = time.perf_counter() - start
+    await pooled.cleanup()
+    return {
+        "wall_s": wall,
+        "p50_ms": percentile(latencies, 50) * 1e3,
+        "p95_ms": percentile(latencies, 95) * 1e3,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="remote model latency (s)")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(port, args.latency)
+    # to_a2a turns on INFO logging; one line per request would drown the results.
+    logging.disable(logging.INFO)
+    url = f"http://127.0.0.1:{port}{CARD_PATH}"
+    try:
+        for mode in ("stock", "pooled"):
+            registry.clear()
+            card_cache.invalidate()
+            requests_before = server.server_state.total_requests
+            result = asyncio.run(run_mode(mode, url, args.calls, args.concurrency))
+            hits = registry.value("a2a_agent_card_total", {"result": "hit"})
+            print(
+                f"{mode:>6}: {result['wall_s']:.2f}s wall, call p50 {result['p50_ms']:.1f} ms, "
+                f"p95 {result['p95_ms']:.1f} ms, "
+                f"{server.server_state.total_requests - requests_before} HTTP requests, "
+                f"{hits:.0f} card cache hits"
+            )
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
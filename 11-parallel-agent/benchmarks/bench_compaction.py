@@ -0,0 +1,185 @@
+"""
+Event compaction benchmark
+
+Runs the same multi-turn conversation through ``root_agent`` on the offline
+scripted model twice: once with events compacted by ADK's
+``LlmEventSummarizer`` (one extra model call per compaction, on its own
+scripted model) and once with the local ``ExtractiveEventSummarizer``. It
+reports per turn latency, compaction latency, summarizer model calls and
+the context the synthesizer is sent on each turn.
+
+Run from the ``11-parallel-agent`` directory:
+
+    python -m benchmarks.bench_compaction --turns 6 --summary-latency 1.5
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.apps.app import App, EventsCompactionConfig
+from google.adk.apps.base_events_summarizer import BaseEventsSummarizer
+from google.adk.apps.llm_event_summarizer import LlmEventSummarizer
+from google.adk.events import Event
+from google.adk.models import LlmRequest
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from system_monitor_agent import root_agent
+from system_monitor_agent.compaction import ExtractiveEventSummarizer
+from system_monitor_agent.offline import ScriptedLlm, estimate_tokens, use_offline_backend
+from system_monitor_agent.subagents.local_news_agent import tools as news_tools
+from system_monitor_agent.subagents.synthesizer_agent import fashion_report_synthesizer
+from system_monitor_agent.subagents.trending_fashion_agent import snapshot as trends_snapshot
+
+from .bench_pipeline import INITIAL_STATE, percentile
+
+QUESTIONS = [
+    "How can I increase my sales?",
+    "What are the products that gave me high profit based on my retail data?",
+    "Based on trending fashion reports, which retail products might trend next?",
+    "Suggest me, how can I do invest money in ads to increase my sales",
+]
+
+
+class TimedSummarizer(BaseEventsSummarizer):
+    """Wraps a summarizer to time it and tell when a compaction is running."""
+
+    def __init__(self, inner: BaseEventsSummarizer):
+        self.inner = inner
+        self.seconds: List[float] = []
+        self.summary_tokens: List[int] = []
+        self.running = 0
+
+    async def maybe_summarize_events(self, *, events: list[Event]) -> Optional[Event]:
+        self.running += 1
+        start = time.perf_counter()
+        try:
+            event = await self.inner.maybe_summarize_events(events=events)
+        finally:
+            self.running -= 1
+        self.seconds.append(time.perf_counter() - start)
+        if event and event.actions.compaction:
+            content = event.actions.compaction.compacted_content
+            self.summary_tokens.append(
+                estimate_tokens("".join(part.text or "" for part in content.parts or []))
+            )
+        return event
+
+
+class ContextSizePlugin(BasePlugin):
+    """Records the estimated prompt tokens of every model call, per agent."""
+
+    def __init__(self):
+        super().__init__(name="context_size")
+        self.tokens: Dict[str, List[int]] = defaultdict(list)
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        text = str(llm_request.config.system_instruction or "")
+        for content in llm_request.contents:
+            for part in content.parts or []:
+                text += part.text or ""
+                if part.function_response:
+                    text += str(part.function_response.response)
+        self.tokens[callback_context.agent_name].append(estimate_tokens(text))
+        return None
+
+
+async def run_conversation(summarizer: BaseEventsSummarizer, turns: int) -> Dict[str, object]:
+    timed = TimedSummarizer(summarizer)
+    sizes = ContextSizePlugin()
+    app = App(
+        name="bench",
+        root_agent=root_agent,
+        plugins=[sizes],
+        events_compaction_config=EventsCompactionConfig(
+            summarizer=timed, compaction_interval=2, overlap_size=1
+        ),
+    )
+    runner = Runner(app=app, session_service=InMemorySessionService())
+    session = await runner.session_service.create_session(
+        app_name="bench", user_id="bench", state=dict(INITIAL_STATE)
+    )
+
+    turn_seconds: List[float] = []
+    settled_seconds: List[float] = []
+    for turn in range(turns):
+        message = types.Content(
+            role="user", parts=[types.Part(text=QUESTIONS[turn % len(QUESTIONS)])]
+        )
+        start = time.perf_counter()
+        async for _ in runner.run_async(
+            user_id="bench", session_id=session.id, new_message=message
+        ):
+            pass
+        turn_seconds.append(time.perf_counter() - start)
+        # Compaction runs in a background task after the turn; wait for it so
+        # the next turn sees its summary, and count it in the conversation time.
+        await asyncio.sleep(0)
+        while timed.running:
+            await asyncio.sleep(0.001)
+        settled_seconds.append(time.perf_counter() - start)
+
+    synthesizer = sizes.tokens[fashion_report_synthesizer.name]
+    return {
+        "turn_p50_s": percentile(turn_seconds, 50),
+        "conversation_s": sum(settled_seconds),
+        "compactions": len(timed.seconds),
+        "compaction_p50_s": percentile(timed.seconds, 50) if timed.seconds else 0.0,
+        "summary_tokens": max(timed.summary_tokens, default=0),
+        "synthesizer_context_tokens": synthesizer,
+        "all_prompt_tokens": sum(sum(tokens) for tokens in sizes.tokens.values()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.1, help="agent model latency per call (s)")
+    parser.add_argument("--output-chars", type=int, default=3000, help="agent answer size")
+    parser.add_argument(
+        "--summary-latency", type=float, default=1.5, help="summarizer model latency (s)"
+    )
+    parser.add_argument("--summary-chars", type=int, default=1500, help="LLM summary size")
+    args = parser.parse_args()
+    # to_a2a and the runner log every call at INFO level.
+    logging.disable(logging.INFO)
+
+    use_offline_backend(root_agent, latency=args.latency, output_chars=args.output_chars)
+    news_tools.news_cache.ttl = 0
+    trends_snapshot.trends_cache.ttl = 0
+
+    summary_llm = ScriptedLlm(latency=args.summary_latency, output_chars=args.summary_chars)
+    results = {}
+    for name, summarizer in (
+        ("llm", LlmEventSummarizer(llm=summary_llm)),
+        ("extractive", ExtractiveEventSummarizer()),
+    ):
+        results[name] = asyncio.run(run_conversation(summarizer, args.turns))
+
+    print(f"turns: {args.turns}, compaction every 2 turns")
+    for name, report in results.items():
+        context = report["synthesizer_context_tokens"]
+        print(
+            f"{name:<10} turn p50 {report['turn_p50_s']:.3f}s, "
+            f"conversation with compactions {report['conversation_s']:.2f}s, "
+            f"{report['compactions']} compactions p50 {report['compaction_p50_s'] * 1e3:.1f} ms, "
+            f"summary {report['summary_tokens']} tokens"
+        )
+        print(
+            f"{'':<10} synthesizer context per turn (tokens): {context}, "
+            f"all prompts {report['all_prompt_tokens']} tokens"
+        )
+    print(f"summarizer model calls: llm {summary_llm.calls}, extractive 0")
+
+
+if __name__ == "__main__":
+    main()
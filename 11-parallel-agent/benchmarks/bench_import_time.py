@@ -0,0 +1,102 @@
+"""
+Import time benchmark
+
+Imports ``system_monitor_agent`` in fresh interpreters, the way ``adk web``
+or a server process does, and reports the cold import time: in total, and
+for this package alone (ADK itself is imported first and not counted). It
+also checks the import has no side effects: no files or directories may
+appear in the working directory.
+
+Run from the ``11-parallel-agent`` directory:
+
+    python -m benchmarks.bench_import_time --runs 5 --max-ms 150
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time, warnings
+warnings.simplefilter("ignore")
+start = time.perf_counter()
+import google.adk.agents, google.adk.runners
+framework = time.perf_counter()
+import system_monitor_agent
+end = time.perf_counter()
+print(json.dumps({"total_s": end - start, "package_s": end - framework}))
+"""
+
+
+def import_once() -> Dict[str, object]:
+    with tempfile.TemporaryDirectory() as cwd:
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=cwd,
+            env={**os.environ, "PYTHONPATH": PACKAGE_DIR},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        timings["created"] = sorted(os.listdir(cwd))
+    return timings
+
+
+def slowest_modules(limit: int) -> List[str]:
+    """Package modules with the highest cumulative import time (``-X importtime``)."""
+    with tempfile.TemporaryDirectory() as cwd:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE],
+            cwd=cwd,
+            env={**os.environ, "PYTHONPATH": PACKAGE_DIR},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "system_monitor_agent" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.strip()))
+    return [f"{us / 1e3:8.1f}ms  {name}" for us, name in sorted(rows, reverse=True)[:limit]]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, help="exit 1 if the package import median is above this")
+    parser.add_argument("--top", type=int, default=8, help="slowest package modules to list")
+    args = parser.parse_args()
+
+    runs = [import_once() for _ in range(args.runs)]
+    total = statistics.median(run["total_s"] for run in runs) * 1e3
+    package = statistics.median(run["package_s"] for run in runs) * 1e3
+    created = sorted({name for run in runs for name in run["created"]})
+
+    print(f"runs: {args.runs}")
+    print(f"import total    median {total:7.1f}ms (ADK included)")
+    print(f"import package  median {package:7.1f}ms")
+    for line in slowest_modules(args.top):
+        print(f"  {line}")
+
+    failed = False
+    if created:
+        print(f"FAIL: import created {', '.join(created)}", file=sys.stderr)
+        failed = True
+    if args.max_ms is not None and package > args.max_ms:
+        print(f"FAIL: package import above {args.max_ms:.0f}ms", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Parallel gatherer overlap benchmark
+
+Runs a ParallelAgent whose branches call the retail and news tools, once with
+the tools called the old blocking way and once with the async tools, and
+prints how much the branches really overlapped. No network is used: the news
+search is replaced by a stub that blocks for ``--latency`` seconds, like a
+Tavily HTTP request does.
+
+Run from the ``11-parallel-agent`` directory:
+
+    python -m benchmarks.bench_parallel_gatherer --branches 4 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import time
+from typing import AsyncGenerator, Dict, List, Tuple
+
+from google.adk.agents import BaseAgent, ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from system_monitor_agent.cache import TTLCache
+from system_monitor_agent.concurrency import run_blocking
+from system_monitor_agent.subagents.local_news_agent import tools as news_tools
+from system_monitor_agent.subagents.retail_data_agent import tools as retail_tools
+from system_monitor_agent.subagents.retail_data_agent.store import get_store
+
+# (branch name, start, end) of every branch of the current run.
+spans: List[Tuple[str, float, float]] = []
+
+
+class ToolBranch(BaseAgent):
+    """Gatherer branch that calls one tool and reports it as an event."""
+
+    city: str
+    blocking: bool
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        start = time.perf_counter()
+        if self.city == "retail":
+            if self.blocking:
+                result = get_store().as_dict()
+            else:
+                result = await retail_tools.get_retail_data()
+        elif self.blocking:
+            result = news_tools.search_news(self.city, "India", "fashion")
+        else:
+            result = await run_blocking(news_tools.search_news, self.city, "India", "fashion")
+        spans.append((self.name, start, time.perf_counter()))
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=str(result)[:80])]),
+        )
+
+
+def overlap_stats() -> Dict[str, float]:
+    wall = max(end for _, _, end in spans) - min(start for _, start, _ in spans)
+    busy = sum(end - start for _, start, end in spans)
+    longest = max(end - start for _, start, end in spans)
+    return {
+        "wall_s": wall,
+        "sum_of_branches_s": busy,
+        # 1.0 means fully serialized; perfect overlap is bounded by the
+        # longest branch, i.e. busy / longest.
+        "overlap_factor": busy / wall if wall else 0.0,
+        "ideal_overlap_factor": busy / longest if longest else 0.0,
+    }
+
+
+async def run_gatherer(blocking: bool, branches: int) -> Dict[str, float]:
+    sub_agents = [ToolBranch(name="retail", city="retail", blocking=blocking)]
+    sub_agents += [
+        ToolBranch(name=f"news_{i}", city=f"City{i}", blocking=blocking)
+        for i in range(branches - 1)
+    ]
+    gatherer = ParallelAgent(name="system_info_gatherer", sub_agents=sub_agents)
+    runner = InMemoryRunner(agent=gatherer, app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="bench")
+
+    spans.clear()
+    message = types.Content(role="user", parts=[types.Part(text="go")])
+    async for _ in runner.run_async(
+        user_id="bench", session_id=session.id, new_message=message
+    ):
+        pass
+    return overlap_stats()
+
+
+async def main(branches: int, latency: float) -> None:
+    def slow_search(query: str):
+        time.sleep(latency)
+        return {"query": query, "results": []}
+
+    news_tools.set_search_provider(slow_search)
+    # Entries expire immediately, so every branch pays the upstream latency.
+    news_tools.news_cache = TTLCache(ttl=0)
+    get_store()
+
+    for label, blocking in (("blocking tools", True), ("async tools", False)):
+        stats = await run_gatherer(blocking, branches)
+        print(
+            f"{label:>15}: wall {stats['wall_s']:.3f}s, "
+            f"branches {stats['sum_of_branches_s']:.3f}s, "
+            f"overlap x{stats['overlap_factor']:.2f} "
+            f"(ideal x{stats['ideal_overlap_factor']:.2f})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--branches", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(main(args.branches, args.latency))
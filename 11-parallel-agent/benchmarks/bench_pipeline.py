@@ -0,0 +1,196 @@
+"""
+Pipeline latency benchmark
+
+Runs the full ``root_agent`` pipeline (parallel gatherer, then synthesizer)
+on the offline scripted model and search stub, and reports wall time per
+stage, parallel overlap of the gatherer and end-to-end p50/p95. No network
+is used, so it can run in CI to catch orchestration regressions.
+
+Run from the ``11-parallel-agent`` directory:
+
+    python -m benchmarks.bench_pipeline --runs 20 --latency 0.2 --max-p95 2.0
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from system_monitor_agent import root_agent
+from system_monitor_agent.agent import system_info_gatherer
+from system_monitor_agent.metrics import registry
+from system_monitor_agent.offline import use_offline_backend
+from system_monitor_agent.subagents.local_news_agent import tools as news_tools
+from system_monitor_agent.subagents.trending_fashion_agent import snapshot as trends_snapshot
+
+INITIAL_STATE = {
+    "store_name": "Fashion Bug",
+    "type_of_store": "fashion",
+    "city": "Mumbai",
+    "country": "India",
+}
+
+
+class StageTimerPlugin(BasePlugin):
+    """Records the wall time of every agent run, per invocation."""
+
+    def __init__(self):
+        super().__init__(name="stage_timer")
+        self._started: Dict[Tuple[str, str], float] = {}
+        # invocation id -> agent name -> (start, end)
+        self.spans: Dict[str, Dict[str, Tuple[float, float]]] = defaultdict(dict)
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> Optional[types.Content]:
+        self._started[(callback_context.invocation_id, agent.name)] = time.perf_counter()
+        return None
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> Optional[types.Content]:
+        start = self._started.pop((callback_context.invocation_id, agent.name), None)
+        if start is not None:
+            self.spans[callback_context.invocation_id][agent.name] = (
+                start,
+                time.perf_counter(),
+            )
+        return None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_pipeline(runs: int, concurrency: int) -> Dict[str, object]:
+    timer = StageTimerPlugin()
+    runner = InMemoryRunner(agent=root_agent, app_name="bench", plugins=[timer])
+    branches = [agent.name for agent in system_info_gatherer.sub_agents]
+    end_to_end: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_run(i: int) -> None:
+        async with semaphore:
+            session = await runner.session_service.create_session(
+                app_name="bench", user_id="bench", state=dict(INITIAL_STATE)
+            )
+            message = types.Content(
+                role="user", parts=[types.Part(text="How can I increase my sales?")]
+            )
+            start = time.perf_counter()
+            async for _ in runner.run_async(
+                user_id="bench", session_id=session.id, new_message=message
+            ):
+                pass
+            end_to_end.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one_run(i) for i in range(runs)))
+
+    stages: Dict[str, List[float]] = defaultdict(list)
+    overlap: List[float] = []
+    efficiency: List[float] = []
+    for spans in timer.spans.values():
+        for name, (start, end) in spans.items():
+            stages[name].append(end - start)
+        gatherer = spans.get(system_info_gatherer.name)
+        branch_times = [spans[b][1] - spans[b][0] for b in branches if b in spans]
+        if gatherer and branch_times:
+            wall = gatherer[1] - gatherer[0]
+            overlap.append(sum(branch_times) / wall)
+            efficiency.append(max(branch_times) / wall)
+    saved = registry.histogram("prompt_state_tokens_saved")
+
+    return {
+        "runs": runs,
+        "concurrency": concurrency,
+        "end_to_end_s": {
+            "p50": percentile(end_to_end, 50),
+            "p95": percentile(end_to_end, 95),
+            "max": max(end_to_end),
+        },
+        "stages_s": {
+            name: {"p50": percentile(times, 50), "p95": percentile(times, 95)}
+            for name, times in sorted(stages.items())
+        },
+        "gatherer": {
+            # Sum of branch times over gatherer wall time (1.0 = serialized).
+            "overlap_factor": statistics.mean(overlap) if overlap else 0.0,
+            # Slowest branch over gatherer wall time (1.0 = perfect overlap).
+            "overlap_efficiency": statistics.mean(efficiency) if efficiency else 0.0,
+        },
+        # State tokens the synthesizer prompt budget cut, per synthesizer call.
+        "prompt_tokens_saved_mean": saved.sum / saved.count if saved and saved.count else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.2, help="model latency per call (s)")
+    parser.add_argument("--output-chars", type=int, default=1500, help="model answer size")
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    parser.add_argument(
+        "--warm-caches",
+        action="store_true",
+        help="keep news/trends caches between runs instead of measuring cold runs",
+    )
+    parser.add_argument(
+        "--branch-budget",
+        type=float,
+        help="time budget of every gatherer branch (s), instead of the configured ones",
+    )
+    parser.add_argument("--max-p95", type=float, help="exit 1 if end-to-end p95 is above this")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    use_offline_backend(
+        root_agent,
+        latency=args.latency,
+        output_chars=args.output_chars,
+        search_latency=args.search_latency,
+    )
+    if not args.warm_caches:
+        news_tools.news_cache.ttl = 0
+        trends_snapshot.trends_cache.ttl = 0
+    if args.branch_budget is not None:
+        system_info_gatherer.default_budget = args.branch_budget
+        system_info_gatherer.budgets = {}
+
+    report = asyncio.run(run_pipeline(args.runs, args.concurrency))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        e2e = report["end_to_end_s"]
+        print(f"runs: {args.runs}, concurrency: {args.concurrency}")
+        print(f"end-to-end  p50 {e2e['p50']:.3f}s  p95 {e2e['p95']:.3f}s  max {e2e['max']:.3f}s")
+        for name, stage in report["stages_s"].items():
+            print(f"  {name:<28} p50 {stage['p50']:.3f}s  p95 {stage['p95']:.3f}s")
+        gatherer = report["gatherer"]
+        print(
+            f"gatherer overlap x{gatherer['overlap_factor']:.2f}, "
+            f"efficiency {gatherer['overlap_efficiency']:.0%}"
+        )
+        print(f"synthesizer prompt: {report['prompt_tokens_saved_mean']:.0f} state tokens saved per run")
+
+    if args.max_p95 is not None and report["end_to_end_s"]["p95"] > args.max_p95:
+        print(f"FAIL: p95 above {args.max_p95:.3f}s", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
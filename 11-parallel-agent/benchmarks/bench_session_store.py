@@ -0,0 +1,157 @@
+"""
+Session store benchmark
+
+Replays the session traffic of the fashion agent (a ``get_session`` at the
+start of every invocation, then one event per agent step, some of them
+carrying the retail data payload) from many concurrent sessions against the
+stock ``DatabaseSessionService``, the tuned ``SQLiteSessionService`` and the
+``TieredSessionService`` (memory LRU in front of the tuned store).
+
+It reports wall time, event throughput, ``get_session`` latency, the
+longest event-loop stall (how long the parallel agents would have been
+frozen by a blocking write), the database size (the tuned store keeps
+repeated payloads once, as blobs) and the query plan of the per-session
+events query. Each store writes to a fresh file in a temporary directory,
+and starts after a full garbage collection, so the garbage of the previous
+store does not show up as a loop stall of the next one.
+
+Run from the ``11-parallel-agent`` directory:
+
+    python -m benchmarks.bench_session_store --sessions 20 --invocations 5
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from typing import Dict, List
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import DatabaseSessionService
+from google.genai import types
+
+from system_monitor_agent.sessions import SQLiteSessionService, TieredSessionService
+from system_monitor_agent.subagents.retail_data_agent.store import get_store
+
+from .bench_pipeline import percentile
+
+APP_NAME = "bench"
+AUTHORS = ("RetailDataAgent", "TrendingFashionAgent", "FashionReportSynthesizer")
+
+
+def make_event(invocation_id: str, step: int, payload: str) -> Event:
+    author = AUTHORS[step % len(AUTHORS)]
+    text = payload if step % len(AUTHORS) == 0 else f"{author} step {step}: " + "x" * 400
+    return Event(
+        invocation_id=invocation_id,
+        author=author,
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta={f"{author}_output": text[:200]}),
+    )
+
+
+async def run_store(service, sessions: int, invocations: int, events: int) -> Dict[str, float]:
+    payload = json.dumps(get_store().as_dict())
+    get_latencies: List[float] = []
+    stall = 0.0
+    done = False
+
+    async def watch_loop():
+        # Longest gap between two wakeups of a 1ms ticker = longest loop stall.
+        nonlocal stall
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall = max(stall, now - last - 0.001)
+            last = now
+
+    async def one_session(i: int) -> None:
+        session = await service.create_session(
+            app_name=APP_NAME, user_id=f"user{i}", state={"store_name": f"Store {i}"}
+        )
+        for _ in range(invocations):
+            start = time.perf_counter()
+            session = await service.get_session(
+                app_name=APP_NAME, user_id=session.user_id, session_id=session.id
+            )
+            get_latencies.append(time.perf_counter() - start)
+            invocation_id = str(uuid.uuid4())
+            for step in range(events):
+                await service.append_event(session, make_event(invocation_id, step, payload))
+                # Let other sessions run, like model calls would.
+                await asyncio.sleep(0)
+
+    watcher = asyncio.create_task(watch_loop())
+    start = time.perf_counter()
+    await asyncio.gather(*(one_session(i) for i in range(sessions)))
+    if hasattr(service, "flush_all"):
+        await service.flush_all()
+    wall = time.perf_counter() - start
+    done = True
+    await watcher
+
+    total = sessions * invocations * events
+    return {
+        "wall_s": wall,
+        "events_per_s": total / wall,
+        "get_session_p50_ms": percentile(get_latencies, 50) * 1e3,
+        "get_session_p95_ms": percentile(get_latencies, 95) * 1e3,
+        "max_loop_stall_ms": stall * 1e3,
+    }
+
+
+def database_size(path: str) -> int:
+    with sqlite3.connect(path) as connection:
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return os.path.getsize(path)
+
+
+def events_query_plan(path: str) -> str:
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM events "
+            "WHERE app_name = ? AND user_id = ? AND session_id = ? ORDER BY timestamp DESC",
+            (APP_NAME, "user0", "x"),
+        ).fetchall()
+    return "; ".join(row[-1] for row in rows)
+
+
+async def main(sessions: int, invocations: int, events: int) -> None:
+    get_store()
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, factory in (
+            ("stock", DatabaseSessionService),
+            ("tuned", SQLiteSessionService),
+            ("tiered", lambda url: TieredSessionService(SQLiteSessionService(url))),
+        ):
+            path = os.path.join(tmp, f"{label}.db")
+            service = factory(f"sqlite:///{path}")
+            gc.collect()
+            stats = await run_store(service, sessions, invocations, events)
+            disk = getattr(service, "disk", service)
+            if isinstance(disk, SQLiteSessionService):
+                disk.close()
+            disk.db_engine.dispose()
+            print(
+                f"{label}: wall {stats['wall_s']:.2f}s, {stats['events_per_s']:.0f} events/s, "
+                f"get_session p50 {stats['get_session_p50_ms']:.1f}ms "
+                f"p95 {stats['get_session_p95_ms']:.1f}ms, "
+                f"max loop stall {stats['max_loop_stall_ms']:.1f}ms, "
+                f"db {database_size(path) / 1e6:.1f}MB"
+            )
+            print(f"       events query: {events_query_plan(path)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--invocations", type=int, default=5)
+    parser.add_argument("--events", type=int, default=12, help="events per invocation")
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.invocations, args.events))
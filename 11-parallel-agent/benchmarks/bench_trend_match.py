@@ -0,0 +1,108 @@
+"""
+Trend matching benchmark
+
+Builds synthetic catalogs of growing size from the fashion lexicon and
+matches a trend text against them with the vectorized ``CatalogIndex`` and
+with a plain Python loop that scores every product (what comparing the
+lists product by product amounts to). It reports the index build time, the
+match latency of both, and checks that they rank the same products.
+
+Run from the ``11-parallel-agent`` directory:
+
+    python -m benchmarks.bench_trend_match --sizes 1000 10000 100000
+"""
+
+import argparse
+import math
+import random
+import time
+from collections import Counter
+from typing import Dict, List
+
+from system_monitor_agent.subagents.retail_data_agent.store import RetailDataStore
+from system_monitor_agent.subagents.trend_match_agent.index import CatalogIndex
+from system_monitor_agent.subagents.trend_match_agent.lexicon import LEXICON, tokenize
+
+TRENDS = (
+    "Oversized hoodies and white sneakers dominate street style, with linen shirts, "
+    "pastel tees, denim jackets and floral dresses for summer. Quiet luxury brings "
+    "cashmere sweaters and leather handbags; athleisure keeps running shoes and caps strong."
+)
+CATEGORIES = ["Men", "Women", "Kids", "Footwear", "Accessories"]
+PROFITS = ["Highly Profitable", "Moderately Profitable", "Less Profitable"]
+
+
+def synthetic_store(size: int, seed: int = 7) -> RetailDataStore:
+    rng = random.Random(seed)
+    records = []
+    for i in range(size):
+        words = [
+            rng.choice(LEXICON["colors"]),
+            rng.choice(LEXICON["fabrics"] + LEXICON["styles"]),
+            rng.choice(LEXICON["categories"]),
+        ]
+        records.append(
+            {
+                "ProductID": f"P{i:06d}",
+                "Name": " ".join(words).title(),
+                "Category": rng.choice(CATEGORIES),
+                "Price": round(rng.uniform(5, 200), 2),
+                "UnitsSold": rng.randint(0, 1000),
+                "Month": "2025-06",
+                "ProfitCategory": rng.choice(PROFITS),
+            }
+        )
+    return RetailDataStore(records)
+
+
+def naive_scores(store: RetailDataStore, trends: str) -> List[float]:
+    """TF-IDF cosine of every product, one product at a time."""
+    docs = [
+        Counter(tokenize(f"{name} {store.categories[store.category_codes[i]]}"))
+        for i, name in enumerate(store.product_names)
+    ]
+    df: Dict[str, int] = Counter(token for doc in docs for token in doc)
+    idf = {t: math.log((1 + len(docs)) / (1 + n)) + 1 for t, n in df.items()}
+    query = Counter(t for t in tokenize(trends) if t in idf)
+    q = {t: (1 + math.log(c)) * idf[t] for t, c in query.items()}
+    q_norm = math.sqrt(sum(w * w for w in q.values())) or 1.0
+    scores = []
+    for doc in docs:
+        d = {t: (1 + math.log(c)) * idf[t] for t, c in doc.items()}
+        d_norm = math.sqrt(sum(w * w for w in d.values())) or 1.0
+        scores.append(sum(w * q.get(t, 0.0) for t, w in d.items()) / (d_norm * q_norm))
+    return scores
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        store = synthetic_store(size)
+        start = time.perf_counter()
+        index = CatalogIndex(store)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.queries):
+            result = index.match(TRENDS, top_k=10)
+        indexed = (time.perf_counter() - start) / args.queries
+
+        start = time.perf_counter()
+        scores = naive_scores(store, TRENDS)
+        naive = time.perf_counter() - start
+
+        best_naive = max(scores)
+        best_indexed = result["matches"][0]["score"] if result["matches"] else 0.0
+        print(
+            f"{size:>7} products: build {build * 1e3:8.1f} ms, "
+            f"match {indexed * 1e3:7.2f} ms (loop {naive * 1e3:8.1f} ms), "
+            f"top score {best_indexed:.3f} / loop {best_naive:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Fashion Agent Application
+
+This module builds everything that runs the root agent: logging, the
+session store, plugins and runners. Nothing is built at import time; each
+piece is created on first use by its ``get_*`` factory and then reused, so
+importing ``root_agent`` (as ``adk web`` or a server does) stays cheap and
+has no side effects.
+
+Usage::
+
+    from system_monitor_agent import app
+    asyncio.run(app.run_session(app.get_runner(), "How can I increase my sales?"))
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import sqlite3
+from datetime import datetime
+
+from google.adk.apps.app import App, EventsCompactionConfig
+from google.adk.plugins.logging_plugin import LoggingPlugin
+from google.adk.runners import InMemoryRunner, Runner
+
+from .agent import root_agent
+from .compaction import ExtractiveEventSummarizer
+from .plugins import MetricsPlugin, ResponseCachePlugin, TrendsRefreshPlugin
+from .sessions import SQLiteSessionService, TieredSessionService
+from .streaming import stream_report
+from .subagents.retail_data_agent.ingest import start_configured_ingestion
+
+MODEL_NAME = "gemini-2.0-flash"
+APP_NAME = "fashion_upsell"
+USER_ID = "John Doe"
+
+LOG_DIR = os.environ.get("AGENT_LOG_DIR", "logs")
+# SQLite database will be created automatically
+DB_PATH = os.environ.get("SESSION_DB_PATH", "my_agent_data.db")
+db_url = f"sqlite:///{DB_PATH}"
+# Turns between two compactions of a session's events
+COMPACTION_INTERVAL = int(os.environ.get("COMPACTION_INTERVAL", "2"))
+
+initial_state = {
+    "store_name": "Fashion Bug",
+    "type_of_store": "fashion",
+    "city": "Mumbai",
+    "country": "India"
+}
+
+
+@functools.lru_cache(maxsize=None)
+def configure_logging() -> str:
+    """Send logs to a timestamped file in ``LOG_DIR``; returns its path."""
+    os.environ.setdefault("GOOGLE_API_KEY", "<api-key>")
+    os.makedirs(LOG_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    log_filename = os.path.join(LOG_DIR, f"agent_{timestamp}.log")
+    logging.basicConfig(
+        filename=log_filename,
+        level=logging.INFO,
+        format="%(asctime)s — %(levelname)s — %(message)s",
+    )
+    return log_filename
+
+
+@functools.lru_cache(maxsize=None)
+def get_session_service() -> TieredSessionService:
+    """
+    Hot sessions from a bounded in-memory LRU, written behind to SQLite
+    (WAL, indexed events, one commit per invocation; same tables as
+    ``DatabaseSessionService(db_url=db_url)``).
+    """
+    return TieredSessionService(SQLiteSessionService(db_url=db_url))
+
+
+@functools.lru_cache(maxsize=None)
+def get_response_cache() -> ResponseCachePlugin:
+    """Answers byte-identical model requests of the sub-agents from cache."""
+    return ResponseCachePlugin()
+
+
+@functools.lru_cache(maxsize=None)
+def get_metrics() -> MetricsPlugin:
+    """Per-agent/tool/model latency, tokens and payload sizes, exported after each run."""
+    log_filename = configure_logging()
+    stem = os.path.splitext(os.path.basename(log_filename))[0].replace("agent_", "")
+    return MetricsPlugin(
+        prometheus_path=os.path.join(LOG_DIR, f"metrics_{stem}.prom"),
+        trace_path=os.path.join(LOG_DIR, f"trace_{stem}.json"),
+    )
+
+
+def start_background_work() -> None:
+    """Start ingesting the live POS feed (``POS_STREAM_SOURCE``), if one is set."""
+    start_configured_ingestion()
+
+
+@functools.lru_cache(maxsize=None)
+def get_trends_refresh() -> TrendsRefreshPlugin:
+    """Refreshes the shared trends snapshot on a schedule (``TRENDS_REFRESH_INTERVAL``)."""
+    return TrendsRefreshPlugin()
+
+
+def get_plugins() -> list:
+    # Metrics before the response cache, so cached model calls are still counted.
+    return [get_metrics(), get_response_cache(), get_trends_refresh()]
+
+
+@functools.lru_cache(maxsize=None)
+def get_runner() -> Runner:
+    """Runner over the persistent session store."""
+    configure_logging()
+    start_background_work()
+    return Runner(
+        agent=root_agent,
+        app_name=APP_NAME,
+        session_service=get_session_service(),
+        plugins=get_plugins(),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_debug_runner() -> InMemoryRunner:
+    """In-memory runner with the LoggingPlugin, for debugging a single run."""
+    configure_logging()
+    start_background_work()
+    return InMemoryRunner(
+        agent=root_agent,
+        # Handles standard Observability logging across ALL agents
+        plugins=[LoggingPlugin(), *get_plugins()],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_compacting_runner() -> Runner:
+    """
+    Runner over the persistent session store whose older events are compacted
+    every ``COMPACTION_INTERVAL`` turns by the extractive summarizer (no model
+    call, unlike the default ``LlmEventSummarizer``).
+    """
+    configure_logging()
+    start_background_work()
+    app = App(
+        name=APP_NAME,
+        root_agent=root_agent,
+        plugins=get_plugins(),
+        events_compaction_config=EventsCompactionConfig(
+            summarizer=ExtractiveEventSummarizer(),
+            compaction_interval=COMPACTION_INTERVAL,
+            overlap_size=1,
+        ),
+    )
+    return Runner(app=app, session_service=get_session_service())
+
+
+# Define helper functions that will be reused throughout the notebook
+async def run_session(
+    runner_instance: Runner = None,
+    user_queries: list[str] | str = None,
+    session_name: str = "default",
+):
+    print(f"\n ### Session: {session_name}")
+
+    runner_instance = runner_instance or get_runner()
+
+    # Process queries if provided
+    if user_queries:
+        # Convert single query to list for uniform processing
+        if type(user_queries) == str:
+            user_queries = [user_queries]
+
+        # Process each query in the list sequentially
+        for query in user_queries:
+            print(f"\nUser > {query}")
+
+            # Print the report as the synthesizer writes it; the session is
+            # created with the store profile if it does not exist yet
+            author = None
+            async for chunk in stream_report(
+                runner_instance, query, USER_ID, session_name, state=initial_state
+            ):
+                if chunk["type"] == "delta":
+                    # A new line for each agent of the report (the synthesizer
+                    # or a news agent it transferred to)
+                    if chunk["author"] != author:
+                        if author is not None:
+                            print()
+                        print(f"{MODEL_NAME} > ", end="")
+                        author = chunk["author"]
+                    print(chunk["text"], end="", flush=True)
+                elif chunk["type"] == "done" and chunk["ttft_s"] is not None:
+                    print(
+                        f"\n[first token {chunk['ttft_s']:.2f}s, "
+                        f"last token {chunk['ttlt_s']:.2f}s]"
+                    )
+    else:
+        print("No queries!")
+
+
+async def main():
+    await run_session(
+        get_runner(),
+        [
+            "How can I increase my sales", "Hello! What is my name?",
+        ],
+        "test-db-session-01",
+    )
+    await get_session_service().flush_all()
+
+
+# CHECK LOGS START ==================
+
+async def main_debug():
+    print("🚀 Running agent with LoggingPlugin...")
+    print("📊 Watch the comprehensive logging output below:\n")
+    response = await get_debug_runner().run_debug("How can I increase my sales?")
+    print("\n\n=== RESPONSE ===")
+    logging.info(f"Agent response: {response}")
+    print(response)
+    print(f"\n📁 Logs saved to: {configure_logging()}")
+
+# CHECK LOGS END ===================
+
+def check_data_in_db(session_id: str = "test-db-session-01", limit: int = 50):
+    with sqlite3.connect(DB_PATH) as connection:
+        cursor = connection.cursor()
+        # Served by the (app_name, user_id, session_id, timestamp) index
+        result = cursor.execute(
+            "select app_name, session_id, author, content from events "
+            "where app_name = ? and user_id = ? and session_id = ? "
+            "order by timestamp limit ?",
+            (APP_NAME, USER_ID, session_id, limit),
+        )
+        print([_[0] for _ in result.description])
+        for each in result.fetchall():
+            print(each)
+
+
+# # CONTEXT ENGINEERING
+# from google.adk.apps.app import App, EventsCompactionConfig
+# from google.adk.sessions import DatabaseSessionService
+
+# async def run_session_compact(
+#     runner_instance: Runner,
+#     user_queries: list[str] | str = None,
+#     session_name: str = "default",
+# ):
+#     print(f"\n\n### Session: {session_name}")
+
+#     if isinstance(user_queries, str):
+#         user_queries = [user_queries]
+
+#     for query in user_queries:
+#         print(f"\nUser > {query}")
+
+#         message = types.Content(
+#             role="user",
+#             parts=[types.Part(text=query)]
+#         )
+
+#         async for event in runner_instance.run_async(
+#             user_id=USER_ID,
+#             session_id=session_name,   # ✔ use the SAME session name every turn
+#             new_message=message,
+#         ):
+#             if event.content and event.content.parts:
+#                 text = event.content.parts[0].text
+#                 if text and text.strip() != "None":
+#                     print(f"{MODEL_NAME} > {text}")
+
+
+
+# research_app_compacting = App(
+#     name=APP_NAME,
+#     root_agent=root_agent,
+#     # This is the new part!
+#     events_compaction_config=EventsCompactionConfig(
+#         summarizer=ExtractiveEventSummarizer(),  # no extra Gemini call, see get_compacting_runner()
+#         compaction_interval=2,  # Trigger compaction every 3 invocations
+#         overlap_size=1,  # Keep 1 previous turn for context
+#     ),
+# )
+
+# db_url = "sqlite:///my_agent_data_compact.db"  # Local SQLite file
+# session_service = DatabaseSessionService(db_url=db_url)
+
+# # Create a new runner for our upgraded app
+# research_runner_compacting = Runner(
+#     app=research_app_compacting, session_service=session_service
+# )
+
+# print("✅ Research App upgraded with Events Compaction!")
+
+# SESSION_NAME = "test-db-session-03"
+
+# async def main_turns():
+#     await run_session_compact(
+#         research_runner_compacting,
+#         "How can I increase my sales?",
+#         SESSION_NAME,
+#     )
+
+#     await run_session_compact(
+#         research_runner_compacting,
+#         "What are the products that gave me high profit based on my retail data?",
+#         SESSION_NAME,
+#     )
+
+#     await run_session_compact(
+#         research_runner_compacting,
+#         "Based on trending fashion reports, which retail products might trend next?",
+#         SESSION_NAME,
+#     )
+
+#     await run_session_compact(
+#         research_runner_compacting,
+#         "Suggest me, how can I do invest money in ads to increase my sales",
+#         SESSION_NAME,
+#     )
+
+
+# # CHECKING FOR COMPACT SESSIONS THAT PROVES THAT WE HAVE CONTEXT ENGINEERIG IN PLACE
+
+# async def check_compactness():
+#     print("\n===========================CHECKING COMPACTION===========================")
+
+#     session = await session_service.get_session(
+#         app_name=research_runner_compacting.app_name,
+#         user_id=USER_ID,
+#         session_id=SESSION_NAME,
+#     )
+
+#     print(f"\nTotal events stored: {len(session.events)}")
+
+#     found = False
+#     for event in session.events:
+#         # ADK v0.3+ compaction events use type="compaction"
+#         print(event)
+#         if getattr(event, "type", None) == "compaction":
+#             print("\n✅ FOUND COMPACTION EVENT!")
+#             print("Summary contents:\n", event.compaction)
+#             found = True
+#             break
+
+#     if not found:
+#         print("\n❌ No compaction event found. (Did you run 3+ turns?)")
+
+
+# print ("===========================CHECKING FOR COMPACT DATA=======================================")
+
+# async def main_compact():
+#     # ✅ Create DB session once so runner can write into it
+#     try:
+#         await session_service.create_session(
+#             app_name=research_runner_compacting.app_name,
+#             user_id=USER_ID,
+#             session_id=SESSION_NAME,
+#         )
+#     except:
+#         pass  # session already exists
+
+#     await main_turns()
+#     await check_compactness()
+
+# # asyncio.run(main_compact()) ====================================
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,223 @@
+"""
+Multi-store batch runner
+
+Runs ``root_agent`` for every store of a profiles file, several stores at a
+time, and writes each report to an output directory as soon as its store is
+done. A profile has the fields of ``input_json.py`` (``store_name``,
+``type_of_store``, ``city``, ``country``, ...) and becomes the initial state
+of the store's own session, so stores never see each other's data.
+
+Work that does not depend on the store is shared between all of them: the
+global trends snapshot, the retail data store and catalog index, the news
+cache (one search per city and store type) and the model response cache.
+
+Output, per store: ``<store_id>.md`` with the report, and one line in
+``results.jsonl`` with its status, duration and time to first token.
+
+Run from the ``11-parallel-agent`` directory:
+
+    python -m system_monitor_agent.batch stores.json --out reports --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+
+from .concurrency import run_blocking
+from .metrics import registry
+from .streaming import stream_report
+
+logger = logging.getLogger(__name__)
+
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "8"))
+DEFAULT_QUERY = "How can I increase my sales?"
+REQUIRED_FIELDS = ("store_name", "city", "country")
+
+
+def load_profiles(path: str) -> List[Dict[str, Any]]:
+    """
+    Store profiles from a JSON list, a JSON object with a ``stores`` list, or
+    a JSON Lines file with one profile per line.
+
+    Two profiles with the same ``store_id`` are rejected: their reports and
+    sessions would overwrite each other.
+    """
+    with open(path, encoding="utf-8") as file:
+        text = file.read()
+    try:
+        data = json.loads(text)
+        profiles = data["stores"] if isinstance(data, dict) else data
+    except json.JSONDecodeError:
+        profiles = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    seen: Dict[str, int] = {}
+    for i, profile in enumerate(profiles):
+        missing = [field for field in REQUIRED_FIELDS if not profile.get(field)]
+        if missing:
+            raise ValueError(f"Store profile {i} in {path} has no {', '.join(missing)}")
+        profile.setdefault("type_of_store", "fashion")
+        sid = store_id(profile)
+        if sid in seen:
+            raise ValueError(
+                f"Store profiles {seen[sid]} and {i} in {path} have the same id {sid!r}, "
+                "give them distinct 'store_id' values"
+            )
+        seen[sid] = i
+    return profiles
+
+
+def store_id(profile: Dict[str, Any]) -> str:
+    """File-safe id of a store: its ``store_id``, or its name and city."""
+    raw = profile.get("store_id") or f"{profile['store_name']}-{profile['city']}"
+    return re.sub(r"[^a-z0-9]+", "-", str(raw).lower()).strip("-")
+
+
+def _write_result(out_dir: str, result: Dict[str, Any], report: str) -> None:
+    if report:
+        path = os.path.join(out_dir, f"{result['store_id']}.md")
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            file.write(report)
+        os.replace(path + ".tmp", path)
+        result["report"] = os.path.basename(path)
+    with open(os.path.join(out_dir, "results.jsonl"), "a", encoding="utf-8") as file:
+        file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def default_runner() -> Runner:
+    """
+    Runner with in-memory sessions (one per store, dropped when it is done)
+    the shared model response cache and the scheduled trends refresh.
+    """
+    from .app import APP_NAME, get_response_cache, get_trends_refresh, start_background_work
+    from .agent import root_agent
+
+    start_background_work()
+    return Runner(
+        agent=root_agent,
+        app_name=APP_NAME,
+        session_service=InMemorySessionService(),
+        plugins=[get_response_cache(), get_trends_refresh()],
+    )
+
+
+async def run_store(
+    runner: Runner, profile: Dict[str, Any], query: str, out_dir: str
+) -> Dict[str, Any]:
+    """Run ``query`` for one store and write its report and result line."""
+    sid = store_id(profile)
+    # A fresh session per store and run: the profile is its whole state.
+    session_id = f"batch-{sid}-{uuid.uuid4().hex[:8]}"
+    start = time.perf_counter()
+    parts: List[str] = []
+    result: Dict[str, Any] = {"store_id": sid, "store_name": profile["store_name"]}
+    try:
+        async for chunk in stream_report(runner, query, sid, session_id, state=dict(profile)):
+            if chunk["type"] == "delta":
+                parts.append(chunk["text"])
+            elif chunk["type"] == "done":
+                result["ttft_s"] = chunk["ttft_s"]
+        result["status"] = "ok" if parts else "empty"
+    except Exception as error:
+        result.update(status="error", error=f"{type(error).__name__}: {error}")
+    finally:
+        await runner.session_service.delete_session(
+            app_name=runner.app_name, user_id=sid, session_id=session_id
+        )
+    result["seconds"] = round(time.perf_counter() - start, 3)
+
+    registry.inc(
+        "batch_stores_total", {"status": result["status"]}, help="Stores run in batch mode"
+    )
+    registry.observe(
+        "batch_store_seconds", result["seconds"], help="Time to produce one store's report"
+    )
+    await run_blocking(_write_result, out_dir, result, "".join(parts))
+    return result
+
+
+async def run_batch(
+    profiles: List[Dict[str, Any]],
+    out_dir: str,
+    query: str = DEFAULT_QUERY,
+    concurrency: int = BATCH_CONCURRENCY,
+    runner: Optional[Runner] = None,
+    on_result: Optional[Callable[[Dict[str, Any], int, int], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run every store, at most ``concurrency`` at a time. Results are written as
+    stores finish and returned in completion order; ``on_result`` is called
+    with each result, the number of finished stores and the total.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    runner = runner or default_runner()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(profile: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            return await run_store(runner, profile, query, out_dir)
+
+    results = []
+    for finished in asyncio.as_completed([bounded(profile) for profile in profiles]):
+        result = await finished
+        results.append(result)
+        logger.info(
+            "Batch store %s: %s in %.1fs (%d/%d)",
+            result["store_id"],
+            result["status"],
+            result["seconds"],
+            len(results),
+            len(profiles),
+        )
+        if on_result:
+            on_result(result, len(results), len(profiles))
+    return results
+
+
+def _print_progress(result: Dict[str, Any], done: int, total: int) -> None:
+    print(
+        f"[{done}/{total}] {result['store_id']}: "
+        f"{result['status']} in {result['seconds']:.1f}s"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("profiles", help="JSON or JSON Lines file of store profiles")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument("--query", default=DEFAULT_QUERY)
+    args = parser.parse_args()
+
+    from .app import configure_logging
+
+    configure_logging()
+    start = time.perf_counter()
+    results = asyncio.run(
+        run_batch(
+            load_profiles(args.profiles),
+            args.out,
+            args.query,
+            args.concurrency,
+            on_result=_print_progress,
+        )
+    )
+    failed = sum(1 for result in results if result["status"] != "ok")
+    print(
+        f"{len(results)} stores in {time.perf_counter() - start:.1f}s, "
+        f"{failed} failed, results in {args.out}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Caching helpers
+
+This module provides a TTL cache with an optional on-disk SQLite backing and
+single-flight coalescing, so concurrent identical requests only trigger one
+upstream call and repeats within the TTL are answered from cache, plus a
+size-bounded LRU map.
+
+The on-disk caches (model responses, news, trends snapshot, retail table)
+live in one directory, ``AGENT_CACHE_DIR`` (default ``cache``, next to the
+``logs`` directory); see ``cache_path``.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+CACHE_DIR = os.environ.get("AGENT_CACHE_DIR", "cache")
+
+
+def cache_path(filename: str) -> str:
+    """Path of the cache file ``filename`` inside ``CACHE_DIR``."""
+    return os.path.join(CACHE_DIR, filename)
+
+
+def connect_sqlite(path: str) -> sqlite3.Connection:
+    """Open the SQLite file ``path``, creating its directory on first use."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return sqlite3.connect(path)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, "_Call"] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run ``fn`` for ``key`` unless a call for ``key`` is already in flight,
+        in which case wait for that call and return (or raise) its outcome.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    Thread safe TTL cache for JSON serializable values.
+
+    Entries live in memory and, when ``path`` is given, in a SQLite file so
+    they survive restarts and are shared between processes.
+    """
+
+    # Expired memory entries are swept once the cache grows past this size.
+    SWEEP_SIZE = 1024
+
+    def __init__(self, ttl: float, path: Optional[str] = None):
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Tuple[float, Any]] = {}
+        self._flight = SingleFlight()
+        self._local = threading.local()
+
+    @staticmethod
+    def make_key(key: Any) -> str:
+        return key if isinstance(key, str) else json.dumps(key, sort_keys=True, default=str)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = connect_sqlite(self.path)
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS cache "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+        return connection
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the value cached for ``key``, None if missing or expired."""
+        return self._lookup(self.make_key(key), record=True)
+
+    def _lookup(self, key: str, record: bool) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self.hits += record
+                    return entry[1]
+                del self._memory[key]
+
+        if self.path:
+            row = (
+                self._connection()
+                .execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,))
+                .fetchone()
+            )
+            if row is not None and row[1] > now:
+                value = json.loads(row[0])
+                with self._lock:
+                    self._memory[key] = (row[1], value)
+                    self.hits += record
+                return value
+
+        with self._lock:
+            self.misses += record
+        return None
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` for ``key`` for ``ttl`` seconds or the cache TTL."""
+        key = self.make_key(key)
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            if len(self._memory) > self.SWEEP_SIZE:
+                now = time.time()
+                for stale in [k for k, e in self._memory.items() if e[0] <= now]:
+                    del self._memory[stale]
+        if self.path:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, default=str), expires_at),
+                )
+                connection.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+    def get_or_compute(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for ``key``, computed and stored on a miss.
+
+        Concurrent misses for the same key share a single ``compute`` call.
+        Exceptions are not cached, so ``compute`` must raise (not return an
+        error value) when its result should not be stored.
+        """
+        key = self.make_key(key)
+        value = self._lookup(key, record=True)
+        if value is not None:
+            return value
+
+        def load():
+            # Another caller may have filled the entry while we queued.
+            cached = self._lookup(key, record=False)
+            if cached is not None:
+                return cached
+            computed = compute()
+            self.set(key, computed)
+            return computed
+
+        return self._flight.do(key, load)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM cache")
+
+
+class LRUCache:
+    """Thread safe mapping of at most ``max_size`` recently used items."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the item for ``key`` and mark it as most recently used."""
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key: Hashable, value: Any) -> list:
+        """Store ``value`` and return the ``(key, value)`` pairs it evicted."""
+        evicted = []
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                evicted.append(self._items.popitem(last=False))
+            self.evictions += len(evicted)
+        return evicted
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._items.pop(key, default)
+
+    def items(self) -> list:
+        """Snapshot of the ``(key, value)`` pairs, without touching recency."""
+        with self._lock:
+            return list(self._items.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
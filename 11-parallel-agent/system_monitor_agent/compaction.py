@@ -0,0 +1,201 @@
+"""
+Extractive event compaction
+
+``ExtractiveEventSummarizer`` compacts older session events for
+``EventsCompactionConfig`` without a model call. Instead of asking Gemini to
+summarize the conversation, it keeps the facts the next turns need:
+
+- the user's questions;
+- the latest value of every gathered state key, condensed: product
+  rankings from ``retail_data``, the trend keywords of ``trending_info``,
+  the top ``trend_matches``, the lines of ``latest_news`` with the most
+  fashion keywords and figures;
+- the headings and key lines of the reports the agents wrote.
+
+Tool calls and their payloads are dropped (only the tool names are kept),
+as are texts repeated in several events (an agent's answer is both its
+event content and its ``output_key`` state value). Each fact and report is
+cut to ``COMPACTION_FACT_TOKENS``, and the whole summary to
+``COMPACTION_SUMMARY_TOKENS``, split between the sections with
+``prompt_budget.allocate``: the summary of a long conversation keeps fewer
+lines per fact instead of growing with the number of gathered values.
+Compaction runs in milliseconds and costs no tokens; its duration and
+input/output sizes are exported through ``metrics.registry``.
+"""
+
+import functools
+import hashlib
+import os
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from google.adk.apps.base_events_summarizer import BaseEventsSummarizer
+from google.adk.events import Event, EventActions
+from google.adk.events.event_actions import EventCompaction
+from google.genai import types
+
+from .metrics import SIZE_BUCKETS, registry
+from .parallel import is_missing
+from .subagents.synthesizer_agent.prompt_budget import allocate, condense, count_tokens
+from .subagents.trend_match_agent.lexicon import extract_keywords
+
+# Tokens kept per gathered state value and per report.
+FACT_TOKENS = int(os.environ.get("COMPACTION_FACT_TOKENS", "100"))
+# Tokens of the whole summary, about the size of an LLM summary.
+SUMMARY_TOKENS = int(os.environ.get("COMPACTION_SUMMARY_TOKENS", "400"))
+# Products of ``trend_matches`` kept.
+TOP_MATCHES = 5
+
+
+def _text_of(event: Event) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return "\n".join(part.text for part in event.content.parts if part.text and not part.thought)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.strip().encode("utf-8")).hexdigest()
+
+
+def _format_matches(value: Dict[str, Any]) -> str:
+    lines = []
+    for i, match in enumerate(value.get("matches", [])[:TOP_MATCHES], 1):
+        lines.append(
+            f"{i}. {match.get('name')} ({match.get('category')}, "
+            f"{match.get('profit_category')}, {match.get('units_sold')} sold, "
+            f"matched on {', '.join(match.get('matched_on', []))})"
+        )
+    missing = value.get("trends_not_in_catalog")
+    if missing:
+        lines.append(f"Trends not in the catalog: {', '.join(missing)}")
+    return "\n".join(lines) or value.get("note", "no matches")
+
+
+def _format_trends(text: str, max_tokens: int) -> str:
+    keywords = extract_keywords(text)
+    lines = [f"{group}: {', '.join(words)}" for group, words in keywords.items() if words]
+    lines.append(condense(text, max(0, max_tokens - count_tokens("\n".join(lines)))))
+    return "\n".join(lines)
+
+
+def _format_fact(key: str, value: Any, max_tokens: int) -> str:
+    if is_missing(value):
+        return "not gathered"
+    if key == "trend_matches" and isinstance(value, dict):
+        return condense(_format_matches(value), max_tokens)
+    if key == "trending_info":
+        return _format_trends(str(value), max_tokens)
+    return condense(str(value), max_tokens)
+
+
+class ExtractiveEventSummarizer(BaseEventsSummarizer):
+    """
+    Non-LLM summarizer for ``EventsCompactionConfig(summarizer=...)``.
+
+    Args:
+        fact_tokens: tokens kept per state value and per report.
+        summary_tokens: tokens of the whole summary.
+    """
+
+    def __init__(self, fact_tokens: int = FACT_TOKENS, summary_tokens: int = SUMMARY_TOKENS):
+        self.fact_tokens = fact_tokens
+        self.summary_tokens = summary_tokens
+
+    def summarize(self, events: List[Event]) -> str:
+        """Extractive summary text of ``events``."""
+        questions: List[str] = []
+        facts: Dict[str, Any] = {}
+        reports: Dict[str, str] = {}
+        tools: Counter = Counter()
+        seen = set()
+
+        for event in events:
+            delta = event.actions.state_delta if event.actions else {}
+            for key, value in (delta or {}).items():
+                if key.startswith(("app:", "user:", "temp:")):
+                    continue
+                facts[key] = value
+                if isinstance(value, str):
+                    seen.add(_digest(value))
+            for call in event.get_function_calls():
+                tools[call.name] += 1
+
+            text = _text_of(event)
+            if not text.strip():
+                continue
+            if event.author == "user":
+                questions.append(text.strip())
+                continue
+            digest = _digest(text)
+            if digest in seen:
+                # Same text as a state value (output_key) or an earlier event.
+                continue
+            seen.add(digest)
+            # A later report of the same agent replaces the earlier one.
+            reports[event.author] = text
+
+        # Section title -> text condensed to the given number of tokens.
+        bodies: Dict[str, Callable[[int], str]] = {}
+        if questions:
+            asked = "\n".join(f"- {q}" for q in questions)
+            bodies["User questions:"] = lambda tokens: condense(asked, tokens)
+        for key, value in facts.items():
+            bodies[f"[{key}]"] = functools.partial(_format_fact, key, value)
+        for author, text in reports.items():
+            bodies[f"[report by {author}]"] = functools.partial(condense, text)
+
+        head = "Summary of the earlier conversation (extracted, not paraphrased)."
+        tail = ""
+        if tools:
+            calls = ", ".join(f"{name} x{count}" for name, count in tools.items())
+            tail = f"Tools called (results dropped): {calls}"
+        texts = {title: body(self.fact_tokens) for title, body in bodies.items()}
+        fixed = count_tokens(head + tail) + sum(count_tokens(title) + 1 for title in texts)
+        sizes = {title: count_tokens(text) for title, text in texts.items()}
+        if fixed + sum(sizes.values()) > self.summary_tokens:
+            shares = allocate(sizes, {}, max(0, self.summary_tokens - fixed))
+            texts = {title: bodies[title](shares[title]) for title in texts}
+
+        sections = [head]
+        sections.extend(f"{title}\n{text}" for title, text in texts.items() if text)
+        if tail:
+            sections.append(tail)
+        return "\n\n".join(sections)
+
+    async def maybe_summarize_events(self, *, events: list[Event]) -> Optional[Event]:
+        if not events:
+            return None
+        start = time.perf_counter()
+        summary = self.summarize(events)
+        registry.observe(
+            "compaction_seconds",
+            time.perf_counter() - start,
+            {"summarizer": "extractive"},
+            help="Time spent compacting session events",
+        )
+        input_tokens = sum(count_tokens(_text_of(e)) for e in events)
+        registry.inc(
+            "compaction_tokens_total",
+            {"stage": "input"},
+            input_tokens,
+            help="Text tokens of compacted events and of their summaries",
+        )
+        registry.inc("compaction_tokens_total", {"stage": "output"}, count_tokens(summary))
+        registry.observe(
+            "compaction_summary_tokens",
+            count_tokens(summary),
+            buckets=SIZE_BUCKETS,
+            help="Tokens of each compaction summary",
+        )
+
+        compaction = EventCompaction(
+            start_timestamp=events[0].timestamp,
+            end_timestamp=events[-1].timestamp,
+            compacted_content=types.Content(role="model", parts=[types.Part(text=summary)]),
+        )
+        return Event(
+            author="user",
+            actions=EventActions(compaction=compaction),
+            invocation_id=Event.new_id(),
+        )
@@ -0,0 +1,52 @@
+"""
+Concurrency helpers
+
+This module runs unavoidable blocking calls (HTTP clients without async
+support, SQLite, file loads) on a bounded thread pool, so async tools never
+block the event loop that the parallel agents share.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .metrics import record_queue_wait
+
+# Upper bound for threads running blocking tool work.
+MAX_BLOCKING_WORKERS = int(os.environ.get("TOOL_MAX_WORKERS", "8"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared blocking-call pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_BLOCKING_WORKERS, thread_name_prefix="tool-blocking"
+                )
+    return _executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Await ``fn(*args, **kwargs)`` running on the bounded thread pool."""
+    loop = asyncio.get_running_loop()
+    submitted = time.perf_counter()
+    started = []
+
+    def call():
+        started.append(time.perf_counter())
+        return fn(*args, **kwargs)
+
+    try:
+        return await loop.run_in_executor(get_executor(), call)
+    finally:
+        if started:
+            # Recorded in the calling task, so per-tool tracking sees it.
+            record_queue_wait(started[0] - submitted)
@@ -0,0 +1,236 @@
+"""
+Metrics registry
+
+This module keeps process-wide counters, gauges and histograms, and renders
+them in the Prometheus text exposition format. The runner plugins, the
+blocking thread pool and the A2A clients all record into the default
+``registry``, so one scrape (or one ``metrics.prom`` file) shows the whole
+process.
+"""
+
+import bisect
+import contextvars
+import math
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds, from 1ms to 2 minutes.
+DURATION_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+# Tokens and bytes, powers of 4 from 16 to 4M.
+SIZE_BUCKETS = tuple(float(4 ** i) for i in range(2, 12))
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram of one label set."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[i - 1] if i else 0.0
+                if i == len(self.buckets):
+                    # Above the last bound: the best we know is that bound.
+                    return lower
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of named metrics.
+
+    Every metric has a name, a help text and a type; its values are kept per
+    label set, e.g. ``registry.inc("adk_errors_total", {"kind": "tool"})``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name -> (type, help, buckets)
+        self._meta: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {}
+        self._values: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    def _declare(self, name: str, kind: str, help: str, buckets=()) -> None:
+        meta = self._meta.get(name)
+        if meta is None:
+            self._meta[name] = (kind, help, tuple(buckets))
+        elif meta[0] != kind:
+            raise ValueError(f"Metric {name} is a {meta[0]}, not a {kind}")
+
+    def inc(
+        self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1.0, help: str = ""
+    ) -> None:
+        """Add ``value`` to a counter."""
+        with self._lock:
+            self._declare(name, "counter", help)
+            values = self._values.setdefault(name, {})
+            key = _label_key(labels)
+            values[key] = values.get(key, 0.0) + value
+
+    def set_gauge(
+        self, name: str, value: float, labels: Optional[Dict[str, str]] = None, help: str = ""
+    ) -> None:
+        """Set a gauge to ``value``."""
+        with self._lock:
+            self._declare(name, "gauge", help)
+            self._values.setdefault(name, {})[_label_key(labels)] = value
+
+    def add_gauge(
+        self, name: str, delta: float, labels: Optional[Dict[str, str]] = None, help: str = ""
+    ) -> None:
+        """Move a gauge by ``delta`` (e.g. +1/-1 for calls in flight)."""
+        with self._lock:
+            self._declare(name, "gauge", help)
+            values = self._values.setdefault(name, {})
+            key = _label_key(labels)
+            values[key] = values.get(key, 0.0) + delta
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict[str, str]] = None,
+        buckets: Sequence[float] = DURATION_BUCKETS,
+        help: str = "",
+    ) -> None:
+        """Add one observation to a histogram."""
+        with self._lock:
+            self._declare(name, "histogram", help, buckets)
+            histograms = self._histograms.setdefault(name, {})
+            key = _label_key(labels)
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = Histogram(self._meta[name][2])
+            histogram.observe(value)
+
+    def value(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        """Current value of a counter or gauge (0 when never set)."""
+        with self._lock:
+            return self._values.get(name, {}).get(_label_key(labels), 0.0)
+
+    def histogram(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[Histogram]:
+        with self._lock:
+            return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def histograms(self, name: str) -> Iterable[Tuple[Dict[str, str], Histogram]]:
+        """All label sets of a histogram, as (labels, histogram) pairs."""
+        with self._lock:
+            items = list(self._histograms.get(name, {}).items())
+        return [(dict(key), histogram) for key, histogram in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._meta.clear()
+            self._values.clear()
+            self._histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._meta):
+                kind, help, _ = self._meta[name]
+                if help:
+                    lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                if kind != "histogram":
+                    for key, value in sorted(self._values.get(name, {}).items()):
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                    continue
+                for key, histogram in sorted(self._histograms.get(name, {}).items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        le = _format_labels(key, [("le", _format_value(bound))])
+                        lines.append(f"{name}_bucket{le} {cumulative}")
+                    le = _format_labels(key, [("le", "+Inf")])
+                    lines.append(f"{name}_bucket{le} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write ``to_prometheus()`` to ``path`` atomically (for textfile collectors)."""
+        text = self.to_prometheus()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+# Process-wide registry used by the plugins and helpers.
+registry = MetricsRegistry()
+
+# Seconds the current task spent waiting for blocking-pool threads.
+_queue_wait: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "queue_wait", default=None
+)
+
+
+def start_queue_wait_tracking() -> contextvars.Token:
+    """Start summing the blocking-pool queue wait of the current task."""
+    return _queue_wait.set([0.0])
+
+
+def stop_queue_wait_tracking(token: contextvars.Token) -> float:
+    """Stop tracking and return the queue wait summed since the matching start."""
+    total = _queue_wait.get()
+    _queue_wait.reset(token)
+    return total[0] if total else 0.0
+
+
+def record_queue_wait(seconds: float) -> None:
+    """Record the time one blocking call waited for a pool thread."""
+    registry.observe(
+        "blocking_queue_wait_seconds",
+        seconds,
+        help="Time blocking calls waited for a thread of the shared pool.",
+    )
+    total = _queue_wait.get()
+    if total is not None:
+        total[0] += seconds
@@ -0,0 +1,220 @@
+"""
+Offline backend
+
+This module provides a local, deterministic stand-in for the Gemini model and
+the external search tools, so the whole ``root_agent`` pipeline can run (and
+be benchmarked) without network access.
+
+``ScriptedLlm`` behaves like a well-behaved tool-calling model: when the
+agent has function tools and no tool answered yet, it calls the first one;
+otherwise it writes a deterministic answer of the configured size. Latency
+and output size can be set globally or per agent name.
+
+Usage::
+
+    from system_monitor_agent.offline import use_offline_backend
+    use_offline_backend(root_agent, latency=0.2, output_chars=1500)
+"""
+
+import asyncio
+import hashlib
+import time
+from typing import Any, AsyncGenerator, Dict, Iterator, Optional, Union
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+
+from .cache import TTLCache
+from .subagents.local_news_agent import tools as news_tools
+from .subagents.trending_fashion_agent import snapshot as trends_snapshot
+
+# Tools the scripted model never calls by itself.
+SKIPPED_TOOLS = {"transfer_to_agent"}
+
+_WORDS = (
+    "linen shirts, white sneakers, denim jackets, floral dresses, oversized hoodies, "
+    "pastel colors, earth tones, sustainable cotton, athleisure, quiet luxury, "
+    "festive ethnic wear, leather handbags, running shoes, sports caps, winter coats, "
+    "Gen Z buyers, social media reels, weekend sales, local festival demand"
+).split(", ")
+
+PerAgent = Union[float, Dict[str, float]]
+
+
+def _for_agent(value: Any, agent_name: str, default: Any) -> Any:
+    if isinstance(value, dict):
+        return value.get(agent_name, value.get("*", default))
+    return value
+
+
+def scripted_text(seed: str, size: int) -> str:
+    """Deterministic fashion-flavoured text of ``size`` characters."""
+    digest = int(hashlib.sha256(seed.encode("utf-8")).hexdigest(), 16)
+    sentences = []
+    length = 0
+    i = 0
+    while length < size:
+        a = _WORDS[(digest + i) % len(_WORDS)]
+        b = _WORDS[(digest // 7 + 3 * i) % len(_WORDS)]
+        sentence = f"- {a.capitalize()} are doing well together with {b}."
+        sentences.append(sentence)
+        length += len(sentence) + 1
+        i += 1
+    return "\n".join(sentences)[:size]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class ScriptedLlm(BaseLlm):
+    """
+    Deterministic local model.
+
+    Attributes:
+        latency: seconds per model call, or a dict of agent name -> seconds
+            (use "*" for the default).
+        output_chars: characters of the final answer, same format as latency.
+        stream_chunks: number of partial responses when streaming.
+    """
+
+    # A "gemini-" name keeps model built-in tools like google_search valid.
+    model: str = "gemini-scripted"
+    latency: PerAgent = 0.0
+    output_chars: PerAgent = 800
+    stream_chunks: int = 8
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        agent_name = (llm_request.config.labels or {}).get("adk_agent_name", "")
+        latency = float(_for_agent(self.latency, agent_name, 0.0))
+        prompt = str(llm_request.config.system_instruction or "") + "".join(
+            part.text or ""
+            for content in llm_request.contents
+            for part in content.parts or []
+        )
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=estimate_tokens(prompt)
+        )
+
+        call = self._next_function_call(llm_request)
+        if call is not None:
+            await asyncio.sleep(latency)
+            usage.candidates_token_count = 8
+            yield LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(function_call=call)]),
+                usage_metadata=usage,
+                turn_complete=True,
+            )
+            return
+
+        size = int(_for_agent(self.output_chars, agent_name, 800))
+        text = f"## {agent_name or 'Answer'}\n" + scripted_text(agent_name + prompt, size)
+        usage.candidates_token_count = estimate_tokens(text)
+
+        if not stream:
+            await asyncio.sleep(latency)
+            yield LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+                usage_metadata=usage,
+                turn_complete=True,
+            )
+            return
+
+        chunks = max(1, self.stream_chunks)
+        step = -(-len(text) // chunks)
+        for begin in range(0, len(text), step):
+            await asyncio.sleep(latency / chunks)
+            yield LlmResponse(
+                content=types.Content(
+                    role="model", parts=[types.Part(text=text[begin : begin + step])]
+                ),
+                partial=True,
+            )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            usage_metadata=usage,
+            turn_complete=True,
+        )
+
+    @staticmethod
+    def _next_function_call(llm_request: LlmRequest) -> Optional[types.FunctionCall]:
+        last = llm_request.contents[-1] if llm_request.contents else None
+        if last and any(part.function_response for part in last.parts or []):
+            return None
+        for tool in llm_request.config.tools or []:
+            for declaration in getattr(tool, "function_declarations", None) or []:
+                if declaration.name in SKIPPED_TOOLS:
+                    continue
+                args = {}
+                parameters = declaration.parameters
+                for name in (parameters.required or []) if parameters else []:
+                    args[name] = "latest fashion trends"
+                return types.FunctionCall(name=declaration.name, args=args)
+        return None
+
+
+def iter_llm_agents(agent: BaseAgent) -> Iterator[LlmAgent]:
+    """Yield every LlmAgent of the tree, including agents wrapped in AgentTools."""
+    if isinstance(agent, LlmAgent):
+        yield agent
+        for tool in agent.tools:
+            if isinstance(tool, AgentTool):
+                yield from iter_llm_agents(tool.agent)
+    for sub_agent in agent.sub_agents:
+        yield from iter_llm_agents(sub_agent)
+
+
+def use_offline_backend(
+    agent: BaseAgent,
+    latency: PerAgent = 0.0,
+    output_chars: PerAgent = 800,
+    search_latency: float = 0.0,
+    search_results: int = 5,
+    fresh_caches: bool = True,
+) -> ScriptedLlm:
+    """
+    Switch ``agent`` and every agent below it to a ``ScriptedLlm`` and the
+    news search to a local stub.
+
+    Args:
+        agent: root of the agent tree, modified in place.
+        latency: model latency per call, see ``ScriptedLlm``.
+        output_chars: model answer size, see ``ScriptedLlm``.
+        search_latency: seconds the stubbed news search blocks.
+        search_results: number of stubbed news results.
+        fresh_caches: replace the news and trends caches with empty,
+            memory-only ones so earlier runs do not leak in.
+
+    Returns:
+        ScriptedLlm: the shared model, e.g. to read its call count.
+    """
+    llm = ScriptedLlm(latency=latency, output_chars=output_chars)
+    for llm_agent in iter_llm_agents(agent):
+        llm_agent.model = llm
+
+    def stub_search(query: str) -> Dict[str, Any]:
+        time.sleep(search_latency)
+        return {
+            "query": query,
+            "results": [
+                {
+                    "title": f"Local fashion news {i + 1}",
+                    "url": f"https://news.example/{i + 1}",
+                    "content": scripted_text(f"{query}:{i}", 300),
+                }
+                for i in range(search_results)
+            ],
+        }
+
+    news_tools.set_search_provider(stub_search)
+    if fresh_caches:
+        news_tools.news_cache = TTLCache(ttl=news_tools.news_cache.ttl)
+        trends_snapshot.trends_cache = TTLCache(ttl=trends_snapshot.trends_cache.ttl)
+    return llm
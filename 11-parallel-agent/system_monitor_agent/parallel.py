@@ -0,0 +1,151 @@
+"""
+Deadline-aware parallel gathering
+
+``DeadlineParallelAgent`` runs its sub-agents concurrently like
+``ParallelAgent``, but each branch has a time budget. A branch that is still
+running when its budget is spent is cancelled, and so is one that fails.
+Either way, the state keys it should have written (the ``output_key`` of
+its agents) are set to a short "unavailable" marker. The next agent then
+runs on whatever arrived, and its instruction shows which inputs are missing
+instead of failing on an absent key.
+
+Branch outcomes and durations are exported through ``metrics.registry``.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, AsyncGenerator, Dict, List, Set
+
+from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = float(os.environ.get("GATHER_BUDGET_SECONDS", "30"))
+
+MISSING_PREFIX = "[unavailable"
+
+
+def missing_marker(key: str, branch: str, reason: str) -> str:
+    """State value written for ``key`` when ``branch`` did not deliver it."""
+    return f"{MISSING_PREFIX}: {key} was not gathered, {branch} {reason}]"
+
+
+def is_missing(value: Any) -> bool:
+    """Whether a state value is absent or a ``missing_marker``."""
+    return not value or (isinstance(value, str) and value.startswith(MISSING_PREFIX))
+
+
+def output_keys(agent: BaseAgent) -> List[str]:
+    """State keys written by ``agent`` and the agents below it."""
+    keys = [agent.output_key] if isinstance(agent, LlmAgent) and agent.output_key else []
+    for sub_agent in agent.sub_agents:
+        keys.extend(key for key in output_keys(sub_agent) if key not in keys)
+    return keys
+
+
+class DeadlineParallelAgent(ParallelAgent):
+    """
+    ``ParallelAgent`` with a time budget per branch.
+
+    Attributes:
+        default_budget: seconds each branch may run.
+        budgets: per sub-agent name overrides of ``default_budget``.
+    """
+
+    default_budget: float = DEFAULT_BUDGET
+    budgets: Dict[str, float] = {}
+
+    def budget(self, sub_agent: BaseAgent) -> float:
+        return self.budgets.get(sub_agent.name, self.default_budget)
+
+    def _branch_ctx(self, sub_agent: BaseAgent, ctx: InvocationContext) -> InvocationContext:
+        # Same isolated branch as ParallelAgent gives its sub-agents.
+        branch_ctx = ctx.model_copy()
+        suffix = f"{self.name}.{sub_agent.name}"
+        branch_ctx.branch = f"{ctx.branch}.{suffix}" if ctx.branch else suffix
+        return branch_ctx
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        if not self.sub_agents:
+            return
+
+        sentinel = object()
+        queue: asyncio.Queue = asyncio.Queue()
+        # sub-agent name -> reason it did not finish
+        failed: Dict[str, str] = {}
+        delivered: Set[str] = set()
+
+        async def run_branch(sub_agent: BaseAgent) -> None:
+            budget = self.budget(sub_agent)
+            events = sub_agent.run_async(self._branch_ctx(sub_agent, ctx))
+            started = time.perf_counter()
+            outcome = "ok"
+            try:
+                async with asyncio.timeout(budget):
+                    async for event in events:
+                        if event.actions and event.actions.state_delta:
+                            delivered.update(event.actions.state_delta)
+                        resume = asyncio.Event()
+                        await queue.put((event, resume))
+                        # Like ParallelAgent: wait until the event is processed.
+                        await resume.wait()
+            except TimeoutError:
+                outcome = "timeout"
+                failed[sub_agent.name] = f"did not answer within {budget:g}s"
+            except Exception as e:
+                outcome = "error"
+                failed[sub_agent.name] = f"failed ({type(e).__name__})"
+                logger.warning("Gather branch %s failed: %s", sub_agent.name, e)
+            finally:
+                await events.aclose()
+                registry.inc(
+                    "gather_branch_total",
+                    {"branch": sub_agent.name, "outcome": outcome},
+                    help="Parallel gather branches by outcome (ok, timeout, error)",
+                )
+                registry.observe(
+                    "gather_branch_seconds",
+                    time.perf_counter() - started,
+                    {"branch": sub_agent.name},
+                    help="Duration of parallel gather branches",
+                )
+                await queue.put((sentinel, None))
+
+        tasks = [asyncio.create_task(run_branch(sub_agent)) for sub_agent in self.sub_agents]
+        try:
+            running = len(tasks)
+            while running:
+                event, resume = await queue.get()
+                if event is sentinel:
+                    running -= 1
+                    continue
+                yield event
+                resume.set()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        delta = {}
+        for sub_agent in self.sub_agents:
+            reason = failed.get(sub_agent.name)
+            if reason is None:
+                continue
+            for key in output_keys(sub_agent):
+                if key not in delivered:
+                    delta[key] = missing_marker(key, sub_agent.name, reason)
+        if delta:
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                actions=EventActions(state_delta=delta),
+            )
@@ -0,0 +1,5 @@
+"""Runner plugins for the fashion agent."""
+
+from .metrics import MetricsPlugin
+from .response_cache import ResponseCachePlugin
+from .trends_refresh import TrendsRefreshPlugin
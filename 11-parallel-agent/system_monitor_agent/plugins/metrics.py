@@ -0,0 +1,385 @@
+"""
+Latency and token metrics plugin
+
+This plugin records a span for every agent run, tool call and model call:
+start and end time, time spent queued for the blocking thread pool, token
+counts in and out (from the model usage metadata) and payload bytes. Spans
+are aggregated into histograms of the shared metrics ``registry`` and kept
+in a bounded buffer for tracing.
+
+Two exports are available, and both are rewritten after every run when
+their paths are set:
+
+- a Prometheus text file (for a node-exporter textfile collector or a quick
+  ``grep``), with ``adk_span_duration_seconds``, ``adk_queue_wait_seconds``,
+  ``adk_tokens`` and ``adk_payload_bytes`` histograms per kind and name;
+- a JSON trace in the Chrome trace event format, which opens in
+  ``chrome://tracing`` or Perfetto and shows the parallel branches of each
+  invocation side by side.
+
+Usage::
+
+    metrics = MetricsPlugin(prometheus_path="logs/metrics.prom", trace_path="logs/trace.json")
+    runner = InMemoryRunner(agent=root_agent, plugins=[metrics])
+    ...
+    print(metrics.report())
+"""
+
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+from ..concurrency import run_blocking
+from ..metrics import (
+    SIZE_BUCKETS,
+    MetricsRegistry,
+    registry as default_registry,
+    start_queue_wait_tracking,
+    stop_queue_wait_tracking,
+)
+
+logger = logging.getLogger(__name__)
+
+SPAN_DURATION = "adk_span_duration_seconds"
+QUEUE_WAIT = "adk_queue_wait_seconds"
+TOKENS = "adk_tokens"
+PAYLOAD_BYTES = "adk_payload_bytes"
+IN_FLIGHT = "adk_in_flight"
+ERRORS = "adk_errors_total"
+
+
+def _payload_size(value: Any) -> int:
+    """Size in bytes of ``value`` serialized as JSON."""
+    if value is None:
+        return 0
+    if hasattr(value, "model_dump"):
+        value = value.model_dump(mode="json", exclude_none=True)
+    return len(json.dumps(value, default=str).encode("utf-8"))
+
+
+class MetricsPlugin(BasePlugin):
+    """
+    Records agent, tool and model spans into histograms and a trace buffer.
+
+    Args:
+        prometheus_path: file rewritten with the Prometheus text export after
+            every run, defaults to ``METRICS_PROM_PATH`` (unset = no file).
+        trace_path: file rewritten with the JSON trace after every run,
+            defaults to ``METRICS_TRACE_PATH`` (unset = no file).
+        max_spans: spans kept for the trace; older ones are dropped.
+        registry: metrics registry, defaults to the process-wide one.
+    """
+
+    def __init__(
+        self,
+        name: str = "metrics",
+        prometheus_path: Optional[str] = None,
+        trace_path: Optional[str] = None,
+        max_spans: int = 20_000,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        super().__init__(name=name)
+        self.registry = registry or default_registry
+        self.prometheus_path = prometheus_path or os.environ.get("METRICS_PROM_PATH")
+        self.trace_path = trace_path or os.environ.get("METRICS_TRACE_PATH")
+        self.spans: Deque[Dict[str, Any]] = deque(maxlen=max_spans)
+        self._origin = time.perf_counter()
+        # Open spans: ("agent"|"model", invocation id, agent name) or ("tool", call id).
+        self._open: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+    # --- span bookkeeping ---------------------------------------------------
+
+    def _start(self, key: Tuple[str, ...], kind: str, name: str, ctx, **fields) -> Dict[str, Any]:
+        invocation = ctx._invocation_context
+        span = {
+            "kind": kind,
+            "name": name,
+            "agent": ctx.agent_name,
+            "invocation_id": ctx.invocation_id,
+            "branch": invocation.branch or "",
+            "start": time.perf_counter(),
+            **fields,
+        }
+        self._open[key] = span
+        self.registry.add_gauge(
+            IN_FLIGHT, 1, {"kind": kind}, help="Agent runs, tool calls and model calls in progress."
+        )
+        return span
+
+    def _finish(self, key: Tuple[str, ...], error: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        span = self._open.pop(key, None)
+        if span is None:
+            return None
+        span["end"] = time.perf_counter()
+        if error:
+            span["error"] = error
+        labels = {"kind": span["kind"], "name": span["name"]}
+        self.registry.add_gauge(IN_FLIGHT, -1, {"kind": span["kind"]})
+        if span.get("status") == "cancelled":
+            # Its end is when the run finished, not when it was cancelled,
+            # so it is kept for the trace but not in the histograms.
+            self.spans.append(span)
+            return span
+        self.registry.observe(
+            SPAN_DURATION,
+            span["end"] - span["start"],
+            labels,
+            help="Wall time of agent runs, tool calls and model calls.",
+        )
+        if "queue_wait" in span:
+            self.registry.observe(
+                QUEUE_WAIT,
+                span["queue_wait"],
+                labels,
+                help="Time a call waited for a thread of the blocking pool.",
+            )
+        for direction in ("in", "out"):
+            tokens = span.get(f"tokens_{direction}")
+            if tokens is not None:
+                self.registry.observe(
+                    TOKENS,
+                    tokens,
+                    {**labels, "direction": direction},
+                    buckets=SIZE_BUCKETS,
+                    help="Prompt (in) and candidate (out) tokens per model call.",
+                )
+            size = span.get(f"bytes_{direction}")
+            if size is not None:
+                self.registry.observe(
+                    PAYLOAD_BYTES,
+                    size,
+                    {**labels, "direction": direction},
+                    buckets=SIZE_BUCKETS,
+                    help="Serialized size of requests (in) and responses (out).",
+                )
+        if error:
+            self.registry.inc(ERRORS, labels, help="Failed agent runs, tool calls and model calls.")
+        self.spans.append(span)
+        return span
+
+    # --- callbacks ----------------------------------------------------------
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> Optional[types.Content]:
+        key = ("agent", callback_context.invocation_id, agent.name)
+        self._start(key, "agent", agent.name, callback_context)
+        return None
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> Optional[types.Content]:
+        self._finish(("model", callback_context.invocation_id, agent.name))
+        self._finish(("agent", callback_context.invocation_id, agent.name))
+        return None
+
+    async def on_event_callback(
+        self, *, invocation_context: InvocationContext, event: Event
+    ) -> Optional[Event]:
+        # A model call answered by a later plugin (e.g. the response cache)
+        # never reaches after_model; its response event closes the span.
+        key = ("model", invocation_context.invocation_id, event.author)
+        span = self._open.get(key)
+        if span is not None and not event.partial:
+            span["short_circuited"] = True
+            span["bytes_out"] = _payload_size(event.content)
+            self._finish(key)
+        return None
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        key = ("model", callback_context.invocation_id, callback_context.agent_name)
+        self._start(
+            key,
+            "model",
+            callback_context.agent_name,
+            callback_context,
+            model=llm_request.model or "",
+            bytes_in=sum(_payload_size(content) for content in llm_request.contents)
+            + len(str(llm_request.config.system_instruction or "").encode("utf-8")),
+        )
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        key = ("model", callback_context.invocation_id, callback_context.agent_name)
+        span = self._open.get(key)
+        if span is None:
+            return None
+        if "first_token" not in span:
+            span["first_token"] = time.perf_counter()
+        if llm_response.partial:
+            return None
+        usage = llm_response.usage_metadata
+        if usage is not None:
+            span["tokens_in"] = usage.prompt_token_count or 0
+            span["tokens_out"] = usage.candidates_token_count or 0
+        span["bytes_out"] = _payload_size(llm_response.content)
+        self._finish(key, error=llm_response.error_code)
+        return None
+
+    async def on_model_error_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> Optional[LlmResponse]:
+        key = ("model", callback_context.invocation_id, callback_context.agent_name)
+        self._finish(key, error=type(error).__name__)
+        return None
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: Dict[str, Any], tool_context: ToolContext
+    ) -> Optional[dict]:
+        # Each function call runs in its own task, so the queue wait tracked
+        # here only covers the blocking calls made by this tool.
+        self._start(
+            ("tool", tool_context.function_call_id or ""),
+            "tool",
+            tool.name,
+            tool_context,
+            bytes_in=_payload_size(tool_args),
+            queue_token=start_queue_wait_tracking(),
+        )
+        return None
+
+    async def after_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: Dict[str, Any],
+        tool_context: ToolContext,
+        result: dict,
+    ) -> Optional[dict]:
+        self._finish_tool(tool_context, result=result)
+        return None
+
+    async def on_tool_error_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: Dict[str, Any],
+        tool_context: ToolContext,
+        error: Exception,
+    ) -> Optional[dict]:
+        self._finish_tool(tool_context, error=type(error).__name__)
+        return None
+
+    def _finish_tool(self, tool_context: ToolContext, result: Any = None, error: Optional[str] = None):
+        key = ("tool", tool_context.function_call_id or "")
+        span = self._open.get(key)
+        if span is None:
+            return
+        span["queue_wait"] = stop_queue_wait_tracking(span.pop("queue_token"))
+        if error is None:
+            span["bytes_out"] = _payload_size(result)
+        self._finish(key, error=error)
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        # A cancelled task (e.g. a gather branch past its deadline) never
+        # reaches its after_* callbacks; close what it left open.
+        for key, span in list(self._open.items()):
+            if span["invocation_id"] == invocation_context.invocation_id:
+                span["status"] = "cancelled"
+                self._finish(key)
+        if self.prometheus_path or self.trace_path:
+            try:
+                await run_blocking(self.export)
+            except OSError:
+                logger.exception("Writing the metrics export failed")
+        return None
+
+    # --- exports ------------------------------------------------------------
+
+    def export(self) -> None:
+        """Write the Prometheus text file and the JSON trace to their paths."""
+        if self.prometheus_path:
+            self.registry.write_prometheus(self.prometheus_path)
+        if self.trace_path:
+            directory = os.path.dirname(os.path.abspath(self.trace_path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.trace_path, "w", encoding="utf-8") as f:
+                json.dump(self.trace(), f)
+
+    def trace(self) -> Dict[str, Any]:
+        """
+        Spans in the Chrome trace event format.
+
+        Every invocation is a process and every branch (the parallel gatherer
+        branches, the synthesizer, ...) a thread, so overlapping branches are
+        drawn as parallel lanes.
+        """
+        events: List[Dict[str, Any]] = []
+        pids: Dict[str, int] = {}
+        tids: Dict[Tuple[str, str], int] = {}
+        for span in list(self.spans):
+            pid = pids.get(span["invocation_id"])
+            if pid is None:
+                pid = pids[span["invocation_id"]] = len(pids) + 1
+                events.append(
+                    {"ph": "M", "name": "process_name", "pid": pid, "tid": 0,
+                     "args": {"name": span["invocation_id"]}}
+                )
+            lane = (span["invocation_id"], span["branch"])
+            tid = tids.get(lane)
+            if tid is None:
+                tid = tids[lane] = len(tids) + 1
+                events.append(
+                    {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid,
+                     "args": {"name": span["branch"] or "(root)"}}
+                )
+            args = {
+                k: v
+                for k, v in span.items()
+                if k not in ("kind", "name", "start", "end", "invocation_id", "branch")
+            }
+            if "first_token" in args:
+                args["time_to_first_token_ms"] = (span["first_token"] - span["start"]) * 1e3
+                del args["first_token"]
+            events.append(
+                {
+                    "ph": "X",
+                    "cat": span["kind"],
+                    "name": f"{span['kind']}:{span['name']}",
+                    "pid": pid,
+                    "tid": tid,
+                    "ts": (span["start"] - self._origin) * 1e6,
+                    "dur": (span["end"] - span["start"]) * 1e6,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def report(self) -> str:
+        """Per kind and name: count, p50/p95 latency and mean tokens, slowest first."""
+        rows = []
+        for labels, histogram in self.registry.histograms(SPAN_DURATION):
+            tokens_out = self.registry.histogram(
+                TOKENS, {**labels, "direction": "out"}
+            )
+            rows.append(
+                (
+                    histogram.quantile(0.95),
+                    f"{labels['kind']:<6} {labels['name']:<34} n={histogram.count:<5} "
+                    f"p50 {histogram.quantile(0.5):7.3f}s  p95 {histogram.quantile(0.95):7.3f}s"
+                    + (
+                        f"  tokens out {tokens_out.sum / tokens_out.count:7.0f}"
+                        if tokens_out and tokens_out.count
+                        else ""
+                    ),
+                )
+            )
+        return "\n".join(line for _, line in sorted(rows, reverse=True))
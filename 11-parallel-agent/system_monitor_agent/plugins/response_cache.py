@@ -0,0 +1,267 @@
+"""
+LLM response cache plugin
+
+This plugin answers model calls from a content-addressed cache when an agent
+sends a byte-identical request again: same model, same instruction (with the
+injected state already resolved), same conversation contents and tool
+outputs, same tool declarations and generation config.
+
+Entries live in two tiers: an in-memory LRU and a SQLite file. Both tiers
+are bounded; the SQLite tier also expires entries after ``ttl`` seconds and
+evicts the least recently used rows past ``disk_size``.
+
+Requests grounded by a built-in search or retrieval tool (``google_search``
+and friends) are never cached: their answers depend on the live web, and
+their freshness is owned by the news cache and the trends snapshot TTLs.
+Responses carrying ``grounding_metadata`` are not stored either.
+
+Usage::
+
+    runner = Runner(
+        agent=root_agent,
+        app_name=APP_NAME,
+        session_service=session_service,
+        plugins=[ResponseCachePlugin()],
+    )
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+
+from ..cache import LRUCache, cache_path, connect_sqlite
+from ..concurrency import run_blocking
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = cache_path("llm_cache.db")
+
+# ``types.Tool`` fields of built-in tools that ground the answer in live data.
+GROUNDING_TOOLS = (
+    "google_search",
+    "google_search_retrieval",
+    "enterprise_web_search",
+    "retrieval",
+    "google_maps",
+    "url_context",
+    "file_search",
+    "parallel_ai_search",
+)
+
+
+def _content_for_key(content) -> Dict[str, Any]:
+    dumped = content.model_dump(mode="json", exclude_none=True)
+    for part in dumped.get("parts", []):
+        # Function call/response ids are random per run, they must not change the key.
+        for field in ("function_call", "function_response"):
+            if field in part:
+                part[field].pop("id", None)
+    return dumped
+
+
+def is_grounded(llm_request: LlmRequest) -> bool:
+    """Whether ``llm_request`` enables a built-in search or grounding tool."""
+    tools = llm_request.config.tools if llm_request.config else None
+    return any(
+        getattr(tool, field, None) is not None for tool in tools or [] for field in GROUNDING_TOOLS
+    )
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """Content hash of everything in ``llm_request`` that shapes the answer."""
+    config = llm_request.config.model_dump(
+        mode="json", exclude_none=True, exclude={"labels", "http_options"}
+    )
+    payload = {
+        "model": llm_request.model,
+        "config": config,
+        "contents": [_content_for_key(content) for content in llm_request.contents],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class SQLiteResponseStore:
+    """Disk tier of the response cache."""
+
+    def __init__(self, path: str, max_size: int, ttl: float):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = connect_sqlite(self.path)
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_responses ("
+                    "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                    "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used "
+                    "ON llm_responses (last_used)"
+                )
+        return connection
+
+    def get(self, key: str) -> Optional[str]:
+        connection = self._connection()
+        now = time.time()
+        row = connection.execute(
+            "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        with connection:
+            if self.ttl and row[1] + self.ttl <= now:
+                connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+            connection.execute(
+                "UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key)
+            )
+        return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        connection = self._connection()
+        now = time.time()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            if self.ttl:
+                expired = connection.execute(
+                    "DELETE FROM llm_responses WHERE created_at <= ?", (now - self.ttl,)
+                ).rowcount
+                self.evictions += expired
+            overflow = connection.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,),
+            ).rowcount
+            self.evictions += overflow
+
+
+class ResponseCachePlugin(BasePlugin):
+    """
+    Serves repeated model requests from a memory LRU and a SQLite cache.
+
+    Args:
+        memory_size: entries kept in the in-memory LRU tier.
+        disk_size: entries kept in the SQLite tier (0 disables the tier).
+        ttl: seconds an entry stays valid in the SQLite tier (0 = forever).
+        path: SQLite file, defaults to ``LLM_CACHE_PATH`` or ``llm_cache.db``
+            in the cache directory.
+    """
+
+    def __init__(
+        self,
+        name: str = "response_cache",
+        memory_size: int = 256,
+        disk_size: int = 10_000,
+        ttl: float = 24 * 60 * 60,
+        path: Optional[str] = None,
+    ):
+        super().__init__(name=name)
+        self.memory = LRUCache(memory_size)
+        self.disk = (
+            SQLiteResponseStore(
+                path or os.environ.get("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                max_size=disk_size,
+                ttl=ttl,
+            )
+            if disk_size
+            else None
+        )
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        # (invocation id, agent name) -> key of the model call in flight.
+        self._pending: Dict[Tuple[str, str], str] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of both tiers."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "memory_entries": len(self.memory),
+            "memory_evictions": self.memory.evictions,
+            "disk_evictions": self.disk.evictions if self.disk else 0,
+        }
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        if is_grounded(llm_request):
+            return None
+        key = request_key(llm_request)
+
+        cached = self.memory.get(key)
+        if cached is not None:
+            self.memory_hits += 1
+        elif self.disk is not None:
+            cached = await run_blocking(self.disk.get, key)
+            if cached is not None:
+                self.disk_hits += 1
+                self.memory.set(key, cached)
+
+        if cached is None:
+            self.misses += 1
+            self._pending[(callback_context.invocation_id, callback_context.agent_name)] = key
+            return None
+
+        logger.debug("Response cache hit for %s", callback_context.agent_name)
+        response = LlmResponse.model_validate_json(cached)
+        response.custom_metadata = {**(response.custom_metadata or {}), "response_cache": "hit"}
+        return response
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        pending = (callback_context.invocation_id, callback_context.agent_name)
+        if llm_response.partial:
+            return None
+        key = self._pending.pop(pending, None)
+        if key is None or llm_response.error_code or not llm_response.content:
+            return None
+        if llm_response.grounding_metadata is not None:
+            # Search-grounded answers go stale with the web they came from.
+            return None
+
+        stored = llm_response.model_copy(deep=True)
+        for part in stored.content.parts or []:
+            if part.function_call:
+                # Let the flow assign fresh ids when the response is replayed.
+                part.function_call.id = None
+        encoded = stored.model_dump_json(exclude_none=True)
+
+        self.memory.set(key, encoded)
+        if self.disk is not None:
+            await run_blocking(self.disk.set, key, encoded)
+        self.stores += 1
+        return None
+
+    async def on_model_error_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> Optional[LlmResponse]:
+        self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        return None
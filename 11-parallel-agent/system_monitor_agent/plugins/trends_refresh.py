@@ -0,0 +1,37 @@
+"""
+Trends snapshot refresh plugin
+
+Starts the scheduled refresh of the global trends snapshot (see
+``subagents/trending_fashion_agent/snapshot.py``) before the first run of a
+runner, on the runner's own event loop, so sessions find a fresh snapshot
+instead of paying for the trends search themselves.
+"""
+
+from typing import Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+
+from ..subagents.trending_fashion_agent import trending_fashion_agent
+from ..subagents.trending_fashion_agent.snapshot import ensure_trends_refresh
+
+
+class TrendsRefreshPlugin(BasePlugin):
+    """
+    Keeps the trends snapshot refreshed while runs happen.
+
+    Args:
+        agent: the trending agent whose output is the snapshot.
+    """
+
+    def __init__(self, agent: BaseAgent = trending_fashion_agent, name: str = "trends_refresh"):
+        super().__init__(name=name)
+        self.agent = agent
+
+    async def before_run_callback(
+        self, *, invocation_context: InvocationContext
+    ) -> Optional[types.Content]:
+        ensure_trends_refresh(self.agent)
+        return None
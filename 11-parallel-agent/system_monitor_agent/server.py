@@ -0,0 +1,93 @@
+"""
+Report streaming server
+
+A small FastAPI app that streams the fashion report over Server-Sent Events.
+``POST /report/stream`` with ``{"query": ..., "session_id": ..., "store": {...}}``
+answers with ``text/event-stream``: one ``agent`` event per agent that
+answers, ``delta`` events with the pieces of the report, then a ``done``
+event with the time to first and last token (or an ``error`` event). Every
+``data:`` line is one JSON chunk of ``streaming.stream_report``.
+
+Run from the ``11-parallel-agent`` directory:
+
+    python -m system_monitor_agent.server
+
+Settings: ``REPORT_API_HOST`` (127.0.0.1) and ``REPORT_API_PORT`` (8080).
+"""
+
+import json
+import logging
+import os
+import uuid
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from google.adk.runners import Runner
+from pydantic import BaseModel, Field
+
+from .streaming import stream_report
+
+logger = logging.getLogger(__name__)
+
+HOST = os.environ.get("REPORT_API_HOST", "127.0.0.1")
+PORT = int(os.environ.get("REPORT_API_PORT", "8080"))
+
+
+class ReportRequest(BaseModel):
+    query: str = "How can I increase my sales?"
+    session_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    user_id: Optional[str] = None
+    # Store profile of a new session (store_name, type_of_store, city, country)
+    store: Optional[Dict[str, Any]] = None
+
+
+def sse(event: str, data: Dict[str, Any]) -> str:
+    """One Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def create_app(runner: Optional[Runner] = None) -> FastAPI:
+    """
+    FastAPI app streaming the reports of ``runner`` (by default the runner
+    over the persistent session store, see ``app.get_runner``).
+    """
+    from . import app as fashion_app
+
+    api = FastAPI(title="Fashion Advisor reports")
+
+    async def events(request: ReportRequest) -> AsyncGenerator[str, None]:
+        active_runner = runner or fashion_app.get_runner()
+        try:
+            async for chunk in stream_report(
+                active_runner,
+                request.query,
+                request.user_id or fashion_app.USER_ID,
+                request.session_id,
+                state=request.store or fashion_app.initial_state,
+            ):
+                yield sse(chunk["type"], chunk)
+        except Exception as error:
+            logger.exception("Report stream of session %s failed", request.session_id)
+            yield sse("error", {"type": "error", "message": str(error)})
+
+    @api.post("/report/stream")
+    async def report_stream(request: ReportRequest) -> StreamingResponse:
+        return StreamingResponse(
+            events(request),
+            media_type="text/event-stream",
+            # Proxies must pass the events through as they come.
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    return api
+
+
+def main() -> None:
+    import uvicorn
+
+    uvicorn.run(create_app(), host=HOST, port=PORT)
+
+
+if __name__ == "__main__":
+    main()
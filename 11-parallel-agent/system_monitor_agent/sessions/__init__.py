@@ -0,0 +1,4 @@
+"""Session services for the fashion agent."""
+
+from .sqlite_session_service import SQLiteSessionService
+from .tiered_session_service import TieredSessionService
@@ -0,0 +1,233 @@
+"""
+Content-addressed blob storage for session events
+
+Large values inside events (the retail data tool response, search results,
+long agent answers and the same texts again in ``state_delta``) are stored
+once in the ``event_blobs`` table, keyed by the SHA-256 of their JSON with
+sorted keys. The stored JSON keeps the value's own key order. The event row
+only keeps a ``{"__blob__": "<sha256>"}`` reference, which is swapped back
+for the value when the session is read.
+
+``event_blob_refs`` records which sessions reference which blobs; when a
+session is deleted, the blobs no other session references are deleted too.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session as DatabaseSession
+
+from ..cache import LRUCache
+
+BLOB_KEY = "__blob__"
+
+CREATE_BLOBS_TABLE = (
+    "CREATE TABLE IF NOT EXISTS event_blobs ("
+    "hash TEXT PRIMARY KEY, data TEXT NOT NULL, size INTEGER NOT NULL)"
+)
+CREATE_REFS_TABLE = (
+    "CREATE TABLE IF NOT EXISTS event_blob_refs ("
+    "app_name TEXT NOT NULL, user_id TEXT NOT NULL, session_id TEXT NOT NULL, "
+    "hash TEXT NOT NULL, PRIMARY KEY (app_name, user_id, session_id, hash))"
+)
+CREATE_REFS_INDEX = "CREATE INDEX IF NOT EXISTS idx_event_blob_refs_hash ON event_blob_refs (hash)"
+
+# SQLite limits the number of bound parameters per statement.
+_IN_CHUNK = 500
+
+
+def _encode(value: Any, sort_keys: bool = False) -> str:
+    return json.dumps(value, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False)
+
+
+def _digest(value: Any) -> str:
+    # Sorted keys, so equal values share a blob whatever their key order
+    # (the blob keeps the order of the first one stored).
+    return hashlib.sha256(_encode(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and BLOB_KEY in value
+
+
+class BlobStore:
+    """
+    Moves large event values into ``event_blobs`` and back.
+
+    Args:
+        threshold: values whose JSON is at least this many bytes become blobs.
+        known_size: hashes remembered as already stored, so repeated payloads
+            skip the insert entirely.
+    """
+
+    def __init__(self, threshold: int = 1024, known_size: int = 4096):
+        self.threshold = threshold
+        self._known = LRUCache(known_size)
+        self.bytes_deduplicated = 0
+
+    def create_table(self, connection) -> bool:
+        """
+        Create the blob tables. Returns True when blobs were stored before
+        references were recorded, so the caller must ``add_refs`` for the
+        existing events.
+        """
+        had_refs = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'event_blob_refs'")
+        ).first()
+        connection.execute(text(CREATE_BLOBS_TABLE))
+        connection.execute(text(CREATE_REFS_TABLE))
+        connection.execute(text(CREATE_REFS_INDEX))
+        if had_refs:
+            return False
+        return connection.execute(text("SELECT 1 FROM event_blobs LIMIT 1")).first() is not None
+
+    # --- write side -------------------------------------------------------
+
+    def _ref(self, value: Any, new_blobs: Dict[str, str]) -> Any:
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        encoded = _encode(value)
+        if len(encoded) < self.threshold:
+            return value
+        digest = _digest(value)
+        if digest in new_blobs or digest in self._known:
+            self.bytes_deduplicated += len(encoded)
+        else:
+            new_blobs[digest] = encoded
+        return {BLOB_KEY: digest}
+
+    def externalize_content(self, content: Optional[dict], new_blobs: Dict[str, str]) -> Optional[dict]:
+        """Replace large texts, tool arguments and tool responses by references."""
+        if not content:
+            return content
+        for part in content.get("parts", []):
+            if "text" in part:
+                part["text"] = self._ref(part["text"], new_blobs)
+            if "function_call" in part and "args" in part["function_call"]:
+                part["function_call"]["args"] = self._ref(part["function_call"]["args"], new_blobs)
+            if "function_response" in part and "response" in part["function_response"]:
+                part["function_response"]["response"] = self._ref(
+                    part["function_response"]["response"], new_blobs
+                )
+        return content
+
+    def externalize_delta(self, state_delta: Dict[str, Any], new_blobs: Dict[str, str]) -> Dict[str, Any]:
+        """Copy of ``state_delta`` with large values replaced by references."""
+        return {key: self._ref(value, new_blobs) for key, value in state_delta.items()}
+
+    def store(self, sql_session: DatabaseSession, new_blobs: Dict[str, str]) -> None:
+        """Insert blobs not stored yet, inside the caller's transaction."""
+        if not new_blobs:
+            return
+        sql_session.execute(
+            text("INSERT OR IGNORE INTO event_blobs (hash, data, size) VALUES (:hash, :data, :size)"),
+            [
+                {"hash": digest, "data": data, "size": len(data)}
+                for digest, data in new_blobs.items()
+            ],
+        )
+
+    def add_refs(
+        self, sql_session: DatabaseSession, session_key: Tuple[str, str, str], hashes: Iterable[str]
+    ) -> None:
+        """Record that the session ``(app_name, user_id, session_id)`` references ``hashes``."""
+        app_name, user_id, session_id = session_key
+        rows = [
+            {"app_name": app_name, "user_id": user_id, "session_id": session_id, "hash": digest}
+            for digest in hashes
+        ]
+        if rows:
+            sql_session.execute(
+                text(
+                    "INSERT OR IGNORE INTO event_blob_refs (app_name, user_id, session_id, hash) "
+                    "VALUES (:app_name, :user_id, :session_id, :hash)"
+                ),
+                rows,
+            )
+
+    def release_session(
+        self, sql_session: DatabaseSession, app_name: str, user_id: str, session_id: str
+    ) -> int:
+        """
+        Drop the references of a deleted session and the blobs nobody else
+        references, inside the caller's transaction. Returns the number of
+        deleted blobs.
+        """
+        key = {"app_name": app_name, "user_id": user_id, "session_id": session_id}
+        where = "app_name = :app_name AND user_id = :user_id AND session_id = :session_id"
+        hashes = [
+            row[0]
+            for row in sql_session.execute(
+                text(f"SELECT hash FROM event_blob_refs WHERE {where}"), key
+            )
+        ]
+        sql_session.execute(text(f"DELETE FROM event_blob_refs WHERE {where}"), key)
+        deleted = 0
+        for begin in range(0, len(hashes), _IN_CHUNK):
+            chunk = hashes[begin : begin + _IN_CHUNK]
+            placeholders = ", ".join(f":h{i}" for i in range(len(chunk)))
+            deleted += sql_session.execute(
+                text(
+                    f"DELETE FROM event_blobs WHERE hash IN ({placeholders}) AND NOT EXISTS "
+                    "(SELECT 1 FROM event_blob_refs r WHERE r.hash = event_blobs.hash)"
+                ),
+                {f"h{i}": digest for i, digest in enumerate(chunk)},
+            ).rowcount
+        # Deleted blobs must be inserted again by the next event that uses them.
+        for digest in hashes:
+            self._known.pop(digest)
+        return deleted
+
+    def mark_stored(self, hashes: Iterable[str]) -> None:
+        """Remember committed hashes (call after the transaction commits)."""
+        for digest in hashes:
+            self._known.set(digest, True)
+
+    # --- read side --------------------------------------------------------
+
+    @staticmethod
+    def collect_refs(value: Any, refs: Set[str]) -> None:
+        """Add every blob hash referenced inside ``value`` to ``refs``."""
+        if _is_ref(value):
+            refs.add(value[BLOB_KEY])
+        elif isinstance(value, dict):
+            for item in value.values():
+                BlobStore.collect_refs(item, refs)
+        elif isinstance(value, list):
+            for item in value:
+                BlobStore.collect_refs(item, refs)
+
+    @staticmethod
+    def collect_event_refs(storage_event: Any, refs: Set[str]) -> None:
+        """Add the blob hashes referenced by a stored event to ``refs``."""
+        BlobStore.collect_refs(storage_event.content, refs)
+        if storage_event.actions and storage_event.actions.state_delta:
+            BlobStore.collect_refs(storage_event.actions.state_delta, refs)
+
+    def load(self, sql_session: DatabaseSession, hashes: Iterable[str]) -> Dict[str, Any]:
+        """Decoded values of ``hashes``."""
+        hashes = list(hashes)
+        values: Dict[str, Any] = {}
+        for begin in range(0, len(hashes), _IN_CHUNK):
+            chunk = hashes[begin : begin + _IN_CHUNK]
+            placeholders = ", ".join(f":h{i}" for i in range(len(chunk)))
+            rows = sql_session.execute(
+                text(f"SELECT hash, data FROM event_blobs WHERE hash IN ({placeholders})"),
+                {f"h{i}": digest for i, digest in enumerate(chunk)},
+            )
+            for digest, data in rows:
+                values[digest] = json.loads(data)
+        return values
+
+    @staticmethod
+    def rehydrate(value: Any, blobs: Dict[str, Any]) -> Any:
+        """Copy of ``value`` with every reference replaced by its blob."""
+        if _is_ref(value):
+            return blobs[value[BLOB_KEY]]
+        if isinstance(value, dict):
+            return {key: BlobStore.rehydrate(item, blobs) for key, item in value.items()}
+        if isinstance(value, list):
+            return [BlobStore.rehydrate(item, blobs) for item in value]
+        return value
@@ -0,0 +1,504 @@
+"""
+Tuned SQLite session service
+
+A drop-in replacement for ``DatabaseSessionService`` on SQLite files. It
+keeps the ADK table layout, so existing ``my_agent_data.db`` files open
+as they are (events written with blob references need this service to be
+read back), and changes how the file is used:
+
+- WAL journal and ``synchronous=NORMAL``, so readers do not block the writer
+  and commits do not fsync the whole database;
+- a ``busy_timeout`` instead of failing at once on a locked database;
+- an index on ``events(app_name, user_id, session_id, timestamp)``, which
+  serves ``get_session`` (filter plus ordering) without a table scan;
+- large event values are stored once in a content-addressed blob table
+  (see ``blob_store``) and referenced from the events; deleting a session
+  deletes the blobs only it referenced;
+- event writes are buffered per session and committed in one transaction per
+  invocation (or earlier when ``max_batch`` is reached, or after
+  ``flush_delay`` seconds). Reads never write: ``get_session`` returns the
+  committed events plus the session's buffered ones, so it does not wait
+  for any commit;
+- no database work runs on the event loop that runs the parallel agents.
+  Reads run concurrently on the shared blocking pool; writes run on one
+  writer thread of their own (SQLite has a single writer anyway), so queued
+  commits never hold pool threads that reads are waiting for;
+- stale sessions are rejected like in ``DatabaseSessionService``: appending
+  to a session object that misses events appended since it was read raises
+  ``ValueError``, and so does committing over a write of another process.
+
+Usage::
+
+    session_service = SQLiteSessionService("sqlite:///my_agent_data.db")
+"""
+
+import asyncio
+import atexit
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import DatabaseSessionService, Session, _session_util
+from google.adk.sessions.base_session_service import (
+    BaseSessionService,
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.database_session_service import (
+    StorageAppState,
+    StorageEvent,
+    StorageSession,
+    StorageUserState,
+    _merge_state,
+)
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy import text
+
+from ..concurrency import run_blocking
+from .blob_store import BlobStore
+
+logger = logging.getLogger(__name__)
+
+SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+)
+
+EVENTS_INDEX = (
+    "CREATE INDEX IF NOT EXISTS idx_events_session_timestamp "
+    "ON events (app_name, user_id, session_id, timestamp)"
+)
+
+SessionKey = Tuple[str, str, str]
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _run_to_completion(coroutine):
+    # The stock service methods are coroutines that never suspend (their
+    # SQL is blocking), so they can be driven to the end on a pool thread.
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coroutine.close()
+    raise RuntimeError("Session service coroutine suspended unexpectedly")
+
+
+class SQLiteSessionService(DatabaseSessionService):
+    """
+    ``DatabaseSessionService`` tuned for SQLite files.
+
+    Args:
+        db_url: SQLAlchemy SQLite URL, e.g. ``sqlite:///my_agent_data.db``.
+        max_batch: buffered events of one session that force a commit.
+        flush_delay: seconds a buffered event may wait for more events of
+            the same invocation before it is committed.
+        blob_threshold: event values of at least this many bytes (as JSON)
+            are stored as shared blobs; 0 stores events inline.
+    """
+
+    def __init__(
+        self,
+        db_url: str,
+        max_batch: int = 64,
+        flush_delay: float = 1.0,
+        blob_threshold: int = 1024,
+        **kwargs: Any,
+    ):
+        super().__init__(db_url, **kwargs)
+        if self.db_engine.dialect.name != "sqlite":
+            raise ValueError(f"SQLiteSessionService needs a sqlite:// URL, got '{db_url}'")
+        sqlalchemy_event.listen(self.db_engine, "connect", _set_sqlite_pragmas)
+        # Connections opened while creating the tables lack the pragmas.
+        self.db_engine.dispose()
+        self.blobs = BlobStore(blob_threshold) if blob_threshold else None
+        missing_refs = False
+        with self.db_engine.begin() as connection:
+            connection.execute(text(EVENTS_INDEX))
+            if self.blobs is not None:
+                missing_refs = self.blobs.create_table(connection)
+
+        self.max_batch = max_batch
+        self.flush_delay = flush_delay
+        # session key -> (session object, events not yet written)
+        self._pending: Dict[SessionKey, Tuple[Session, List[Event]]] = {}
+        # session key -> events being committed right now
+        self._writing: Dict[SessionKey, List[Event]] = {}
+        # session key -> id of the last event appended in this process
+        self._last_event_ids: Dict[SessionKey, str] = {}
+        # session key -> storage update time as of this process' last write
+        self._update_times: Dict[SessionKey, float] = {}
+        self._locks: Dict[SessionKey, asyncio.Lock] = {}
+        self._timers: Dict[SessionKey, asyncio.TimerHandle] = {}
+        self._flush_tasks: set = set()
+        self._write_lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        if missing_refs:
+            self._add_missing_blob_refs()
+        atexit.register(self.close)
+
+    # --- reads and session management ---------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        parent = super().create_session
+
+        def create():
+            with self._write_lock:
+                return _run_to_completion(
+                    parent(app_name=app_name, user_id=user_id, state=state, session_id=session_id)
+                )
+
+        session = await self._run_write(create)
+        self._update_times[(app_name, user_id, session.id)] = session.last_update_time
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        buffered = self._buffered(key)
+        session = await run_blocking(self._read_session, app_name, user_id, session_id, config)
+        return self._with_buffered(session, buffered, config)
+
+    async def get_or_create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        state: Optional[Dict[str, Any]] = None,
+    ) -> Session:
+        """
+        Return the session, creating it with ``state`` when it does not exist.
+        """
+        key = (app_name, user_id, session_id)
+        buffered = self._buffered(key)
+        session = await run_blocking(self._read_session, app_name, user_id, session_id, None)
+        if session is not None:
+            return self._with_buffered(session, buffered, None)
+        parent = super().create_session
+
+        def create_if_missing():
+            with self._write_lock:
+                # Created by another caller since the read?
+                session = self._read_session(app_name, user_id, session_id, None)
+                if session is not None:
+                    return session, False
+                return _run_to_completion(
+                    parent(app_name=app_name, user_id=user_id, state=state, session_id=session_id)
+                ), True
+
+        session, created = await self._run_write(create_if_missing)
+        if created:
+            self._update_times[key] = session.last_update_time
+        return session
+
+    async def _run_write(self, fn, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._writer, functools.partial(fn, *args)
+        )
+
+    def _buffered(self, key: SessionKey) -> List[Event]:
+        # Events of the session not committed yet, taken before the read
+        # starts: each is either in the rows the read sees or merged after.
+        pending = self._pending.get(key)
+        return [*self._writing.get(key, []), *(pending[1] if pending else [])]
+
+    def _with_buffered(
+        self, session: Optional[Session], buffered: List[Event], config: Optional[GetSessionConfig]
+    ) -> Optional[Session]:
+        if session is None or not buffered:
+            return session
+        committed = {event.id for event in session.events}
+        for event in buffered:
+            if event.id in committed:
+                continue
+            self._update_session_state(session, event)
+            if config and config.after_timestamp and event.timestamp < config.after_timestamp:
+                continue
+            session.events.append(event)
+        if config and config.num_recent_events:
+            session.events = session.events[-config.num_recent_events :]
+        return session
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        await self.flush_all()
+        parent = super().list_sessions
+        return await run_blocking(
+            lambda: _run_to_completion(parent(app_name=app_name, user_id=user_id))
+        )
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await self.flush(app_name, user_id, session_id)
+        key = (app_name, user_id, session_id)
+        self._locks.pop(key, None)
+        self._last_event_ids.pop(key, None)
+        self._update_times.pop(key, None)
+        parent = super().delete_session
+
+        def delete():
+            with self._write_lock:
+                _run_to_completion(
+                    parent(app_name=app_name, user_id=user_id, session_id=session_id)
+                )
+                if self.blobs is not None:
+                    with self.database_session_factory() as sql_session:
+                        deleted = self.blobs.release_session(
+                            sql_session, app_name, user_id, session_id
+                        )
+                        sql_session.commit()
+                    logger.debug("Deleted %d blobs of session %s", deleted, session_id)
+
+        await self._run_write(delete)
+
+    def _add_missing_blob_refs(self) -> None:
+        # Databases written before blob references were recorded: record
+        # them from the events once, so no shared blob is deleted early.
+        with self._write_lock, self.database_session_factory() as sql_session:
+            refs: Dict[SessionKey, set] = {}
+            for storage_event in sql_session.query(StorageEvent).yield_per(500):
+                key = (storage_event.app_name, storage_event.user_id, storage_event.session_id)
+                BlobStore.collect_event_refs(storage_event, refs.setdefault(key, set()))
+            for key, hashes in refs.items():
+                self.blobs.add_refs(sql_session, key, hashes)
+            sql_session.commit()
+
+    def _read_session(
+        self, app_name: str, user_id: str, session_id: str, config: Optional[GetSessionConfig]
+    ) -> Optional[Session]:
+        # Same queries as DatabaseSessionService.get_session, plus one query
+        # that loads the blobs referenced by the selected events.
+        with self.database_session_factory() as sql_session:
+            storage_session = sql_session.get(StorageSession, (app_name, user_id, session_id))
+            if storage_session is None:
+                return None
+
+            query = sql_session.query(StorageEvent).filter(
+                StorageEvent.app_name == app_name,
+                StorageEvent.user_id == user_id,
+                StorageEvent.session_id == session_id,
+            )
+            if config and config.after_timestamp:
+                query = query.filter(
+                    StorageEvent.timestamp >= datetime.fromtimestamp(config.after_timestamp)
+                )
+            storage_events = (
+                query.order_by(StorageEvent.timestamp.desc())
+                .limit(config.num_recent_events if config and config.num_recent_events else None)
+                .all()
+            )
+
+            storage_app_state = sql_session.get(StorageAppState, (app_name))
+            storage_user_state = sql_session.get(StorageUserState, (app_name, user_id))
+            merged_state = _merge_state(
+                storage_app_state.state if storage_app_state else {},
+                storage_user_state.state if storage_user_state else {},
+                storage_session.state,
+            )
+
+            blobs: Dict[str, Any] = {}
+            if self.blobs is not None:
+                refs: set = set()
+                for storage_event in storage_events:
+                    BlobStore.collect_event_refs(storage_event, refs)
+                if refs:
+                    blobs = self.blobs.load(sql_session, refs)
+
+            # No queries from here on, so the rehydrated rows are never flushed.
+            session = storage_session.to_session(state=merged_state)
+            for storage_event in reversed(storage_events):
+                if blobs:
+                    storage_event.content = BlobStore.rehydrate(storage_event.content, blobs)
+                    if storage_event.actions and storage_event.actions.state_delta:
+                        storage_event.actions = storage_event.actions.model_copy(
+                            update={
+                                "state_delta": BlobStore.rehydrate(
+                                    storage_event.actions.state_delta, blobs
+                                )
+                            }
+                        )
+                session.events.append(storage_event.to_event())
+            return session
+
+    # --- buffered writes ----------------------------------------------------
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        last_event_id = self._last_event_ids.get(key)
+        if last_event_id is not None and (
+            not session.events or session.events[-1].id != last_event_id
+        ):
+            raise ValueError(
+                f"Session {session.id} misses events appended since it was read. "
+                "Please check if it is a stale session."
+            )
+        pending = self._pending.get(key)
+        if pending and pending[1][-1].invocation_id != event.invocation_id:
+            # A new invocation starts: commit the previous one first.
+            await self.flush(*key)
+            pending = None
+
+        # Updates the in-memory session (state and events) right away.
+        event = await BaseSessionService.append_event(self, session=session, event=event)
+        self._last_event_ids[key] = event.id
+        if pending is None:
+            pending = self._pending[key] = (session, [])
+        pending[1].append(event)
+
+        if len(pending[1]) >= self.max_batch:
+            await self.flush(*key)
+        elif key not in self._timers:
+            loop = asyncio.get_running_loop()
+            self._timers[key] = loop.call_later(self.flush_delay, self._schedule_flush, key)
+        return event
+
+    def _schedule_flush(self, key: SessionKey) -> None:
+        self._timers.pop(key, None)
+        task = asyncio.ensure_future(self.flush(*key))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self, app_name: str, user_id: str, session_id: str) -> None:
+        """Commit the buffered events of one session."""
+        key = (app_name, user_id, session_id)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            pending = self._pending.pop(key, None)
+            if pending:
+                session, events = pending
+                self._writing[key] = events
+                try:
+                    session.last_update_time = await self._run_write(
+                        self._write_events, session, events
+                    )
+                finally:
+                    self._writing.pop(key, None)
+
+    async def flush_all(self) -> None:
+        """Commit the buffered events of every session (e.g. before shutdown)."""
+        for key in list(self._pending):
+            await self.flush(*key)
+
+    def close(self) -> None:
+        """
+        Synchronously commit whatever is still buffered. Registered with
+        ``atexit``, so events buffered when the event loop stopped (e.g. at
+        the end of ``asyncio.run``) are not lost.
+        """
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        while self._pending:
+            _, (session, events) = self._pending.popitem()
+            try:
+                session.last_update_time = self._write_events(session, events)
+            except Exception:
+                logger.exception("Committing buffered events of session %s failed", session.id)
+
+    def _write_events(self, session: Session, events: List[Event]) -> float:
+        with self._write_lock, self.database_session_factory() as sql_session:
+            storage_session = sql_session.get(
+                StorageSession, (session.app_name, session.user_id, session.id)
+            )
+            if storage_session is None:
+                raise ValueError(f"Session {session.id} does not exist.")
+            key = (session.app_name, session.user_id, session.id)
+            expected = self._update_times.get(key, session.last_update_time)
+            if storage_session.update_timestamp_tz > expected:
+                # Same check as DatabaseSessionService.append_event, once per
+                # commit: someone else wrote the session since this process did.
+                raise ValueError(
+                    f"Session {session.id} was updated in storage at "
+                    f"{datetime.fromtimestamp(storage_session.update_timestamp_tz)}, after "
+                    f"{datetime.fromtimestamp(expected)}. Please check if it is a stale session."
+                )
+            storage_app_state = sql_session.get(StorageAppState, (session.app_name))
+            storage_user_state = sql_session.get(
+                StorageUserState, (session.app_name, session.user_id)
+            )
+
+            new_blobs: Dict[str, str] = {}
+            # Every blob the events reference, new or already stored.
+            refs: set = set()
+            app_delta: Dict[str, Any] = {}
+            user_delta: Dict[str, Any] = {}
+            session_delta: Dict[str, Any] = {}
+            for event in events:
+                if event.actions and event.actions.state_delta:
+                    deltas = _session_util.extract_state_delta(event.actions.state_delta)
+                    app_delta.update(deltas["app"])
+                    user_delta.update(deltas["user"])
+                    session_delta.update(deltas["session"])
+                storage_event = self._storage_event(session, event, new_blobs)
+                if self.blobs is not None:
+                    BlobStore.collect_event_refs(storage_event, refs)
+                sql_session.add(storage_event)
+
+            if app_delta:
+                storage_app_state.state = storage_app_state.state | app_delta
+            if user_delta:
+                storage_user_state.state = storage_user_state.state | user_delta
+            if session_delta:
+                storage_session.state = storage_session.state | session_delta
+
+            if self.blobs is not None:
+                self.blobs.store(sql_session, new_blobs)
+                self.blobs.add_refs(
+                    sql_session, (session.app_name, session.user_id, session.id), refs
+                )
+            sql_session.commit()
+            sql_session.refresh(storage_session)
+            if self.blobs is not None:
+                self.blobs.mark_stored(new_blobs)
+            self._update_times[key] = storage_session.update_timestamp_tz
+            logger.debug("Committed %d events of session %s", len(events), session.id)
+            return storage_session.update_timestamp_tz
+
+    def _storage_event(self, session: Session, event: Event, new_blobs: Dict[str, str]) -> StorageEvent:
+        storage_event = StorageEvent.from_event(session, event)
+        if self.blobs is None:
+            return storage_event
+        storage_event.content = self.blobs.externalize_content(storage_event.content, new_blobs)
+        if event.actions and event.actions.state_delta:
+            # from_event keeps the live actions object, which must stay intact.
+            storage_event.actions = event.actions.model_copy(
+                update={
+                    "state_delta": self.blobs.externalize_delta(
+                        event.actions.state_delta, new_blobs
+                    )
+                }
+            )
+        return storage_event
@@ -0,0 +1,191 @@
+"""
+Tiered session service
+
+Hot sessions are served from a size-bounded in-memory LRU, like
+``InMemorySessionService``; every session is also kept in SQLite through
+``SQLiteSessionService``, so cold sessions and restarts cost one database
+read.
+
+Writes are write-behind: every event is handed to ``SQLiteSessionService``
+at once, which buffers it and commits the events of an invocation together,
+``flush_delay`` seconds (1 s by default) after the last one at the latest.
+Evicting a session from memory loses nothing, since reading it back from
+SQLite commits its buffered events first. Events still buffered when the
+process dies are lost; ``atexit`` and ``flush_all`` only cover orderly
+shutdowns.
+
+Usage::
+
+    session_service = TieredSessionService(SQLiteSessionService("sqlite:///my_agent_data.db"))
+    session = await session_service.get_or_create_session(
+        app_name=APP_NAME, user_id=USER_ID, session_id="default", state=initial_state
+    )
+"""
+
+import copy
+from typing import Any, Dict, Optional, Tuple
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+from ..cache import LRUCache
+from .sqlite_session_service import SQLiteSessionService
+
+SessionKey = Tuple[str, str, str]
+
+
+def _filter_events(session: Session, config: Optional[GetSessionConfig]) -> Session:
+    # Same filtering as InMemorySessionService.get_session.
+    if config is None:
+        return session
+    if config.num_recent_events:
+        session.events = session.events[-config.num_recent_events :]
+    if config.after_timestamp:
+        session.events = [
+            event for event in session.events if event.timestamp >= config.after_timestamp
+        ]
+    return session
+
+
+class TieredSessionService(BaseSessionService):
+    """
+    In-memory LRU of sessions in front of a ``SQLiteSessionService``.
+
+    Args:
+        disk: the durable tier; every write is passed on to it and
+            committed by it in the background (see ``SQLiteSessionService``).
+        max_sessions: sessions kept in memory; the least recently used ones
+            are dropped first (they stay in SQLite).
+    """
+
+    def __init__(self, disk: SQLiteSessionService, max_sessions: int = 256):
+        self.disk = disk
+        self.memory = LRUCache(max_sessions)
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the memory tier."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "sessions_in_memory": len(self.memory),
+            "evictions": self.memory.evictions,
+        }
+
+    def _remember(self, session: Session) -> Session:
+        # The LRU keeps the master copy; callers always get their own copy,
+        # as with InMemorySessionService.
+        self.memory.set((session.app_name, session.user_id, session.id), session)
+        return copy.deepcopy(session)
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = await self.disk.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        return self._remember(session)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        cached = self.memory.get((app_name, user_id, session_id))
+        if cached is not None:
+            self.hits += 1
+            return _filter_events(copy.deepcopy(cached), config)
+
+        self.misses += 1
+        if config is not None:
+            # A partial read must not become the cached copy.
+            return await self.disk.get_session(
+                app_name=app_name, user_id=user_id, session_id=session_id, config=config
+            )
+        session = await self.disk.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        return self._remember(session) if session is not None else None
+
+    async def get_or_create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        state: Optional[Dict[str, Any]] = None,
+    ) -> Session:
+        """
+        Return the session, creating it with ``state`` when it does not exist.
+        Served from memory when hot, otherwise one trip to SQLite.
+        """
+        cached = self.memory.get((app_name, user_id, session_id))
+        if cached is not None:
+            self.hits += 1
+            return copy.deepcopy(cached)
+        self.misses += 1
+        session = await self.disk.get_or_create_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, state=state
+        )
+        return self._remember(session)
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        return await self.disk.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self.memory.pop((app_name, user_id, session_id))
+        await self.disk.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        # Updates the caller's session and queues the SQLite write.
+        event = await self.disk.append_event(session, event)
+
+        key = (session.app_name, session.user_id, session.id)
+        cached = self.memory.get(key)
+        if cached is None:
+            self.memory.set(key, copy.deepcopy(session))
+        elif cached is not session:
+            cached.events.append(event)
+            self._update_session_state(cached, event)
+            cached.last_update_time = max(cached.last_update_time, event.timestamp)
+
+        if event.actions and event.actions.state_delta:
+            self._share_state(session, event.actions.state_delta)
+        return event
+
+    def _share_state(self, session: Session, state_delta: Dict[str, Any]) -> None:
+        # "app:" and "user:" keys are shared with the other sessions of the
+        # app (or user); keep their cached copies in step.
+        shared = {
+            key: value
+            for key, value in state_delta.items()
+            if key.startswith((State.APP_PREFIX, State.USER_PREFIX))
+        }
+        if not shared:
+            return
+        for (app_name, user_id, session_id), cached in self.memory.items():
+            if app_name != session.app_name or session_id == session.id:
+                continue
+            for key, value in shared.items():
+                if key.startswith(State.APP_PREFIX) or user_id == session.user_id:
+                    cached.state[key] = value
+
+    async def flush_all(self) -> None:
+        """Commit every write still buffered by the SQLite tier."""
+        await self.disk.flush_all()
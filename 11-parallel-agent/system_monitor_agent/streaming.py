@@ -0,0 +1,152 @@
+"""
+Streaming report delivery
+
+``stream_report`` runs one query through a runner with SSE streaming turned
+on and yields the synthesizer's report as it is produced, instead of once
+the whole markdown report is complete. It yields plain dicts, ready to be
+sent as JSON (see ``server.py``):
+
+- ``{"type": "agent", "author": ...}`` the first time an agent answers, so a
+  client can show progress while the data is gathered;
+- ``{"type": "delta", "author": ..., "text": ...}`` for every piece of the
+  report, with all text parts of an event joined (thoughts are skipped).
+  The report is the text of the synthesizer and of the agents below it
+  (the news agents it can transfer to);
+- ``{"type": "done", "session_id": ..., "ttft_s": ..., "ttlt_s": ..., "chars": ...}``
+  at the end.
+
+Time to first and to last report token are measured from the start of the
+request and exported through ``metrics.registry``.
+"""
+
+import time
+from typing import Any, AsyncGenerator, Dict, Iterable, Optional, Set
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.utils.context_utils import Aclosing
+from google.genai import types
+
+from .metrics import registry
+from .subagents.synthesizer_agent import fashion_report_synthesizer
+
+
+def agent_names(agent: BaseAgent) -> Set[str]:
+    """Names of ``agent`` and of every agent below it."""
+    names = {agent.name}
+    for sub_agent in agent.sub_agents:
+        names |= agent_names(sub_agent)
+    return names
+
+
+def content_text(content: Optional[types.Content]) -> str:
+    """All text parts of ``content`` joined, without thoughts."""
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text and not part.thought)
+
+
+async def get_or_create_session(
+    session_service: BaseSessionService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    state: Optional[Dict[str, Any]] = None,
+) -> Session:
+    """The session ``session_id``, created with ``state`` if it does not exist yet."""
+    if hasattr(session_service, "get_or_create_session"):
+        return await session_service.get_or_create_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, state=state
+        )
+    return await session_service.get_session(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    ) or await session_service.create_session(
+        app_name=app_name, user_id=user_id, session_id=session_id, state=state
+    )
+
+
+async def stream_report(
+    runner: Runner,
+    query: str,
+    user_id: str,
+    session_id: str,
+    state: Optional[Dict[str, Any]] = None,
+    authors: Optional[Iterable[str]] = None,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Run ``query`` and yield the report of ``authors`` piece by piece.
+
+    Args:
+        runner: runner of the root agent.
+        query: the user's message.
+        user_id: owner of the session.
+        session_id: session to continue, created with ``state`` if missing.
+        state: initial state (the store profile) of a new session.
+        authors: agents whose text is forwarded, by default the synthesizer
+            and the agents below it.
+    """
+    start = time.perf_counter()
+    authors = set(authors) if authors is not None else agent_names(fashion_report_synthesizer)
+    session = await get_or_create_session(
+        runner.session_service, runner.app_name, user_id, session_id, state
+    )
+    message = types.Content(role="user", parts=[types.Part(text=query)])
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+
+    seen_authors = set()
+    # Authors whose current model response was already sent in partial
+    # events; its final event repeats it in full.
+    streamed: Set[str] = set()
+    first_token: Optional[float] = None
+    last_token: Optional[float] = None
+    chars = 0
+
+    async with Aclosing(
+        runner.run_async(
+            user_id=user_id, session_id=session.id, new_message=message, run_config=run_config
+        )
+    ) as events:
+        async for event in events:
+            if event.author not in seen_authors and event.author != "user":
+                seen_authors.add(event.author)
+                yield {"type": "agent", "author": event.author}
+            if event.author not in authors:
+                continue
+            text = content_text(event.content)
+            if event.partial:
+                streamed.add(event.author)
+            elif event.author in streamed:
+                streamed.discard(event.author)
+                continue
+            if not text:
+                continue
+            now = time.perf_counter() - start
+            if first_token is None:
+                first_token = now
+            last_token = now
+            chars += len(text)
+            yield {"type": "delta", "author": event.author, "text": text}
+
+    labels = {"streaming": "sse"}
+    if first_token is not None:
+        registry.observe(
+            "report_first_token_seconds",
+            first_token,
+            labels,
+            help="Time from the request to the first token of the report",
+        )
+        registry.observe(
+            "report_last_token_seconds",
+            last_token,
+            labels,
+            help="Time from the request to the last token of the report",
+        )
+    yield {
+        "type": "done",
+        "session_id": session.id,
+        "ttft_s": first_token,
+        "ttlt_s": last_token,
+        "chars": chars,
+    }
@@ -26,12 +26,12 @@ local_news_agent = LlmAgent(
     name="LocalNewsAgent",
     model=GEMINI_MODEL,
     instruction="""You are a local news Agent.
-    You need to use the tool 'get_latest_news' to gather latest local news of city Mumbai in country India related to Fashion.
+    You need to use the tool 'get_latest_news' to gather latest local news of the store's city and country related to its type of store.
     Then you need analyze the news and give some points to show whether there were no latest news related to Fashion.
     If there are some news related to that, it is positive and negative.
     Give your detailed response in points.
     
-    IMPORTANT: You MUST call the get_cpu_info tool. Do not make up information.
+    IMPORTANT: You MUST call the get_latest_news tool. Do not make up information.
     """,
     description="Gathers and analyzes latest news",
     tools=[get_latest_news],
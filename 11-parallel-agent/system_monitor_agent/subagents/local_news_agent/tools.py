@@ -2,14 +2,27 @@
 web search Tool
 
 This module provides a tool to search web to get latest news.
+
+The location comes from the store profile in the session state (``city``,
+``country``, ``type_of_store``), so stores run side by side each get their
+own news. Search results are cached per (city, country, store type, query) for
+``NEWS_CACHE_TTL`` seconds in memory and in the ``NEWS_CACHE_PATH`` SQLite
+file (default ``news_cache.db`` in the cache directory), and concurrent identical searches share one upstream request. The
+blocking search runs on the shared bounded thread pool, so the tool never
+blocks the event loop of the parallel gatherer.
 """
 
-import time
-from typing import Any, Dict
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional, Tuple
+
+from google.adk.tools.tool_context import ToolContext
 
-import psutil
+from ...cache import TTLCache, cache_path
+from ...concurrency import run_blocking
 
-from langchain_tavily import TavilySearch
+if TYPE_CHECKING:
+    from langchain_tavily import TavilySearch
 
 # from ...input_json import city_name, country_name, type_of_store
 
@@ -19,23 +32,96 @@ city_name = "Mumbai"
 country_name = "India"
 type_of_store = "fashion"
 
+NEWS_QUERY = (
+    "What's the latest news in city {city}, {country} ? "
+    "Give me everything related to {store_type} in the news ?"
+)
+
+news_cache = TTLCache(
+    ttl=float(os.environ.get("NEWS_CACHE_TTL", 15 * 60)),
+    path=os.environ.get("NEWS_CACHE_PATH", cache_path("news_cache.db")),
+)
+
+_search_tool: Optional["TavilySearch"] = None
+_search_tool_lock = threading.Lock()
+
+
+def tavily_search(query: str) -> Any:
+    """Run ``query`` on Tavily with a client shared by every call."""
+    global _search_tool
+    if _search_tool is None:
+        with _search_tool_lock:
+            if _search_tool is None:
+                # Imported on first search: langchain is slow to import.
+                from langchain_tavily import TavilySearch
+
+                _search_tool = TavilySearch(
+                    max_results=5,
+                    topic="general",
+                    tavily_api_key=TAVILY_API_KEY,
+                )
+    return _search_tool.invoke(query)
+
+
+# Upstream search function, swap it with set_search_provider (e.g. in tests).
+search_provider: Callable[[str], Any] = tavily_search
+
+
+def set_search_provider(provider: Callable[[str], Any]) -> None:
+    """Replace the upstream search, ``provider`` takes the query string."""
+    global search_provider
+    search_provider = provider
+
+
+def _news_query(city: str, country: str, store_type: str) -> str:
+    return NEWS_QUERY.format(city=city, country=country, store_type=store_type.title())
+
+
+def store_location(state: Mapping[str, Any]) -> Tuple[str, str, str]:
+    """(city, country, store type) of the store profile in ``state``."""
+    return (
+        state.get("city") or city_name,
+        state.get("country") or country_name,
+        state.get("type_of_store") or type_of_store,
+    )
+
+
+class SearchError(RuntimeError):
+    """The upstream search answered with an error payload instead of results."""
+
+
+def _search(query: str) -> Any:
+    result = search_provider(query)
+    # Tavily reports failures as {"error": ...} instead of raising; raise so
+    # the error is not cached as if it were the news of the location.
+    if isinstance(result, dict) and result.get("error"):
+        raise SearchError(str(result["error"]))
+    return result
+
+
+def search_news(city: str, country: str, store_type: str) -> Any:
+    """Return cached news for a location, searching upstream on a miss."""
+    query = _news_query(city, country, store_type)
+    return news_cache.get_or_compute((city, country, store_type, query), lambda: _search(query))
+
+
+def cached_news(
+    city: str = city_name, country: str = country_name, store_type: str = type_of_store
+) -> Optional[Any]:
+    """Return the cached news for a location, or None; never searches upstream."""
+    query = _news_query(city, country, store_type)
+    return news_cache.get((city, country, store_type, query))
+
 
-def get_latest_news() -> Any:
+async def get_latest_news(tool_context: ToolContext) -> Any:
     """
-    Gathers latest news.
+    Gathers latest news of the store's city.
 
     Returns:
         Any: latest news data
     """
     try:
-        search_tool = TavilySearch(
-            max_results=5,
-            topic="general",
-            tavily_api_key=TAVILY_API_KEY,
-        )
-
-        response = search_tool.invoke("What's the latest news in city Mumbai, India ? Give me everything related to Fashion in the news ?")
-        return response
+        return await run_blocking(search_news, *store_location(tool_context.state))
     except Exception as e:
         return {
             "result": {"error": f"Failed to gather latest news: {str(e)}"},
@@ -6,27 +6,59 @@ This agent is responsible for gathering previous year store retail data.
 
 from google.adk.agents import LlmAgent
 
-from .tools import get_retail_data
+from .history import has_history
+from .ingest import POS_STREAM_SOURCE
+from .tools import (
+    get_retail_data,
+    get_live_sales,
+    get_retail_insights,
+    get_sales_history,
+    query_retail_data,
+)
 
 # --- Constants ---
 GEMINI_MODEL = "gemini-2.0-flash"
 
+# The sales history tool is only offered when a history file was imported
+# (see history.py), none ships with the repo.
+HISTORY_INSTRUCTION = """
+    Use tool 'get_sales_history' with a 'start_date' and 'end_date' to look at the long term daily sales history
+    of a period, for example the same season in previous years.""" if has_history() else ""
+
+# The live sales tool is only offered when a POS stream is ingested
+# (see ingest.py), otherwise it could never return any sales.
+LIVE_SALES_INSTRUCTION = """
+    Use tool 'get_live_sales' with window "day", "week" or "month" to get the current sales numbers
+    from the store's live sales feed.""" if POS_STREAM_SOURCE else ""
+
 # Disk Information Agent
 retail_data_agent = LlmAgent(
     name="RetailDataAgent",
     model=GEMINI_MODEL,
     instruction="""You are a store retail agent.
     
-    Use tool 'get_retail_data' to get the json data about the previous year store retail data.
-    You need to analyse the data and provide the summary of the data in final response.
+    Use tool 'get_retail_insights' to get the pre-computed insights about the previous year store retail data.
+    The insights already contain revenue, share of sales, month-over-month growth, ABC class and category rollups.
+    Use these numbers as they are, do not recalculate them.
+    If you need product details that are not present in the insights, use tool 'query_retail_data'
+    with filters (category, month range, profit category, top_k) to fetch only the products you need,
+    and pass its 'NextCursor' back as 'cursor' to read the next page.""" + HISTORY_INSTRUCTION + LIVE_SALES_INSTRUCTION + """
+    Only use tool 'get_retail_data' if you really need the complete product list.
+    You need to analyse the insights and provide the summary of the data in final response.
     Make sure that the summary must have two key points:
     
     1. product name
     2. ProfitCategory
     
-    IMPORTANT: You MUST call the get_retail_data tool. Do not make up information.
+    IMPORTANT: You MUST call the get_retail_insights tool. Do not make up information.
     """,
     description="Gathers and analyzes store retail data",
-    tools=[get_retail_data],
+    tools=[
+        get_retail_insights,
+        query_retail_data,
+        *([get_sales_history] if has_history() else []),
+        *([get_live_sales] if POS_STREAM_SOURCE else []),
+        get_retail_data,
+    ],
     output_key="retail_data",
 )
@@ -0,0 +1,157 @@
+"""
+Retail analytics
+
+This module pre-computes retail insights (revenue, share of sales,
+month-over-month growth, ABC class and category rollups) over the columnar
+retail store with vectorized NumPy operations, so the agent only receives a
+small structured summary instead of doing the arithmetic itself.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .store import RetailDataStore
+
+# Cumulative revenue share thresholds for the ABC (Pareto) classes.
+ABC_THRESHOLDS = (0.80, 0.95)
+
+
+def _round(values: np.ndarray, digits: int = 2) -> List[float]:
+    return [round(float(v), digits) for v in values]
+
+
+def abc_classes(revenue: np.ndarray) -> np.ndarray:
+    """
+    Classify items into A/B/C by their contribution to total revenue.
+
+    Items are ranked by revenue; an item is "A" while the revenue of the items
+    ranked above it is below 80% of the total, "B" below 95%, else "C".
+    """
+    classes = np.full(revenue.shape, "C", dtype="<U1")
+    total = revenue.sum()
+    if total <= 0:
+        return classes
+    order = np.argsort(-revenue, kind="stable")
+    share_before = (np.cumsum(revenue[order]) - revenue[order]) / total
+    ranked = np.where(
+        share_before < ABC_THRESHOLDS[0],
+        "A",
+        np.where(share_before < ABC_THRESHOLDS[1], "B", "C"),
+    )
+    classes[order] = ranked
+    return classes
+
+
+def compute_insights(store: RetailDataStore, top_n: int = 10) -> Dict[str, Any]:
+    """
+    Compute a compact insight summary for the whole store.
+
+    Args:
+        store: Retail store to analyse.
+        top_n: Number of products to list in the top and bottom rankings.
+
+    Returns:
+        Dict[str, Any]: totals, product rankings, ABC and category rollups.
+    """
+    n_products = len(store.product_ids)
+    n_months = len(store.months)
+    line_revenue = store.price * store.units
+
+    # Product x month revenue matrix, months are sorted ascending.
+    cells = store.product_codes.astype(np.int64) * n_months + store.month_codes
+    by_month = np.bincount(
+        cells, weights=line_revenue, minlength=n_products * n_months
+    ).reshape(n_products, n_months)
+
+    revenue = by_month.sum(axis=1)
+    units = np.bincount(store.product_codes, weights=store.units, minlength=n_products)
+    total_revenue = float(revenue.sum())
+    share = revenue / total_revenue if total_revenue else np.zeros(n_products)
+
+    growth = np.full(n_products, np.nan)
+    if n_months > 1:
+        last, prev = by_month[:, -1], by_month[:, -2]
+        has_prev = prev > 0
+        growth[has_prev] = (last[has_prev] - prev[has_prev]) / prev[has_prev]
+
+    classes = abc_classes(revenue)
+
+    # Category and profit category of the last line seen for each product.
+    product_category = np.zeros(n_products, dtype=np.int32)
+    product_category[store.product_codes] = store.category_codes
+    product_profit = np.zeros(n_products, dtype=np.int32)
+    product_profit[store.product_codes] = store.profit_codes
+
+    def product_row(i: int) -> Dict[str, Any]:
+        return {
+            "ProductID": store.product_ids[i],
+            "Name": store.product_names[i],
+            "Category": store.categories[product_category[i]],
+            "ProfitCategory": store.profit_categories[product_profit[i]],
+            "Revenue": round(float(revenue[i]), 2),
+            "UnitsSold": int(units[i]),
+            "ShareOfSales": round(float(share[i]), 4),
+            "MoMGrowth": None if np.isnan(growth[i]) else round(float(growth[i]), 4),
+            "ABCClass": str(classes[i]),
+        }
+
+    order = np.argsort(-revenue, kind="stable")
+    top_n = max(0, min(int(top_n), n_products))
+    top = [product_row(i) for i in order[:top_n]]
+    bottom = [product_row(i) for i in order[::-1][:top_n]]
+
+    n_categories = len(store.categories)
+    category_revenue = np.bincount(
+        store.category_codes, weights=line_revenue, minlength=n_categories
+    )
+    category_units = np.bincount(
+        store.category_codes, weights=store.units, minlength=n_categories
+    )
+    category_products = np.bincount(product_category, minlength=n_categories)
+    category_share = (
+        category_revenue / total_revenue if total_revenue else np.zeros(n_categories)
+    )
+    category_order = np.argsort(-category_revenue, kind="stable")
+    categories = [
+        {
+            "Category": store.categories[c],
+            "Revenue": round(float(category_revenue[c]), 2),
+            "UnitsSold": int(category_units[c]),
+            "Products": int(category_products[c]),
+            "ShareOfSales": round(float(category_share[c]), 4),
+        }
+        for c in category_order
+    ]
+
+    abc = {}
+    for label in ("A", "B", "C"):
+        mask = classes == label
+        abc[label] = {
+            "Products": int(mask.sum()),
+            "ShareOfSales": round(float(share[mask].sum()), 4),
+        }
+
+    profit = {}
+    for p, label in enumerate(store.profit_categories):
+        mask = product_profit == p
+        profit[label] = {
+            "Products": int(mask.sum()),
+            "Revenue": round(float(revenue[mask].sum()), 2),
+        }
+
+    month_totals = by_month.sum(axis=0)
+    return {
+        "Totals": {
+            "Revenue": round(total_revenue, 2),
+            "UnitsSold": int(store.units.sum()),
+            "Products": n_products,
+            "Months": store.months,
+            "RevenueByMonth": _round(month_totals),
+        },
+        "TopProducts": top,
+        "BottomProducts": bottom,
+        "Categories": categories,
+        "ABCSummary": abc,
+        "ProfitCategories": profit,
+    }
@@ -0,0 +1,307 @@
+"""
+Sales history store
+
+This module provides a binary, memory-mapped format for multi-year daily
+per-SKU sales history, an importer from CSV, and windowed aggregations that
+read the mapped file in fixed-size chunks so process memory stays flat no
+matter how much history exists.
+
+File layout (little endian)::
+
+    header   magic "RSHIST01", version, record count, SKU count,
+             record offset, SKU table offset, SKU table length
+    records  (day, sku, units, revenue) sorted by day, see ``RECORD_DTYPE``
+    SKU table  UTF-8 JSON list of {"ProductID", "Name", "Category"}
+
+``day`` is the number of days since 1970-01-01.
+
+Usage::
+
+    python -m system_monitor_agent.subagents.retail_data_agent.history \\
+        sales.csv sales_history.bin
+"""
+
+import csv
+import datetime
+import json
+import os
+import struct
+import sys
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+MAGIC = b"RSHIST01"
+VERSION = 1
+HEADER = struct.Struct("<8sIQIQQQ")
+RECORD_OFFSET = 64
+RECORD_DTYPE = np.dtype(
+    [("day", "<i4"), ("sku", "<u4"), ("units", "<i4"), ("revenue", "<f8")]
+)
+
+# Records read per step of an aggregation.
+CHUNK_RECORDS = 1 << 20
+
+DEFAULT_HISTORY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "sales_history.bin"
+)
+
+
+def to_day(date: str) -> int:
+    """Convert "YYYY-MM-DD" into days since the epoch."""
+    return int(np.datetime64(date, "D").astype(np.int64))
+
+
+def from_day(day: int) -> str:
+    """Convert days since the epoch into "YYYY-MM-DD"."""
+    return str(np.datetime64(int(day), "D"))
+
+
+def import_csv(csv_path: str, out_path: str, chunk_rows: int = 100_000) -> int:
+    """
+    Convert a CSV export into the binary history format.
+
+    The CSV needs ``Date``, ``ProductID`` and ``UnitsSold`` columns plus either
+    ``Revenue`` or ``Price``; ``Name`` and ``Category`` are optional. Rows must
+    be ordered by date, which is how POS exports are written, so the importer
+    can stream the file without holding it in memory. The file is written
+    next to ``out_path`` and moved over it once complete, so a history that
+    is mapped by a running agent is never rewritten under it.
+
+    Returns:
+        int: number of imported records
+    """
+    skus: Dict[str, int] = {}
+    sku_table: List[Dict[str, str]] = []
+    count = 0
+    last_day = None
+
+    def flush(days, codes, units, revenue):
+        nonlocal count, last_day
+        if not days:
+            return
+        chunk = np.empty(len(days), dtype=RECORD_DTYPE)
+        chunk["day"] = np.array(days, dtype="datetime64[D]").astype(np.int32)
+        chunk["sku"] = codes
+        chunk["units"] = units
+        chunk["revenue"] = revenue
+        if np.any(np.diff(chunk["day"]) < 0) or (
+            last_day is not None and chunk["day"][0] < last_day
+        ):
+            raise ValueError(f"{csv_path} is not sorted by Date")
+        last_day = int(chunk["day"][-1])
+        out.write(chunk.tobytes())
+        count += len(chunk)
+
+    tmp_path = out_path + ".tmp"
+    with open(csv_path, newline="", encoding="utf-8") as f, open(tmp_path, "wb") as out:
+        out.write(b"\0" * RECORD_OFFSET)
+        reader = csv.DictReader(f)
+        days, codes, units, revenue = [], [], [], []
+        for row in reader:
+            product_id = row["ProductID"]
+            code = skus.get(product_id)
+            if code is None:
+                code = skus[product_id] = len(sku_table)
+                sku_table.append(
+                    {
+                        "ProductID": product_id,
+                        "Name": row.get("Name", "") or "",
+                        "Category": row.get("Category", "") or "",
+                    }
+                )
+            sold = int(row["UnitsSold"])
+            days.append(row["Date"])
+            codes.append(code)
+            units.append(sold)
+            if row.get("Revenue"):
+                revenue.append(float(row["Revenue"]))
+            else:
+                revenue.append(float(row["Price"]) * sold)
+            if len(days) >= chunk_rows:
+                flush(days, codes, units, revenue)
+                days, codes, units, revenue = [], [], [], []
+        flush(days, codes, units, revenue)
+
+        table = json.dumps(sku_table).encode("utf-8")
+        table_offset = RECORD_OFFSET + count * RECORD_DTYPE.itemsize
+        out.write(table)
+        out.seek(0)
+        out.write(
+            HEADER.pack(
+                MAGIC, VERSION, count, len(sku_table), RECORD_OFFSET, table_offset, len(table)
+            )
+        )
+    os.replace(tmp_path, out_path)
+    return count
+
+
+class SalesHistory:
+    """Read-only, memory-mapped view of a sales history file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            magic, version, count, n_skus, record_offset, table_offset, table_length = (
+                HEADER.unpack(header)
+            )
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a sales history file")
+            f.seek(table_offset)
+            self.skus: List[Dict[str, str]] = json.loads(f.read(table_length))
+
+        self.size = count
+        self.records = (
+            np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=record_offset, shape=(count,))
+            if count
+            else np.empty(0, dtype=RECORD_DTYPE)
+        )
+        self.categories = sorted({sku["Category"] for sku in self.skus})
+        category_index = {name: i for i, name in enumerate(self.categories)}
+        self.sku_categories = np.array(
+            [category_index[sku["Category"]] for sku in self.skus], dtype=np.int32
+        )
+
+    @property
+    def first_day(self) -> Optional[int]:
+        return int(self.records[0]["day"]) if self.size else None
+
+    @property
+    def last_day(self) -> Optional[int]:
+        return int(self.records[-1]["day"]) if self.size else None
+
+    def window(self, start_day: int, end_day: int) -> np.ndarray:
+        """
+        Return the records with ``start_day <= day <= end_day``.
+
+        The result is a slice of the memory map, nothing is copied.
+        """
+        # Days are integers, so the first day after the window ends it.
+        lo, hi = np.searchsorted(self.records["day"], [start_day, end_day + 1])
+        return self.records[lo:hi]
+
+    def chunks(self, start_day: int, end_day: int) -> Iterator[np.ndarray]:
+        """Yield the window in chunks of ``CHUNK_RECORDS`` records."""
+        records = self.window(start_day, end_day)
+        for begin in range(0, len(records), CHUNK_RECORDS):
+            yield records[begin : begin + CHUNK_RECORDS]
+
+    def totals_by_sku(self, start_day: int, end_day: int) -> Dict[str, np.ndarray]:
+        """Units and revenue per SKU over the window."""
+        n = len(self.skus)
+        units = np.zeros(n, dtype=np.float64)
+        revenue = np.zeros(n, dtype=np.float64)
+        for chunk in self.chunks(start_day, end_day):
+            sku = chunk["sku"]
+            units += np.bincount(sku, weights=chunk["units"], minlength=n)
+            revenue += np.bincount(sku, weights=chunk["revenue"], minlength=n)
+        return {"units": units, "revenue": revenue}
+
+    def daily_revenue(self, start_day: int, end_day: int) -> np.ndarray:
+        """Revenue per day over the window, index 0 is ``start_day``."""
+        n = max(0, end_day - start_day + 1)
+        revenue = np.zeros(n, dtype=np.float64)
+        for chunk in self.chunks(start_day, end_day):
+            revenue += np.bincount(
+                chunk["day"] - start_day, weights=chunk["revenue"], minlength=n
+            )
+        return revenue
+
+    def summary(self, start_day: int, end_day: int, top_n: int = 10) -> Dict[str, Any]:
+        """Compact window summary in the same shape as the retail insights."""
+        totals = self.totals_by_sku(start_day, end_day)
+        revenue, units = totals["revenue"], totals["units"]
+
+        order = np.argsort(-revenue, kind="stable")[: max(0, int(top_n))]
+        top = [
+            {
+                **self.skus[i],
+                "Revenue": round(float(revenue[i]), 2),
+                "UnitsSold": int(units[i]),
+            }
+            for i in order
+            if revenue[i] > 0
+        ]
+
+        n_categories = len(self.categories)
+        category_revenue = np.bincount(
+            self.sku_categories, weights=revenue, minlength=n_categories
+        )
+        category_units = np.bincount(
+            self.sku_categories, weights=units, minlength=n_categories
+        )
+        categories = [
+            {
+                "Category": self.categories[c],
+                "Revenue": round(float(category_revenue[c]), 2),
+                "UnitsSold": int(category_units[c]),
+            }
+            for c in np.argsort(-category_revenue, kind="stable")
+        ]
+
+        daily = self.daily_revenue(start_day, end_day)
+        months = np.arange(start_day, end_day + 1).astype("datetime64[D]").astype(
+            "datetime64[M]"
+        )
+        labels, month_codes = np.unique(months, return_inverse=True)
+        by_month = np.bincount(month_codes, weights=daily, minlength=len(labels))
+
+        return {
+            "Window": {"StartDate": from_day(start_day), "EndDate": from_day(end_day)},
+            "Totals": {
+                "Revenue": round(float(revenue.sum()), 2),
+                "UnitsSold": int(units.sum()),
+            },
+            "RevenueByMonth": {
+                str(label): round(float(value), 2) for label, value in zip(labels, by_month)
+            },
+            "TopProducts": top,
+            "Categories": categories,
+        }
+
+
+_histories: Dict[str, SalesHistory] = {}
+_histories_lock = threading.Lock()
+
+
+def history_path() -> str:
+    """Path of the sales history: ``RETAIL_HISTORY_PATH`` or ``data/sales_history.bin``."""
+    return os.environ.get("RETAIL_HISTORY_PATH", DEFAULT_HISTORY_PATH)
+
+
+def has_history() -> bool:
+    """Whether a sales history file was imported (no file ships with the repo)."""
+    return os.path.exists(history_path())
+
+
+def get_history(path: Optional[str] = None) -> SalesHistory:
+    """
+    Return the shared history for ``path``, opening it on first call.
+
+    The path defaults to ``RETAIL_HISTORY_PATH`` and then to
+    ``data/sales_history.bin``.
+    """
+    path = path or history_path()
+    history = _histories.get(path)
+    if history is None:
+        with _histories_lock:
+            history = _histories.get(path)
+            if history is None:
+                if not os.path.exists(path):
+                    raise FileNotFoundError(
+                        f"No sales history at {path}, import one with "
+                        "'python -m system_monitor_agent.subagents.retail_data_agent.history'"
+                    )
+                history = _histories[path] = SalesHistory(path)
+    return history
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    started = datetime.datetime.now()
+    imported = import_csv(sys.argv[1], sys.argv[2])
+    print(f"Imported {imported} records in {datetime.datetime.now() - started}")
@@ -0,0 +1,266 @@
+"""
+Streaming sales ingestion
+
+This module consumes POS sales lines from a local file or a TCP socket as a
+stream and keeps rolling per-SKU and per-category aggregates for day, week
+and month windows up to date, one transaction at a time.
+
+Each line is either a JSON object or a CSV row (the first CSV line is the
+header) with ``Timestamp`` (or ``Date``), ``ProductID``, ``UnitsSold`` and
+``Revenue`` (or ``Price``); ``Category`` is optional.
+
+The runners of ``app.py`` start ingesting ``POS_STREAM_SOURCE`` (a file path
+or ``tcp://host:port``) when it is set; the ``get_live_sales`` tool is only
+given to the agent in that case.
+
+Usage::
+
+    from .ingest import start_ingestion
+    start_ingestion("pos_stream.csv", follow=True)
+    start_ingestion("tcp://localhost:9009")
+"""
+
+import csv
+import datetime
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = ("day", "week", "month")
+
+# Live POS feed ingested by the app, empty for none.
+POS_STREAM_SOURCE = os.environ.get("POS_STREAM_SOURCE", "")
+
+
+def period_key(window: str, when: datetime.date) -> str:
+    """Label of the ``window`` period that contains ``when``."""
+    if window == "day":
+        return when.isoformat()
+    if window == "week":
+        year, week, _ = when.isocalendar()
+        return f"{year}-W{week:02d}"
+    if window == "month":
+        return f"{when.year}-{when.month:02d}"
+    raise ValueError(f"Unknown window: {window}")
+
+
+def parse_transaction(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a raw sales line into the fields used by the aggregates."""
+    stamp = str(record.get("Timestamp") or record["Date"])
+    units = int(record["UnitsSold"])
+    if record.get("Revenue") not in (None, ""):
+        revenue = float(record["Revenue"])
+    else:
+        revenue = float(record["Price"]) * units
+    return {
+        "Date": datetime.date.fromisoformat(stamp[:10]),
+        "ProductID": str(record["ProductID"]),
+        "Category": str(record.get("Category") or ""),
+        "UnitsSold": units,
+        "Revenue": revenue,
+    }
+
+
+def parse_lines(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse JSON or CSV sales lines, skipping (and logging) bad ones."""
+    header: Optional[List[str]] = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            if line.startswith("{"):
+                record = json.loads(line)
+            elif header is None:
+                header = next(csv.reader([line]))
+                continue
+            else:
+                record = dict(zip(header, next(csv.reader([line]))))
+            yield parse_transaction(record)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Skipping bad sales line %r: %s", line, e)
+
+
+def _follow(f, poll_interval: float) -> Iterator[str]:
+    while True:
+        line = f.readline()
+        if line:
+            yield line
+        else:
+            time.sleep(poll_interval)
+
+
+def read_file(
+    path: str, follow: bool = False, poll_interval: float = 0.5
+) -> Iterator[Dict[str, Any]]:
+    """Yield transactions from a file, optionally waiting for appended lines."""
+    with open(path, encoding="utf-8", newline="") as f:
+        yield from parse_lines(_follow(f, poll_interval) if follow else f)
+
+
+def read_socket(host: str, port: int) -> Iterator[Dict[str, Any]]:
+    """Yield transactions from a line oriented TCP stream until it closes."""
+    with socket.create_connection((host, port)) as connection:
+        with connection.makefile("r", encoding="utf-8", newline="") as f:
+            yield from parse_lines(f)
+
+
+def open_source(source: str, follow: bool = False) -> Iterator[Dict[str, Any]]:
+    """Open ``tcp://host:port`` or a file path as a transaction stream."""
+    if source.startswith("tcp://"):
+        host, port = source[len("tcp://") :].rsplit(":", 1)
+        return read_socket(host, int(port))
+    return read_file(source, follow=follow)
+
+
+class RollingAggregates:
+    """
+    Incrementally updated sales aggregates per day, week and month.
+
+    For every window the latest ``keep`` periods are retained, so the current
+    period can be compared with the previous one. Updates and reads are
+    thread safe.
+    """
+
+    def __init__(self, keep: int = 2):
+        self.keep = keep
+        self.transactions = 0
+        self._lock = threading.Lock()
+        # window -> period -> {"totals": [units, revenue, lines], "sku": {...}, "category": {...}}
+        self._periods: Dict[str, Dict[str, Dict[str, Any]]] = {w: {} for w in WINDOWS}
+        self._categories: Dict[str, str] = {}
+
+    def add(self, transaction: Dict[str, Any]) -> None:
+        """Fold one transaction into every window."""
+        units, revenue = transaction["UnitsSold"], transaction["Revenue"]
+        sku = transaction["ProductID"]
+        category = transaction["Category"] or self._categories.get(sku, "")
+        with self._lock:
+            self.transactions += 1
+            if category:
+                self._categories[sku] = category
+            for window, periods in self._periods.items():
+                key = period_key(window, transaction["Date"])
+                bucket = periods.get(key)
+                if bucket is None:
+                    if len(periods) >= self.keep and key < min(periods):
+                        # Too late for the retained periods.
+                        continue
+                    bucket = periods[key] = {
+                        "totals": [0, 0.0, 0],
+                        "sku": {},
+                        "category": {},
+                    }
+                    for old in sorted(periods)[: -self.keep]:
+                        del periods[old]
+                totals = bucket["totals"]
+                totals[0] += units
+                totals[1] += revenue
+                totals[2] += 1
+                for group, name in (("sku", sku), ("category", category)):
+                    entry = bucket[group].get(name)
+                    if entry is None:
+                        entry = bucket[group][name] = [0, 0.0]
+                    entry[0] += units
+                    entry[1] += revenue
+
+    def snapshot(self, window: str = "day", top_n: int = 10) -> Dict[str, Any]:
+        """Current and previous period of ``window``, top SKUs first."""
+        if window not in self._periods:
+            raise ValueError(f"Unknown window: {window}")
+        with self._lock:
+            periods = self._periods[window]
+            keys = sorted(periods)
+            if not keys:
+                return {"Window": window, "Period": None}
+            current = periods[keys[-1]]
+            top = sorted(current["sku"].items(), key=lambda item: -item[1][1])[:top_n]
+            result = {
+                "Window": window,
+                "Period": keys[-1],
+                "Totals": {
+                    "UnitsSold": current["totals"][0],
+                    "Revenue": round(current["totals"][1], 2),
+                    "Lines": current["totals"][2],
+                },
+                "TopProducts": [
+                    {
+                        "ProductID": sku,
+                        "Category": self._categories.get(sku, ""),
+                        "UnitsSold": units,
+                        "Revenue": round(revenue, 2),
+                    }
+                    for sku, (units, revenue) in top
+                ],
+                "Categories": [
+                    {"Category": name, "UnitsSold": units, "Revenue": round(revenue, 2)}
+                    for name, (units, revenue) in sorted(
+                        current["category"].items(), key=lambda item: -item[1][1]
+                    )
+                    if name
+                ],
+            }
+            if len(keys) > 1:
+                previous = periods[keys[-2]]["totals"]
+                result["PreviousPeriod"] = {
+                    "Period": keys[-2],
+                    "UnitsSold": previous[0],
+                    "Revenue": round(previous[1], 2),
+                }
+            return result
+
+
+# Aggregates shared by every session of the process.
+live_aggregates = RollingAggregates()
+
+
+def ingest(
+    transactions: Iterable[Dict[str, Any]],
+    aggregates: RollingAggregates = live_aggregates,
+) -> int:
+    """Consume a transaction stream into ``aggregates``, returns the count."""
+    count = 0
+    for transaction in transactions:
+        aggregates.add(transaction)
+        count += 1
+    return count
+
+
+def start_ingestion(
+    source: str,
+    follow: bool = True,
+    aggregates: RollingAggregates = live_aggregates,
+) -> threading.Thread:
+    """Ingest ``source`` on a background daemon thread."""
+
+    def run():
+        try:
+            count = ingest(open_source(source, follow=follow), aggregates)
+            logger.info("Sales stream %s ended after %d lines", source, count)
+        except Exception:
+            logger.exception("Sales stream %s failed", source)
+
+    thread = threading.Thread(target=run, name=f"sales-ingest:{source}", daemon=True)
+    thread.start()
+    return thread
+
+
+_configured: Optional[threading.Thread] = None
+_configured_lock = threading.Lock()
+
+
+def start_configured_ingestion() -> Optional[threading.Thread]:
+    """Start ingesting ``POS_STREAM_SOURCE`` once per process, if it is set."""
+    global _configured
+    if not POS_STREAM_SOURCE:
+        return None
+    with _configured_lock:
+        if _configured is None:
+            _configured = start_ingestion(POS_STREAM_SOURCE, follow=True)
+    return _configured
@@ -0,0 +1,224 @@
+"""
+Retail SQLite store
+
+This module mirrors the columnar retail store into an indexed local SQLite
+table, so the retail tools can pull a filtered, paginated slice of the
+catalog instead of the whole product list.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...cache import cache_path, connect_sqlite
+from .store import RetailDataStore, get_store
+
+DEFAULT_DB_PATH = cache_path("retail_data.db")
+MAX_PAGE_SIZE = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sales (
+    id INTEGER PRIMARY KEY,
+    product_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    price REAL NOT NULL,
+    units INTEGER NOT NULL,
+    month TEXT NOT NULL,
+    profit_category TEXT NOT NULL,
+    revenue REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sales_category_month ON sales (category, month);
+CREATE INDEX IF NOT EXISTS idx_sales_month ON sales (month);
+CREATE INDEX IF NOT EXISTS idx_sales_profit ON sales (profit_category);
+CREATE INDEX IF NOT EXISTS idx_sales_revenue ON sales (revenue DESC, id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_COLUMNS = "product_id, name, category, price, units, month, profit_category, revenue"
+
+_local = threading.local()
+_build_lock = threading.Lock()
+_built_for: Optional[Tuple[str, str]] = None
+
+
+def _source_signature(store: RetailDataStore) -> str:
+    # The mtime of the data the store holds, not of the file on disk now: the
+    # table must follow the loaded store until it is reloaded.
+    return f"{os.path.abspath(store.source)}:{store.source_mtime}:{store.size}"
+
+
+def build_table(connection: sqlite3.Connection, store: RetailDataStore) -> None:
+    """(Re)build the ``sales`` table from the columnar store."""
+    revenue = store.price * store.units
+    rows = (
+        (
+            i,
+            store.product_ids[store.product_codes[i]],
+            store.product_names[store.product_codes[i]],
+            store.categories[store.category_codes[i]],
+            float(store.price[i]),
+            int(store.units[i]),
+            store.months[store.month_codes[i]],
+            store.profit_categories[store.profit_codes[i]],
+            float(revenue[i]),
+        )
+        for i in range(store.size)
+    )
+    with connection:
+        connection.executescript(_SCHEMA)
+        connection.execute("DELETE FROM sales")
+        connection.executemany(
+            f"INSERT INTO sales (id, {_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)",
+            (_source_signature(store),),
+        )
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Return this thread's connection to the retail database.
+
+    The database file comes from ``RETAIL_DB_PATH`` (default
+    ``retail_data.db`` in the cache directory) and is rebuilt whenever the
+    source data changes.
+    """
+    global _built_for
+    path = os.environ.get("RETAIL_DB_PATH", DEFAULT_DB_PATH)
+    store = get_store()
+    signature = _source_signature(store)
+
+    if _built_for != (path, signature):
+        with _build_lock:
+            if _built_for != (path, signature):
+                with connect_sqlite(path) as connection:
+                    connection.executescript(_SCHEMA)
+                    current = connection.execute(
+                        "SELECT value FROM meta WHERE key = 'source'"
+                    ).fetchone()
+                    if current is None or current[0] != signature:
+                        build_table(connection, store)
+                connection.close()
+                _built_for = (path, signature)
+
+    connection = getattr(_local, "connection", None)
+    if connection is None or getattr(_local, "path", None) != path:
+        connection = sqlite3.connect(path)
+        connection.row_factory = sqlite3.Row
+        _local.connection, _local.path = connection, path
+    return connection
+
+
+def _filters_digest(*filters: str) -> str:
+    return hashlib.sha1(json.dumps(filters).encode("utf-8")).hexdigest()[:12]
+
+
+def _encode_cursor(filters: str, seen: int, revenue: float, row_id: int) -> str:
+    return f"{filters}:{seen}:{revenue!r}:{row_id}"
+
+
+def _decode_cursor(cursor: str, filters: str) -> Tuple[int, float, int]:
+    try:
+        digest, seen, revenue, row_id = cursor.split(":")
+        position = int(seen), float(revenue), int(row_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if digest != filters:
+        # A cursor only points into the result of the filters it came from.
+        raise ValueError(
+            f"Cursor {cursor!r} belongs to a query with other filters, "
+            "repeat the filters of the previous page or start without a cursor"
+        )
+    return position
+
+
+def query_sales(
+    category: str = "",
+    month_from: str = "",
+    month_to: str = "",
+    profit_category: str = "",
+    top_k: int = 0,
+    page_size: int = 20,
+    cursor: str = "",
+) -> Dict[str, Any]:
+    """
+    Return one page of sales lines ordered by revenue (highest first).
+
+    Each line is one product in one month, so a product sold in several
+    months has several lines. Empty filters are ignored. ``top_k`` caps the
+    total number of lines over all pages, ``cursor`` is the ``NextCursor`` of
+    the previous page, which must be queried with the same filters.
+    """
+    page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+    top_k = max(0, int(top_k))
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    if category:
+        clauses.append("category = ?")
+        params.append(category)
+    if month_from:
+        clauses.append("month >= ?")
+        params.append(month_from)
+    if month_to:
+        clauses.append("month <= ?")
+        params.append(month_to)
+    if profit_category:
+        clauses.append("profit_category = ?")
+        params.append(profit_category)
+
+    filters = _filters_digest(category, month_from, month_to, profit_category)
+    seen = 0
+    if cursor:
+        seen, last_revenue, last_id = _decode_cursor(cursor, filters)
+        clauses.append("(revenue < ? OR (revenue = ? AND id > ?))")
+        params.extend([last_revenue, last_revenue, last_id])
+
+    limit = page_size
+    if top_k:
+        limit = min(limit, top_k - seen)
+    if limit <= 0:
+        return {"Products": [], "Count": 0, "NextCursor": None}
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = (
+        get_connection()
+        .execute(
+            f"SELECT id, {_COLUMNS} FROM sales {where} "
+            "ORDER BY revenue DESC, id LIMIT ?",
+            (*params, limit + 1),
+        )
+        .fetchall()
+    )
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    seen += len(rows)
+    if top_k and seen >= top_k:
+        has_more = False
+
+    products = [
+        {
+            "ProductID": row["product_id"],
+            "Name": row["name"],
+            "Category": row["category"],
+            "Price": row["price"],
+            "UnitsSold": row["units"],
+            "Month": row["month"],
+            "ProfitCategory": row["profit_category"],
+            "Revenue": round(row["revenue"], 2),
+        }
+        for row in rows
+    ]
+    next_cursor = (
+        _encode_cursor(filters, seen, rows[-1]["revenue"], rows[-1]["id"])
+        if has_more
+        else None
+    )
+    return {"Products": products, "Count": len(products), "NextCursor": next_cursor}
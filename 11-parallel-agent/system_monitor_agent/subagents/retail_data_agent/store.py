@@ -0,0 +1,165 @@
+"""
+Retail data store
+
+This module loads the store product/sales data once into a compact columnar
+form and shares it between every session that calls the retail tools.
+
+Each row is one product sales line for one month. Text columns (category,
+month, profit category, product) are dictionary encoded into small integer
+code arrays, numeric columns are NumPy arrays.
+"""
+
+import csv
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_DATA_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "retail_data.json"
+)
+
+# Column names used in the source files and in the tool payload.
+FIELDS = [
+    "ProductID",
+    "Name",
+    "Category",
+    "Price",
+    "UnitsSold",
+    "Month",
+    "ProfitCategory",
+]
+
+
+def _encode(values: List[str]) -> tuple:
+    """Dictionary encode a list of strings into (sorted labels, int32 codes)."""
+    labels, codes = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+    return [str(label) for label in labels], codes.astype(np.int32)
+
+
+class RetailDataStore:
+    """
+    Columnar, read-only product/sales store.
+
+    ``source`` is the file the records were loaded from and ``source_mtime``
+    its modification time at load time (0 when unknown).
+    """
+
+    def __init__(
+        self, records: List[Dict[str, Any]], source: str = "", source_mtime: float = 0.0
+    ):
+        self.source = source
+        self.source_mtime = source_mtime
+        self.size = len(records)
+
+        self.price = np.fromiter(
+            (float(r["Price"]) for r in records), dtype=np.float64, count=self.size
+        )
+        self.units = np.fromiter(
+            (int(r["UnitsSold"]) for r in records), dtype=np.int64, count=self.size
+        )
+        self.categories, self.category_codes = _encode([r["Category"] for r in records])
+        self.months, self.month_codes = _encode([r["Month"] for r in records])
+        self.profit_categories, self.profit_codes = _encode(
+            [r["ProfitCategory"] for r in records]
+        )
+        self.product_ids, self.product_codes = _encode([r["ProductID"] for r in records])
+
+        # One display name per product id (the last one seen wins).
+        names = [""] * len(self.product_ids)
+        for code, record in zip(self.product_codes, records):
+            names[code] = record["Name"]
+        self.product_names = names
+
+        self._payload: Optional[Dict[str, Any]] = None
+        self._payload_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str) -> "RetailDataStore":
+        """Load a store from a ``.csv`` or ``.json`` file."""
+        # Taken before reading, so a write during the load is seen as a change.
+        mtime = os.path.getmtime(path)
+        if path.lower().endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as f:
+                records = list(csv.DictReader(f))
+        else:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data = data["StoreSalesData"]["Store"]["Products"]
+            records = data
+
+        missing = [name for name in FIELDS if records and name not in records[0]]
+        if missing:
+            raise ValueError(f"{path} is missing columns: {', '.join(missing)}")
+        return cls(records, source=path, source_mtime=mtime)
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Rebuild a single row in the original product format."""
+        product = self.product_codes[i]
+        return {
+            "ProductID": self.product_ids[product],
+            "Name": self.product_names[product],
+            "Category": self.categories[self.category_codes[i]],
+            "Price": float(self.price[i]),
+            "UnitsSold": int(self.units[i]),
+            "Month": self.months[self.month_codes[i]],
+            "ProfitCategory": self.profit_categories[self.profit_codes[i]],
+        }
+
+    @property
+    def payload_ready(self) -> bool:
+        """Whether ``as_dict`` returns without building the payload."""
+        return self._payload is not None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Return the whole store in the ``StoreSalesData`` tool format.
+
+        The payload is built on first use and then reused, so callers must
+        treat it as read-only.
+        """
+        if self._payload is None:
+            with self._payload_lock:
+                if self._payload is None:
+                    products = [self.record(i) for i in range(self.size)]
+                    self._payload = {"StoreSalesData": {"Store": {"Products": products}}}
+        return self._payload
+
+
+_store: Optional[RetailDataStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> RetailDataStore:
+    """
+    Return the process wide store, loading it on first call.
+
+    The file is taken from the ``RETAIL_DATA_PATH`` environment variable and
+    falls back to the bundled ``data/retail_data.json``.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = os.environ.get("RETAIL_DATA_PATH", DEFAULT_DATA_PATH)
+                _store = RetailDataStore.from_file(path)
+    return _store
+
+
+def is_store_loaded() -> bool:
+    """Whether ``get_store`` can return without touching the disk."""
+    return _store is not None
+
+
+def reload_store(path: Optional[str] = None) -> RetailDataStore:
+    """Replace the shared store, e.g. after the data file was updated."""
+    global _store
+    store = RetailDataStore.from_file(
+        path or os.environ.get("RETAIL_DATA_PATH", DEFAULT_DATA_PATH)
+    )
+    with _store_lock:
+        _store = store
+    return store
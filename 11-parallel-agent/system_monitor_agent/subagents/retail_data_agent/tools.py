@@ -2,15 +2,28 @@
 Retail data Tool
 
 This module provides a tool for store retail data.
+
+The tools are async: anything that reads the disk or crunches the whole
+catalog runs on the shared bounded thread pool instead of the event loop.
 """
 
-import time
-from typing import Any, Dict
+from typing import Any
+
+from ...concurrency import run_blocking
+from .analytics import compute_insights
+from .history import get_history, to_day
+from .ingest import live_aggregates
+from .sql_store import query_sales
+from .store import RetailDataStore, get_store, is_store_loaded
 
-import psutil
 
+async def _shared_store() -> RetailDataStore:
+    if is_store_loaded():
+        return get_store()
+    return await run_blocking(get_store)
 
-def get_retail_data() -> Any:
+
+async def get_retail_data() -> Any:
     """
     Gather store retail data.
 
@@ -18,110 +31,145 @@ def get_retail_data() -> Any:
         Any: store data information
     """
     try:
-        data = {
-        "StoreSalesData": {
-            "Store": {
-            "Products": [
-                {
-                "ProductID": "P001",
-                "Name": "Men's Denim Jacket",
-                "Category": "Men",
-                "Price": 79.99,
-                "UnitsSold": 324,
-                "Month": "2025-06",
-                "ProfitCategory": "Highly Profitable"
-                },
-                {
-                "ProductID": "P002",
-                "Name": "Women's Floral Dress",
-                "Category": "Women",
-                "Price": 49.99,
-                "UnitsSold": 512,
-                "Month": "2025-06",
-                "ProfitCategory": "Highly Profitable"
-                },
-                {
-                "ProductID": "P003",
-                "Name": "Unisex White Sneakers",
-                "Category": "Footwear",
-                "Price": 69.99,
-                "UnitsSold": 610,
-                "Month": "2025-06",
-                "ProfitCategory": "Highly Profitable"
-                },
-                {
-                "ProductID": "P004",
-                "Name": "Men's Casual T-Shirt",
-                "Category": "Men",
-                "Price": 19.99,
-                "UnitsSold": 450,
-                "Month": "2025-06",
-                "ProfitCategory": "Moderately Profitable"
-                },
-                {
-                "ProductID": "P005",
-                "Name": "Women's Handbag",
-                "Category": "Accessories",
-                "Price": 89.99,
-                "UnitsSold": 278,
-                "Month": "2025-06",
-                "ProfitCategory": "Highly Profitable"
-                },
-                {
-                "ProductID": "P006",
-                "Name": "Kids' Hoodie",
-                "Category": "Kids",
-                "Price": 29.99,
-                "UnitsSold": 198,
-                "Month": "2025-06",
-                "ProfitCategory": "Less Profitable"
-                },
-                {
-                "ProductID": "P007",
-                "Name": "Women's Running Shoes",
-                "Category": "Footwear",
-                "Price": 59.99,
-                "UnitsSold": 431,
-                "Month": "2025-06",
-                "ProfitCategory": "Moderately Profitable"
-                },
-                {
-                "ProductID": "P008",
-                "Name": "Men's Leather Belt",
-                "Category": "Accessories",
-                "Price": 24.99,
-                "UnitsSold": 150,
-                "Month": "2025-06",
-                "ProfitCategory": "Less Profitable"
-                },
-                {
-                "ProductID": "P009",
-                "Name": "Women's Winter Coat",
-                "Category": "Women",
-                "Price": 129.99,
-                "UnitsSold": 95,
-                "Month": "2025-06",
-                "ProfitCategory": "Less Profitable"
-                },
-                {
-                "ProductID": "P010",
-                "Name": "Unisex Sports Cap",
-                "Category": "Accessories",
-                "Price": 14.99,
-                "UnitsSold": 310,
-                "Month": "2025-06",
-                "ProfitCategory": "Moderately Profitable"
-                }
-            ]
-            }
+        store = await _shared_store()
+        if store.payload_ready:
+            data = store.as_dict()
+        else:
+            data = await run_blocking(store.as_dict)
+        if live_aggregates.transactions:
+            data = {**data, "LiveSales": live_aggregates.snapshot("day")}
+        return data
+
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to gather retail information: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
         }
+
+
+async def get_retail_insights(top_n: int = 10) -> Any:
+    """
+    Gather pre-computed store retail insights.
+
+    Args:
+        top_n: number of best and worst selling products to include
+
+    Returns:
+        Any: revenue totals, product rankings, ABC classes and category rollups
+    """
+    try:
+        store = await _shared_store()
+        return await run_blocking(compute_insights, store, top_n=top_n)
+
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to compute retail insights: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
         }
 
-        return data
+
+async def query_retail_data(
+    category: str = "",
+    month_from: str = "",
+    month_to: str = "",
+    profit_category: str = "",
+    top_k: int = 0,
+    page_size: int = 20,
+    cursor: str = "",
+) -> Any:
+    """
+    Query a filtered page of store retail data, highest revenue first.
+
+    Every line is the sales of one product in one month, so a product sold in
+    several months appears once per month.
+
+    Args:
+        category: only products of this category, e.g. "Women" (empty for all)
+        month_from: first month to include as "YYYY-MM" (empty for no limit)
+        month_to: last month to include as "YYYY-MM" (empty for no limit)
+        profit_category: only products of this profit category (empty for all)
+        top_k: only the top k lines (product and month) by revenue over all pages (0 for all)
+        page_size: number of lines per page, at most 100
+        cursor: "NextCursor" value of the previous page queried with the same filters (empty for first page)
+
+    Returns:
+        Any: matching lines, their count and the cursor of the next page
+    """
+    try:
+        return await run_blocking(
+            query_sales,
+            category=category,
+            month_from=month_from,
+            month_to=month_to,
+            profit_category=profit_category,
+            top_k=top_k,
+            page_size=page_size,
+            cursor=cursor,
+        )
 
     except Exception as e:
         return {
-            "result": {"error": f"Failed to gather retail information: {str(e)}"},
+            "result": {"error": f"Failed to query retail information: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
+        }
+
+
+def _sales_history_summary(start_date: str, end_date: str, top_n: int) -> Any:
+    history = get_history()
+    if not history.size:
+        return {"result": {"error": "Sales history is empty"}, "stats": {"success": False}}
+    start_day = to_day(start_date) if start_date else history.first_day
+    end_day = to_day(end_date) if end_date else history.last_day
+    return history.summary(start_day, end_day, top_n=top_n)
+
+
+async def get_sales_history(
+    start_date: str = "", end_date: str = "", top_n: int = 10
+) -> Any:
+    """
+    Gather a summary of the daily sales history over a date window.
+
+    Args:
+        start_date: first day to include as "YYYY-MM-DD" (empty for the first day on record)
+        end_date: last day to include as "YYYY-MM-DD" (empty for the last day on record)
+        top_n: number of best selling products to include
+
+    Returns:
+        Any: window totals, revenue by month, top products and category totals
+    """
+    try:
+        return await run_blocking(_sales_history_summary, start_date, end_date, top_n)
+
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to gather sales history: {str(e)}"},
+            "stats": {"success": False},
+            "additional_info": {"error_type": str(type(e).__name__)},
+        }
+
+
+def get_live_sales(window: str = "day", top_n: int = 10) -> Any:
+    """
+    Gather the current sales numbers from the live POS stream.
+
+    Args:
+        window: aggregation window, one of "day", "week" or "month"
+        top_n: number of best selling products to include
+
+    Returns:
+        Any: current and previous period totals, top products and categories
+    """
+    try:
+        if not live_aggregates.transactions:
+            return {"result": {"error": "No live sales received yet"}, "stats": {"success": False}}
+        return live_aggregates.snapshot(window, top_n=top_n)
+
+    except Exception as e:
+        return {
+            "result": {"error": f"Failed to gather live sales: {str(e)}"},
             "stats": {"success": False},
             "additional_info": {"error_type": str(type(e).__name__)},
         }
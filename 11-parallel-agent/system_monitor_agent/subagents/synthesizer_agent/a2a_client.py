@@ -0,0 +1,206 @@
+"""
+A2A client layer
+
+Shared plumbing for the calls to the remote news agent:
+
+- ``A2AClientPool`` keeps one keep-alive ``httpx.AsyncClient`` per event
+  loop (an httpx client cannot be used from another loop), so consecutive
+  calls reuse open connections instead of paying a new TCP connection each.
+- ``AgentCardCache`` fetches an agent card once and revalidates it after
+  ``ttl`` seconds, with a conditional GET when the server sends an ETag or
+  Last-Modified header. If revalidation fails, the last good card is kept
+  and retried shortly after.
+- Timeouts are explicit: connecting and waiting for a pooled connection fail
+  fast when the server is down, while reading may take as long as the remote
+  agent's model needs.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+from a2a.types import AgentCard
+
+from ...metrics import registry
+
+logger = logging.getLogger(__name__)
+
+CARD_TTL = float(os.environ.get("A2A_CARD_TTL", "300"))
+CONNECT_TIMEOUT = float(os.environ.get("A2A_CONNECT_TIMEOUT", "5"))
+MAX_CONNECTIONS = int(os.environ.get("A2A_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("A2A_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.environ.get("A2A_KEEPALIVE_EXPIRY", "30"))
+
+
+class A2AClientPool:
+    """
+    One pooled ``httpx.AsyncClient`` per running event loop.
+
+    Args:
+        timeout: read/write timeout in seconds (the remote agent runs an LLM).
+        connect_timeout: timeout to connect and to get a pooled connection.
+        max_connections: connections open at once, per event loop.
+        max_keepalive_connections: idle connections kept for reuse.
+        keepalive_expiry: seconds an idle connection is kept.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 600.0,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        max_connections: int = MAX_CONNECTIONS,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = KEEPALIVE_EXPIRY,
+    ):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout, pool=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def client(self) -> httpx.AsyncClient:
+        """The client of the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+            self._clients[loop] = client
+            registry.inc(
+                "a2a_http_clients_total", help="Pooled HTTP clients created for A2A calls"
+            )
+        return client
+
+    async def aclose(self) -> None:
+        """Close the client of the running event loop, if any."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+@dataclass
+class _CachedCard:
+    card: AgentCard
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class AgentCardCache:
+    """
+    Agent cards by URL, revalidated after ``ttl`` seconds.
+
+    Args:
+        ttl: seconds a card is used without asking the server again.
+        retry_after: seconds before a failed revalidation is tried again
+            (the stale card is served meanwhile).
+        fetch_timeout: timeout in seconds of a card request.
+    """
+
+    def __init__(self, ttl: float = CARD_TTL, retry_after: float = 5.0, fetch_timeout: float = 10.0):
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.fetch_timeout = fetch_timeout
+        self._cards: Dict[str, _CachedCard] = {}
+        # Concurrent callers of one loop share a single fetch per URL.
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _fresh(self, url: str) -> Optional[AgentCard]:
+        entry = self._cards.get(url)
+        if entry is not None and time.monotonic() - entry.fetched_at < self.ttl:
+            return entry.card
+        return None
+
+    def _count(self, result: str) -> None:
+        registry.inc(
+            "a2a_agent_card_total",
+            {"result": result},
+            help="Agent card lookups by result (hit, miss, revalidated, refreshed, stale)",
+        )
+
+    async def get(self, url: str, client: httpx.AsyncClient) -> AgentCard:
+        """
+        The card at ``url``. The same object is returned for as long as the
+        card does not change, so callers can compare cards with ``is``.
+
+        Raises:
+            httpx.HTTPError, ValueError: the card could not be fetched and
+                none was cached.
+        """
+        card = self._fresh(url)
+        if card is not None:
+            self._count("hit")
+            return card
+
+        locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        async with locks.setdefault(url, asyncio.Lock()):
+            card = self._fresh(url)
+            if card is not None:
+                self._count("hit")
+                return card
+            return await self._fetch(url, client)
+
+    async def _fetch(self, url: str, client: httpx.AsyncClient) -> AgentCard:
+        entry = self._cards.get(url)
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        started = time.perf_counter()
+        try:
+            response = await client.get(url, headers=headers, timeout=self.fetch_timeout)
+            if response.status_code == 304 and entry is not None:
+                entry.fetched_at = time.monotonic()
+                self._count("revalidated")
+                return entry.card
+            response.raise_for_status()
+            card = AgentCard.model_validate(response.json())
+        except (httpx.HTTPError, ValueError) as e:
+            if entry is None:
+                raise
+            logger.warning("Could not revalidate agent card %s, using cached card: %s", url, e)
+            entry.fetched_at = time.monotonic() - self.ttl + self.retry_after
+            self._count("stale")
+            return entry.card
+        finally:
+            registry.observe(
+                "a2a_agent_card_fetch_seconds",
+                time.perf_counter() - started,
+                help="Duration of agent card requests",
+            )
+
+        if entry is not None and card == entry.card:
+            # Unchanged: keep the old object so clients built from it stay valid.
+            card = entry.card
+            self._count("revalidated")
+        else:
+            self._count("refreshed" if entry is not None else "miss")
+        self._cards[url] = _CachedCard(
+            card=card,
+            fetched_at=time.monotonic(),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+        return card
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Forget the card of ``url`` (or every card)."""
+        if url is None:
+            self._cards.clear()
+        else:
+            self._cards.pop(url, None)
+
+
+card_cache = AgentCardCache()
@@ -5,17 +5,37 @@ This agent is responsible for synthesizing information from other agents
 to create a comprehensive system health report.
 """
 
+import os
+
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
 from google.adk.agents import LlmAgent
-from google.adk.agents.remote_a2a_agent import (
-    RemoteA2aAgent,
-    AGENT_CARD_WELL_KNOWN_PATH,
+
+from ..local_news_agent import local_news_agent
+from .circuit_breaker import CircuitBreaker, NewsFallbackAgent
+from .prompt_budget import BudgetedInstruction
+from .remote import LazyRemoteA2aAgent
+
+# Base URL of the news agent served by agent_for_a2a/a2a_server.py
+NEWS_AGENT_URL = os.environ.get("A2A_NEWS_AGENT_URL", "http://localhost:8001")
+
+# The A2A client is only built when the synthesizer first transfers to it
+remote_news_a2a_agent = LazyRemoteA2aAgent(
+    name="remote_news_a2a_agent",
+    description="Remote agent that fetches local news.",
+    # Point to the agent card URL - this is where the A2A protocol metadata lives
+    agent_card=f"{NEWS_AGENT_URL}{AGENT_CARD_WELL_KNOWN_PATH}",
 )
 
-remote_news_agent = RemoteA2aAgent(
+# When the A2A server is slow or down, the breaker opens and the news comes
+# from the session state, the news cache or an in-process local news agent
+remote_news_agent = NewsFallbackAgent(
     name="remote_news_agent",
     description="Remote agent that fetches local news.",
-    # Point to the agent card URL - this is where the A2A protocol metadata lives
-    agent_card=f"http://localhost:8001{AGENT_CARD_WELL_KNOWN_PATH}",
+    breaker=CircuitBreaker("remote_news_agent"),
+    sub_agents=[
+        remote_news_a2a_agent,
+        local_news_agent.clone(update={"name": "local_news_fallback_agent"}),
+    ],
 )
 
 # --- Constants ---
@@ -25,24 +45,32 @@ GEMINI_MODEL = "gemini-2.0-flash"
 fashion_report_synthesizer = LlmAgent(
     name="FashionReportSynthesizer",
     model=GEMINI_MODEL,
-    instruction="""You are a Fashion Report Synthesizer.
+    # State values are fitted into SYNTH_STATE_TOKEN_BUDGET tokens before the call
+    instruction=BudgetedInstruction(
+        """You are a Fashion Report Synthesizer.
 
     You are an helpful recommendation assistant who is helping the owner of a fashion store to know what are in fashion that are currently trending and which are not which will help the owner to increase the sales of the shop.
     
     Your task is to create a detailed repoty by combining information from:
     - Retail Data: {retail_data}
     - Tending news on Fashion: {trending_info}
+    - Local news: {latest_news?}
+    - Store products matching the trends (pre-computed, best match first, with the trend words they matched on): {trend_matches?}
+
+    An input that starts with "[unavailable" could not be gathered in time. Write the report from the other inputs and mention briefly which information was missing.
 
     You need to analyse all the information about latest_news, trending_fashion and retail_data.
     
     Create a well-formatted report with:
-    1. Recommend some products and category of products which are in trend currently that will help owner to increase the sales. Also compare the trending products with the products present in retail data. If found similarity, mention it in the report about that product.
+    1. Recommend some products and category of products which are in trend currently that will help owner to increase the sales. Use the pre-computed matches to say which store products are in trend, do not compare the product lists yourself. Trends listed as not in the catalog are products the store could add.
     2. Give a detailed point of view about the products explaining why are they recommended. And also is there anything in the local news that can affect the sales of the products.
     3. At the end give some suggestions about how the sales can be increased. For example, displaying the recommended products, giving some discounts on those products.
     
     Use markdown formatting to make the report readable and professional.
     Highlight any concerning values and provide practical recommendations.
     """,
+        weights={"retail_data": 1.5, "trending_info": 1.0, "latest_news": 0.5, "trend_matches": 1.0},
+    ),
     description="Synthesizes all information into a comprehensive report",
     sub_agents = [remote_news_agent]
 )
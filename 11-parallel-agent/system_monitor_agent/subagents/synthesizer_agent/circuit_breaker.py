@@ -0,0 +1,263 @@
+"""
+Circuit breaker for the remote news agent
+
+``CircuitBreaker`` tracks the calls to a dependency. After
+``failure_threshold`` consecutive failures (errors, timeouts, or calls slower
+than ``slow_call_seconds``) it opens and refuses calls for ``open_seconds``.
+It then lets one trial call through (half-open), and that call's outcome
+closes or re-opens it.
+
+``NewsFallbackAgent`` puts a breaker in front of the remote news agent. When
+the breaker is open, or the remote call fails or exceeds ``call_timeout``
+before answering, the news comes from, in order:
+
+1. ``latest_news`` already in the session state (from the local news branch),
+   unless it is marked missing;
+2. the news search results in the news cache, without a model call;
+3. the fallback agent, an in-process copy of ``local_news_agent``.
+
+Breaker state, call outcomes and fallbacks are exported through
+``metrics.registry``.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, AsyncGenerator, Callable, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+
+from ...concurrency import run_blocking
+from ...metrics import registry
+from ...parallel import is_missing
+from ..local_news_agent import tools as news_tools
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+# Gauge values of the states
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+FAILURE_THRESHOLD = int(os.environ.get("NEWS_BREAKER_FAILURES", "3"))
+OPEN_SECONDS = float(os.environ.get("NEWS_BREAKER_OPEN_SECONDS", "30"))
+SLOW_CALL_SECONDS = float(os.environ.get("NEWS_BREAKER_SLOW_SECONDS", "20"))
+CALL_TIMEOUT = float(os.environ.get("NEWS_REMOTE_TIMEOUT", "45"))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Args:
+        name: label of the breaker in the metrics.
+        failure_threshold: consecutive failures that open the breaker.
+        open_seconds: seconds calls are refused before a trial call.
+        slow_call_seconds: successful calls at least this slow count as failures.
+        clock: monotonic time source (for tests).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        open_seconds: float = OPEN_SECONDS,
+        slow_call_seconds: float = SLOW_CALL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._publish_state()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._set_state(HALF_OPEN)
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            registry.inc(
+                "circuit_breaker_transitions_total",
+                {"breaker": self.name, "to": state},
+                help="Circuit breaker state changes",
+            )
+            logger.info("Circuit breaker %s: %s -> %s", self.name, self._state, state)
+        self._state = state
+        self._publish_state()
+
+    def _publish_state(self) -> None:
+        registry.set_gauge(
+            "circuit_breaker_state",
+            _STATE_VALUES[self._state],
+            {"breaker": self.name},
+            help="Circuit breaker state (0 closed, 1 half-open, 2 open)",
+        )
+
+    def _count(self, outcome: str) -> None:
+        registry.inc(
+            "circuit_breaker_calls_total",
+            {"breaker": self.name, "outcome": outcome},
+            help="Calls through a circuit breaker by outcome",
+        )
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (False while open)."""
+        with self._lock:
+            state = self._current_state()
+            allowed = state == CLOSED or (state == HALF_OPEN and not self._trial_running)
+            if allowed and state == HALF_OPEN:
+                self._trial_running = True
+        if not allowed:
+            self._count("rejected")
+        return allowed
+
+    def record_success(self, seconds: float) -> None:
+        """Record a call that succeeded in ``seconds``."""
+        if seconds >= self.slow_call_seconds:
+            self.record_failure("slow")
+            return
+        with self._lock:
+            self._failures = 0
+            self._trial_running = False
+            self._set_state(CLOSED)
+        self._count("success")
+
+    def record_failure(self, outcome: str = "error") -> None:
+        """Record a failed call; ``outcome`` labels it in the metrics."""
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+                self._set_state(OPEN)
+        self._count(outcome)
+
+    def abandon(self) -> None:
+        """Forget a call that was cancelled before it finished."""
+        with self._lock:
+            self._trial_running = False
+
+
+def format_cached_news(news: Any, limit: int = 4000) -> str:
+    """Readable digest of news search results (Tavily's ``results`` list or any value)."""
+    results = news.get("results") if isinstance(news, dict) else None
+    if not isinstance(results, list):
+        return str(news)[:limit]
+    lines = []
+    for result in results:
+        if isinstance(result, dict):
+            content = str(result.get("content", ""))[:300]
+            lines.append(f"- **{result.get('title', 'News')}**: {content} ({result.get('url', '')})")
+    return "\n".join(lines)[:limit]
+
+
+class NewsFallbackAgent(BaseAgent):
+    """
+    Runs the first sub-agent (the remote news agent) behind ``breaker`` and
+    falls back to cached news or the second sub-agent.
+
+    Attributes:
+        breaker: the circuit breaker of the remote agent.
+        call_timeout: seconds the remote agent may take before its first
+            answer; after that the call counts as failed and falls back.
+    """
+
+    breaker: CircuitBreaker
+    call_timeout: float = CALL_TIMEOUT
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        remote = self.sub_agents[0]
+        if not self.breaker.allow():
+            async for event in self._fallback(ctx, "open"):
+                yield event
+            return
+
+        started = time.perf_counter()
+        events = remote.run_async(ctx)
+        answered = False
+        reason: Optional[str] = None
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout(
+                        None if answered else self.call_timeout - (time.perf_counter() - started)
+                    ):
+                        event = await anext(events)
+                except StopAsyncIteration:
+                    break
+                except TimeoutError:
+                    reason = "timeout"
+                    break
+                if event.error_message and not answered:
+                    logger.warning("Remote news agent failed: %s", event.error_message)
+                    reason = "error"
+                    break
+                answered = True
+                yield event
+        except BaseException:
+            self.breaker.abandon()
+            raise
+        finally:
+            await events.aclose()
+
+        if reason is None:
+            self.breaker.record_success(time.perf_counter() - started)
+            return
+        self.breaker.record_failure(reason)
+        async for event in self._fallback(ctx, reason):
+            yield event
+
+    async def _fallback(
+        self, ctx: InvocationContext, reason: str
+    ) -> AsyncGenerator[Event, None]:
+        news = ctx.session.state.get("latest_news")
+        source = "state"
+        if is_missing(news):
+            cached = await run_blocking(
+                news_tools.cached_news, *news_tools.store_location(ctx.session.state)
+            )
+            news = format_cached_news(cached) if cached else None
+            source = "cache"
+        if not news:
+            source = "local_agent"
+
+        registry.inc(
+            "news_fallback_total",
+            {"reason": reason, "source": source},
+            help="Remote news calls answered by a fallback",
+        )
+        if source == "local_agent":
+            async for event in self.sub_agents[1].run_async(ctx):
+                yield event
+            return
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(
+                role="model",
+                parts=[types.Part(text=f"Latest local news (remote news agent unavailable):\n{news}")],
+            ),
+            custom_metadata={"news_fallback": source},
+        )
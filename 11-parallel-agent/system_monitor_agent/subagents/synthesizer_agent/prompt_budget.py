@@ -0,0 +1,267 @@
+"""
+Token-budgeted state injection
+
+``BudgetedInstruction`` is an instruction provider for the synthesizer. It
+fills the ``{key}`` / ``{key?}`` placeholders of an instruction template
+from the session state, as ADK does, but first fits the injected values
+into a token budget:
+
+- the budget is shared among the values in proportion to their weights;
+  values smaller than their share hand the rest to the others;
+- text that is over its share is condensed extractively: headings are
+  kept, then the lines and sentences that carry the most fashion keywords
+  and figures, in their original order, without near-duplicates;
+- structured values (like ``trend_matches``) are written as compact JSON,
+  and their longest lists are shortened from the end until they fit.
+
+Raw and injected token counts are exported through ``metrics.registry`` and
+logged, so the tokens saved per run can be followed.
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from google.adk.agents.readonly_context import ReadonlyContext
+
+from ...metrics import SIZE_BUCKETS, registry
+from ..trend_match_agent.lexicon import KEYWORD_GROUPS, tokenize
+
+logger = logging.getLogger(__name__)
+
+STATE_TOKEN_BUDGET = int(os.environ.get("SYNTH_STATE_TOKEN_BUDGET", "2500"))
+
+_PLACEHOLDER = re.compile(r"{+[^{}]*}+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_DIGIT = re.compile(r"\d")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+# Units at least this similar (Jaccard of their tokens) count as duplicates.
+DUPLICATE_SIMILARITY = 0.8
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count (4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _units(text: str) -> List[str]:
+    # Lines, with long lines split into sentences.
+    units = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if len(line) > 240 and not line.lstrip().startswith("#"):
+            units.extend(part for part in _SENTENCE_END.split(line) if part.strip())
+        else:
+            units.append(line)
+    return units
+
+
+def _score(unit: str, tokens: Set[str], position: float) -> float:
+    keywords = sum(1 for token in tokens if token in KEYWORD_GROUPS)
+    figures = 1.5 if _DIGIT.search(unit) else 0.0
+    # Earlier units first on ties: reports lead with their main points.
+    return keywords + figures + (1.0 - position) * 0.5
+
+
+def condense(text: str, max_tokens: int) -> str:
+    """Extract the most informative lines of ``text`` within ``max_tokens``."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    units = _units(text)
+    # Figures are part of what a line says: lines that only differ in their
+    # numbers (one product per line) are not duplicates.
+    token_sets = [set(tokenize(unit)) | set(_NUMBER.findall(unit)) for unit in units]
+    headings = [i for i, unit in enumerate(units) if unit.lstrip().startswith("#")]
+    others = sorted(
+        (i for i in range(len(units)) if i not in set(headings)),
+        key=lambda i: -_score(units[i], token_sets[i], i / max(1, len(units))),
+    )
+
+    note = "[condensed: kept {kept} of {total} lines]"
+    budget = max_tokens - count_tokens(note.format(kept=len(units), total=len(units)))
+    kept: List[int] = []
+    used = 0
+    for i in headings + others:
+        cost = count_tokens(units[i]) + 1
+        if used + cost > budget:
+            continue
+        tokens = token_sets[i]
+        if tokens and any(
+            len(tokens & token_sets[j]) / len(tokens | token_sets[j]) >= DUPLICATE_SIMILARITY
+            for j in kept
+            if token_sets[j]
+        ):
+            continue
+        kept.append(i)
+        used += cost
+    if not kept:
+        return text[: max(0, max_tokens * 4)]
+    lines = [units[i] for i in sorted(kept)]
+    lines.append(note.format(kept=len(kept), total=len(units)))
+    return "\n".join(lines)
+
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _longest_list(value: Any) -> Optional[list]:
+    # The longest list inside nested dicts and lists.
+    best = None
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            if best is None or len(item) > len(best):
+                best = item
+            stack.extend(item)
+    return best
+
+
+def shrink_structured(value: Any, max_tokens: int) -> str:
+    """Compact JSON of ``value``, with its longest lists cut to fit ``max_tokens``."""
+    text = _compact_json(value)
+    if count_tokens(text) <= max_tokens:
+        return text
+    value = json.loads(text)
+    while count_tokens(text) > max_tokens:
+        longest = _longest_list(value)
+        if not longest:
+            return text[: max_tokens * 4]
+        longest.pop()
+        text = _compact_json(value)
+    return text
+
+
+def allocate(sizes: Dict[str, int], weights: Dict[str, float], budget: int) -> Dict[str, int]:
+    """
+    Split ``budget`` between values of the given token ``sizes``: each gets a
+    share in proportion to its weight, and what a small value does not use
+    goes to the others.
+    """
+    shares: Dict[str, int] = {}
+    pending = dict(sizes)
+    remaining = budget
+    while pending:
+        total_weight = sum(weights.get(key, 1.0) for key in pending)
+        fits = {
+            key: size
+            for key, size in pending.items()
+            if size <= remaining * weights.get(key, 1.0) / total_weight
+        }
+        if not fits:
+            for key in pending:
+                shares[key] = int(remaining * weights.get(key, 1.0) / total_weight)
+            break
+        for key, size in fits.items():
+            shares[key] = size
+            remaining -= size
+            del pending[key]
+    return shares
+
+
+class BudgetedInstruction:
+    """
+    Instruction provider that injects state values within a token budget.
+
+    Args:
+        template: instruction with ``{key}`` and ``{key?}`` placeholders.
+        budget: tokens available to all injected values together.
+        weights: relative share of each key (default 1.0).
+    """
+
+    def __init__(
+        self,
+        template: str,
+        budget: int = STATE_TOKEN_BUDGET,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        self.template = template
+        self.budget = budget
+        self.weights = weights or {}
+        self.last_report: Dict[str, Any] = {}
+
+    def _values(self, state: Any) -> Dict[str, Tuple[Any, str]]:
+        # key -> (raw value, text as ADK would inject it)
+        values = {}
+        for match in _PLACEHOLDER.finditer(self.template):
+            name = match.group().lstrip("{").rstrip("}").strip()
+            optional = name.endswith("?")
+            name = name.removesuffix("?")
+            if not name.isidentifier() or name in values:
+                continue
+            if name not in state:
+                if optional:
+                    continue
+                raise KeyError(f"Context variable not found: `{name}`.")
+            value = state[name]
+            values[name] = (value, "" if value is None else str(value))
+        return values
+
+    def render(self, state: Any) -> str:
+        """The instruction with budgeted values, for a state mapping."""
+        values = self._values(state)
+        fitted: Dict[str, str] = {}
+        for name, (value, text) in values.items():
+            fitted[name] = _compact_json(value) if isinstance(value, (dict, list)) else text
+        sizes = {name: count_tokens(text) for name, text in fitted.items()}
+        shares = allocate(sizes, self.weights, self.budget)
+        raw = dict(fitted)
+
+        def fit(name: str, share: int) -> None:
+            value = values[name][0]
+            if isinstance(value, (dict, list)):
+                fitted[name] = shrink_structured(value, share)
+            else:
+                fitted[name] = condense(raw[name], share)
+
+        cut = [name for name, share in shares.items() if sizes[name] > share]
+        for name in cut:
+            fit(name, shares[name])
+        # Condensing can leave part of a share unused (duplicate lines);
+        # give it to the values that were cut, once.
+        unused = self.budget - sum(count_tokens(text) for text in fitted.values())
+        if cut and unused > 0:
+            total_weight = sum(self.weights.get(name, 1.0) for name in cut)
+            for name in cut:
+                fit(name, shares[name] + int(unused * self.weights.get(name, 1.0) / total_weight))
+
+        self._report(values, fitted)
+
+        def replace(match: "re.Match") -> str:
+            name = match.group().lstrip("{").rstrip("}").strip().removesuffix("?")
+            if not name.isidentifier():
+                return match.group()
+            return fitted.get(name, "")
+
+        return _PLACEHOLDER.sub(replace, self.template)
+
+    def _report(self, values: Dict[str, Tuple[Any, str]], fitted: Dict[str, str]) -> None:
+        report = {}
+        for name, (_, raw) in values.items():
+            raw_tokens, injected = count_tokens(raw), count_tokens(fitted[name])
+            report[name] = {"raw_tokens": raw_tokens, "injected_tokens": injected}
+            registry.inc(
+                "prompt_state_tokens_total",
+                {"key": name, "stage": "raw"},
+                raw_tokens,
+                help="Tokens of state values before and after budgeting",
+            )
+            registry.inc("prompt_state_tokens_total", {"key": name, "stage": "injected"}, injected)
+        saved = sum(item["raw_tokens"] - item["injected_tokens"] for item in report.values())
+        registry.observe(
+            "prompt_state_tokens_saved",
+            max(0, saved),
+            buckets=SIZE_BUCKETS,
+            help="Tokens saved per synthesizer call by state budgeting",
+        )
+        self.last_report = {"keys": report, "tokens_saved": saved}
+        logger.info("Synthesizer state injected within budget, %d tokens saved: %s", saved, report)
+
+    def __call__(self, context: ReadonlyContext) -> str:
+        return self.render(context.state)
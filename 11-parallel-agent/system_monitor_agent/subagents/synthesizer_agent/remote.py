@@ -0,0 +1,121 @@
+"""
+Lazy remote A2A agent
+
+``LazyRemoteA2aAgent`` stands in for a ``RemoteA2aAgent`` in the agent tree
+and only builds the real one (its A2A client, HTTP client and agent card
+lookup) the first time the agent is transferred to, so importing the
+synthesizer stays free of network and client setup.
+
+Calls go through the pooled HTTP client and the agent card cache of
+``a2a_client``: the connection and the card are reused from one call to the
+next, and the real agent is only rebuilt when the card changes.
+"""
+
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, AsyncGenerator, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from pydantic import PrivateAttr
+
+if TYPE_CHECKING:
+    import httpx
+    from a2a.types import AgentCard
+    from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+
+    from .a2a_client import A2AClientPool
+
+
+class LazyRemoteA2aAgent(BaseAgent):
+    """
+    ``RemoteA2aAgent`` built on first use.
+
+    Attributes:
+        agent_card: URL (or file path) of the remote agent card.
+        timeout: HTTP timeout in seconds for the remote calls.
+    """
+
+    agent_card: str
+    timeout: float = 600.0
+
+    _pool: Optional["A2AClientPool"] = PrivateAttr(default=None)
+    # event loop -> (card, HTTP client, remote agent built from them)
+    _remotes: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[AgentCard, httpx.AsyncClient, RemoteA2aAgent]]" = PrivateAttr(
+        default_factory=weakref.WeakKeyDictionary
+    )
+
+    def pool(self) -> "A2AClientPool":
+        """The HTTP client pool of this agent."""
+        if self._pool is None:
+            from .a2a_client import A2AClientPool
+
+            self._pool = A2AClientPool(timeout=self.timeout)
+        return self._pool
+
+    async def remote(self) -> "RemoteA2aAgent":
+        """
+        Return the real remote agent of the running event loop, building it
+        on the first call and again whenever the agent card changes.
+        """
+        from a2a.client.client import ClientConfig
+        from a2a.client.client_factory import ClientFactory
+        from a2a.types import TransportProtocol
+        from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+
+        from .a2a_client import card_cache
+
+        client = self.pool().client()
+        if self.agent_card.startswith(("http://", "https://")):
+            card = await card_cache.get(self.agent_card, client)
+        else:
+            # A card file is read once by the remote agent itself.
+            card = self.agent_card
+
+        loop = asyncio.get_running_loop()
+        built = self._remotes.get(loop)
+        if built is None or built[0] is not card or built[1] is not client:
+            remote = RemoteA2aAgent(
+                name=self.name,
+                description=self.description,
+                agent_card=card,
+                timeout=self.timeout,
+                # Same settings as RemoteA2aAgent's own factory, on the pooled client
+                a2a_client_factory=ClientFactory(
+                    config=ClientConfig(
+                        httpx_client=client,
+                        streaming=False,
+                        polling=False,
+                        supported_transports=[TransportProtocol.jsonrpc],
+                    )
+                ),
+            )
+            built = self._remotes[loop] = (card, client, remote)
+        return built[2]
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        try:
+            remote = await self.remote()
+        except Exception as e:
+            # Same error event as RemoteA2aAgent when it cannot resolve its card.
+            yield Event(
+                author=self.name,
+                error_message=f"Failed to initialize remote A2A agent: {e}",
+                invocation_id=ctx.invocation_id,
+                branch=ctx.branch,
+            )
+            return
+
+        # The callbacks already ran for this agent; run only the remote body
+        # so plugins do not see the same agent start twice.
+        async for event in remote._run_async_impl(ctx):
+            yield event
+
+    async def cleanup(self) -> None:
+        """Close the HTTP client of the running event loop, if it was built."""
+        self._remotes.pop(asyncio.get_running_loop(), None)
+        if self._pool is not None:
+            await self._pool.aclose()
@@ -0,0 +1,3 @@
+"""Agent matching the fashion trends against the store catalog."""
+
+from .agent import trend_match_agent
@@ -0,0 +1,60 @@
+"""
+Trend match agent
+
+This agent matches the gathered fashion trends (``trending_info``) against
+the store catalog with the local TF-IDF index, without a model call, and
+writes the ranked matches to the ``trend_matches`` state key. The
+synthesizer gets a short structured list of matching products instead of
+comparing the raw trend text with the retail data itself.
+"""
+
+import os
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from ...concurrency import run_blocking
+from ...parallel import is_missing
+from .index import get_index
+
+OUTPUT_KEY = "trend_matches"
+TOP_K = int(os.environ.get("TREND_MATCH_TOP_K", "10"))
+
+
+def match_trends(trends: str, top_k: int = TOP_K):
+    return get_index().match(trends, top_k=top_k)
+
+
+class TrendMatchAgent(BaseAgent):
+    """
+    Writes ``trend_matches`` from ``trending_info`` and the catalog index.
+
+    Attributes:
+        top_k: number of products listed.
+    """
+
+    top_k: int = TOP_K
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        trends = ctx.session.state.get("trending_info")
+        if is_missing(trends):
+            matches = {"matches": [], "note": "no trends were gathered"}
+        else:
+            # Index build and scoring are CPU work, keep them off the event loop.
+            matches = await run_blocking(match_trends, str(trends), self.top_k)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={OUTPUT_KEY: matches}),
+        )
+
+
+trend_match_agent = TrendMatchAgent(
+    name="TrendMatchAgent",
+    description="Matches the fashion trends against the store catalog",
+)
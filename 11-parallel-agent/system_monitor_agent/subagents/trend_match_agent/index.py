@@ -0,0 +1,152 @@
+"""
+Catalog TF-IDF index
+
+One document per product (its name and category) in a term-major sparse
+layout: for every term, the products containing it and their TF-IDF weights
+in three flat NumPy arrays (like a CSR matrix). Scoring a trend text is one
+vectorized gather of the query terms' postings plus a ``np.bincount``, so
+matching costs grow with the postings of the query terms, not with the
+catalog size times the vocabulary.
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..retail_data_agent.store import RetailDataStore, get_store
+from .lexicon import KEYWORD_GROUPS, extract_keywords, tokenize
+
+# Query weight of lexicon keywords relative to other words of the trends.
+KEYWORD_BOOST = 2.0
+
+
+class CatalogIndex:
+    """TF-IDF index of the products of a ``RetailDataStore``."""
+
+    def __init__(self, store: RetailDataStore):
+        self.store = store
+        n_products = len(store.product_ids)
+        self.size = n_products
+
+        # Per product: units sold over all months and its latest profit category.
+        self.units = np.bincount(
+            store.product_codes, weights=store.units, minlength=n_products
+        ).astype(np.int64)
+        self.profit_codes = np.zeros(n_products, dtype=np.int32)
+        self.profit_codes[store.product_codes] = store.profit_codes
+        self.category_codes = np.zeros(n_products, dtype=np.int32)
+        self.category_codes[store.product_codes] = store.category_codes
+
+        self.vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        counts: List[int] = []
+        for product in range(n_products):
+            text = f"{store.product_names[product]} {store.categories[self.category_codes[product]]}"
+            for token, count in Counter(tokenize(text)).items():
+                term_ids.append(self.vocabulary.setdefault(token, len(self.vocabulary)))
+                doc_ids.append(product)
+                counts.append(count)
+
+        terms = np.asarray(term_ids, dtype=np.int64)
+        docs = np.asarray(doc_ids, dtype=np.int64)
+        tf = 1.0 + np.log(np.asarray(counts, dtype=np.float64))
+        df = np.bincount(terms, minlength=len(self.vocabulary))
+        self.idf = np.log((1.0 + n_products) / (1.0 + df)) + 1.0
+        weights = tf * self.idf[terms]
+        # L2-normalize every product vector.
+        norms = np.sqrt(np.bincount(docs, weights=weights**2, minlength=n_products))
+        weights /= norms[docs]
+
+        order = np.argsort(terms, kind="stable")
+        self.postings_docs = docs[order]
+        self.postings_weights = weights[order]
+        self.indptr = np.concatenate(([0], np.cumsum(df)))
+
+    def _query_vector(self, text: str):
+        counts = Counter(tokenize(text))
+        known = [(self.vocabulary[t], t, c) for t, c in counts.items() if t in self.vocabulary]
+        if not known:
+            return np.empty(0, dtype=np.int64), np.empty(0), set()
+        term_ids = np.asarray([term for term, _, _ in known], dtype=np.int64)
+        boost = np.asarray([KEYWORD_BOOST if t in KEYWORD_GROUPS else 1.0 for _, t, _ in known])
+        weights = (1.0 + np.log([c for _, _, c in known])) * self.idf[term_ids] * boost
+        weights /= np.linalg.norm(weights)
+        return term_ids, weights, {t for _, t, _ in known}
+
+    def scores(self, text: str) -> np.ndarray:
+        """Cosine similarity of every product with ``text``."""
+        term_ids, weights, _ = self._query_vector(text)
+        if not len(term_ids):
+            return np.zeros(self.size)
+        starts = self.indptr[term_ids]
+        lengths = self.indptr[term_ids + 1] - starts
+        # Positions of all postings of the query terms, in one array.
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = offsets + np.arange(lengths.sum())
+        return np.bincount(
+            self.postings_docs[positions],
+            weights=self.postings_weights[positions] * np.repeat(weights, lengths),
+            minlength=self.size,
+        )
+
+    def match(self, trends: str, top_k: int = 10, min_score: float = 0.05) -> Dict[str, Any]:
+        """
+        Products of the catalog that match the trends, best first.
+
+        Returns:
+            Dict[str, Any]: the trend keywords by group, the ranked matches with
+            the words they matched on, and trend keywords no product carries.
+        """
+        keywords = extract_keywords(trends)
+        scores = self.scores(trends)
+        _, _, query_terms = self._query_vector(trends)
+
+        candidates = np.flatnonzero(scores >= min_score)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        ranked = candidates[np.lexsort((-self.units[candidates], -scores[candidates]))]
+
+        store = self.store
+        matches = []
+        for product in ranked:
+            name = store.product_names[product]
+            category = store.categories[self.category_codes[product]]
+            matches.append(
+                {
+                    "product_id": store.product_ids[product],
+                    "name": name,
+                    "category": category,
+                    "profit_category": store.profit_categories[self.profit_codes[product]],
+                    "units_sold": int(self.units[product]),
+                    "score": round(float(scores[product]), 3),
+                    "matched_on": sorted(set(tokenize(f"{name} {category}")) & query_terms),
+                }
+            )
+        return {
+            "trend_keywords": {group: words for group, words in keywords.items() if words},
+            "matches": matches,
+            "trends_not_in_catalog": [
+                word
+                for words in keywords.values()
+                for word in words
+                if word not in self.vocabulary
+            ],
+        }
+
+
+_index: Optional[CatalogIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> CatalogIndex:
+    """Index of the shared retail store, rebuilt when the store is reloaded."""
+    global _index
+    store = get_store()
+    if _index is None or _index.store is not store:
+        with _index_lock:
+            if _index is None or _index.store is not store:
+                _index = CatalogIndex(store)
+    return _index
@@ -0,0 +1,99 @@
+"""
+Fashion keyword lexicon
+
+Tokenization shared by the catalog index and the trend text, and the
+keywords (categories, colors, fabrics, styles) looked for in the trends.
+Words are normalized the same way on both sides: lowercase, possessives
+dropped, simple plural stemming, so "Women's Floral Dresses" and "floral
+dress" meet on the same tokens.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List
+
+_WORD = re.compile(r"[a-z]+")
+
+# Spellings folded into a single token before splitting.
+_COMPOUNDS = {
+    "t-shirt": "tshirt",
+    "t shirt": "tshirt",
+    "tee shirt": "tshirt",
+    "tees": "tshirt",
+    "tee": "tshirt",
+    "sweat shirt": "sweatshirt",
+    "hand bag": "handbag",
+}
+_COMPOUND = re.compile(r"\b(" + "|".join(map(re.escape, _COMPOUNDS)) + r")\b")
+
+# Not the segment words (men, women, kids, unisex): they are catalog categories.
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with their they these those our your all more most very "
+    "new latest trend trending fashion season".split()
+)
+
+LEXICON: Dict[str, List[str]] = {
+    "categories": (
+        "dress skirt jacket coat blazer tshirt shirt top hoodie sweatshirt sweater "
+        "cardigan jean trouser pant short jogger legging kurta saree lehenga suit "
+        "sneaker shoe boot sandal heel loafer handbag bag belt cap hat scarf "
+        "sunglass watch jewellery jewelry"
+    ).split(),
+    "colors": (
+        "white black red blue navy green olive yellow pink purple lilac lavender "
+        "beige brown tan grey gray orange pastel neutral earth metallic gold silver"
+    ).split(),
+    "fabrics": (
+        "denim leather linen cotton silk wool cashmere velvet satin chiffon "
+        "corduroy knit fleece polyester nylon suede sustainable organic recycled"
+    ).split(),
+    "styles": (
+        "floral casual formal athleisure sport sporty running oversized cropped "
+        "vintage retro minimalist luxury streetwear boho ethnic festive party "
+        "winter summer monsoon graphic printed striped checked relaxed slim"
+    ).split(),
+}
+
+
+def stem(word: str) -> str:
+    """Very small plural stemmer: dresses -> dress, hoodies -> hoody, caps -> cap."""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("ie"):
+        # hoodie and hoodies both become hoody
+        return word[:-2] + "y"
+    if word.endswith(("sses", "shes", "ches", "xes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us")):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized tokens of ``text``, stopwords removed."""
+    text = text.lower().replace("'s", "")
+    text = _COMPOUND.sub(lambda match: _COMPOUNDS[match.group(1)], text)
+    tokens = []
+    for word in _WORD.findall(text):
+        token = stem(word)
+        if len(token) > 1 and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+# stemmed keyword -> its lexicon group
+KEYWORD_GROUPS: Dict[str, str] = {
+    stem(word): group for group, words in LEXICON.items() for word in words
+}
+
+
+def extract_keywords(text: str) -> Dict[str, List[str]]:
+    """Lexicon keywords found in ``text`` by group, most mentioned first."""
+    counts = Counter(token for token in tokenize(text) if token in KEYWORD_GROUPS)
+    found: Dict[str, List[str]] = {group: [] for group in LEXICON}
+    for token, _ in counts.most_common():
+        found[KEYWORD_GROUPS[token]].append(token)
+    return found
@@ -1,3 +1,3 @@
 """Memory info agent for system monitoring."""
 
-from .agent import trending_fashion_agent
+from .agent import trending_fashion_agent, trends_snapshot_agent
@@ -7,6 +7,7 @@ This agent is responsible for gathering and analyzing trending fashion data.
 from google.adk.agents import LlmAgent
 from google.adk.tools.agent_tool import AgentTool
 from ..get_latest_trending_fashion_news.agent import get_latest_trending_fashion_news
+from .snapshot import TrendsSnapshotAgent
 
 # from .tools import get_memory_info
 
@@ -30,3 +31,10 @@ trending_fashion_agent = LlmAgent(
     tools=[AgentTool(get_latest_trending_fashion_news)],
     output_key="trending_info",
 )
+
+# Shares one trends result between every store and session until it expires
+trends_snapshot_agent = TrendsSnapshotAgent(
+    name="TrendingFashionSnapshot",
+    description="Serves the shared global fashion trends snapshot",
+    sub_agents=[trending_fashion_agent],
+)
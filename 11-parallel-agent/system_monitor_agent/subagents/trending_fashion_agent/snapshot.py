@@ -0,0 +1,163 @@
+"""
+Global trends snapshot
+
+The trending fashion questions are global and do not depend on the store, so
+one ``trending_info`` result is shared by every store and session until it
+expires, instead of running the LLM plus google_search round trip per session.
+
+The snapshot is kept in a ``TTLCache`` (memory plus the ``TRENDS_CACHE_PATH``
+SQLite file, default ``trends_cache.db`` in the cache directory, so several
+server processes share it). It is refreshed both on demand, by the first
+session that finds it expired, and on a schedule: ``ensure_trends_refresh``
+starts one ``start_trends_refresh`` task per event loop, which the runners
+of ``app.py`` do before their first run (see ``plugins.TrendsRefreshPlugin``).
+``TRENDS_REFRESH_INTERVAL`` sets the schedule in seconds (default: just
+before the TTL runs out, 0 turns it off).
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from ...cache import TTLCache, cache_path
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_KEY = "trending_info"
+SNAPSHOT_KEY = "global_trends_snapshot"
+
+trends_cache = TTLCache(
+    ttl=float(os.environ.get("TRENDS_SNAPSHOT_TTL", 60 * 60)),
+    path=os.environ.get("TRENDS_CACHE_PATH", cache_path("trends_cache.db")),
+)
+REFRESH_INTERVAL = os.environ.get("TRENDS_REFRESH_INTERVAL")
+
+_refresh_lock: Optional[asyncio.Lock] = None
+_refresh_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_refresh_lock() -> asyncio.Lock:
+    # asyncio locks belong to one event loop, make a new one per loop.
+    global _refresh_lock, _refresh_lock_loop
+    loop = asyncio.get_running_loop()
+    if _refresh_lock is None or _refresh_lock_loop is not loop:
+        _refresh_lock, _refresh_lock_loop = asyncio.Lock(), loop
+    return _refresh_lock
+
+
+def get_snapshot() -> Optional[str]:
+    """Return the current trends snapshot, or None when missing or expired."""
+    return trends_cache.get(SNAPSHOT_KEY)
+
+
+class TrendsSnapshotAgent(BaseAgent):
+    """
+    Serves ``trending_info`` from the shared snapshot.
+
+    On a miss the wrapped trending agent (its only sub-agent) runs inside the
+    current session and its output becomes the new snapshot. Concurrent
+    sessions that miss at the same time wait for that one run.
+    """
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        snapshot = get_snapshot()
+        if snapshot is None:
+            async with _get_refresh_lock():
+                snapshot = get_snapshot()
+                if snapshot is None:
+                    async for event in self.sub_agents[0].run_async(ctx):
+                        if event.actions and event.actions.state_delta.get(OUTPUT_KEY):
+                            snapshot = event.actions.state_delta[OUTPUT_KEY]
+                        yield event
+                    if snapshot:
+                        trends_cache.set(SNAPSHOT_KEY, snapshot)
+                    return
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=snapshot)]),
+            actions=EventActions(state_delta={OUTPUT_KEY: snapshot}),
+        )
+
+
+async def refresh_trends(agent: BaseAgent) -> Optional[str]:
+    """
+    Run ``agent`` (the trending agent) outside any user session and store
+    its ``trending_info`` output as the new snapshot.
+    """
+    runner = InMemoryRunner(agent=agent.clone(), app_name="trends_snapshot")
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="trends_snapshot", session_id=str(uuid.uuid4())
+    )
+    message = types.Content(
+        role="user", parts=[types.Part(text="What are the latest fashion trends?")]
+    )
+    async for _ in runner.run_async(
+        user_id=session.user_id, session_id=session.id, new_message=message
+    ):
+        pass
+
+    session = await runner.session_service.get_session(
+        app_name=runner.app_name, user_id=session.user_id, session_id=session.id
+    )
+    snapshot = session.state.get(OUTPUT_KEY)
+    if snapshot:
+        trends_cache.set(SNAPSHOT_KEY, snapshot)
+    return snapshot
+
+
+def start_trends_refresh(
+    agent: BaseAgent, interval: Optional[float] = None, wait_first: bool = False
+) -> asyncio.Task:
+    """
+    Refresh the snapshot every ``interval`` seconds (default: just before the
+    snapshot TTL runs out) on the running event loop. With ``wait_first`` the
+    first refresh happens after one interval instead of right away.
+    """
+    interval = interval or max(1.0, trends_cache.ttl * 0.9)
+
+    async def loop():
+        if wait_first:
+            await asyncio.sleep(interval)
+        while True:
+            try:
+                async with _get_refresh_lock():
+                    await refresh_trends(agent)
+            except Exception:
+                logger.exception("Refreshing the trends snapshot failed")
+            await asyncio.sleep(interval)
+
+    return asyncio.get_running_loop().create_task(loop(), name="trends-snapshot-refresh")
+
+
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def ensure_trends_refresh(agent: BaseAgent) -> Optional[asyncio.Task]:
+    """
+    Start the scheduled refresh on the running event loop unless it already
+    runs there, or None when ``TRENDS_REFRESH_INTERVAL`` is 0. A fresh
+    snapshot is kept until its next scheduled refresh.
+    """
+    global _refresh_task
+    interval = float(REFRESH_INTERVAL) if REFRESH_INTERVAL is not None else None
+    if interval == 0:
+        return None
+    loop = asyncio.get_running_loop()
+    if _refresh_task is None or _refresh_task.done() or _refresh_task.get_loop() is not loop:
+        _refresh_task = start_trends_refresh(
+            agent, interval, wait_first=get_snapshot() is not None
+        )
+    return _refresh_task
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# Tests import ``system_monitor_agent`` from the 11-parallel-agent directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep the on-disk caches and session databases of the tests out of the tree.
+os.chdir(tempfile.mkdtemp(prefix="fashion-tests-"))
@@ -0,0 +1,76 @@
+import asyncio
+import json
+from typing import AsyncGenerator
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from system_monitor_agent import batch
+
+
+class StoreReport(BaseAgent):
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author="FashionReportSynthesizer",
+            content=types.Content(
+                role="model", parts=[types.Part(text=f"Report for {ctx.session.state['city']}")]
+            ),
+        )
+
+
+def _write(tmp_path, profiles):
+    path = tmp_path / "stores.json"
+    path.write_text(json.dumps(profiles))
+    return str(path)
+
+
+def test_duplicate_store_ids_are_rejected(tmp_path):
+    path = _write(
+        tmp_path,
+        [
+            {"store_name": "Fashion Bug", "city": "Mumbai", "country": "India"},
+            {"store_name": "Fashion  Bug", "city": "mumbai", "country": "India"},
+        ],
+    )
+    with pytest.raises(ValueError, match="same id 'fashion-bug-mumbai'"):
+        batch.load_profiles(path)
+
+
+def test_every_store_gets_its_own_report(tmp_path, capsys):
+    profiles = batch.load_profiles(
+        _write(
+            tmp_path,
+            [
+                {"store_name": "Fashion Bug", "city": "Mumbai", "country": "India"},
+                {"store_name": "Fashion Bug", "city": "Pune", "country": "India"},
+                {"store_id": "fb-3", "store_name": "Fashion Bug", "city": "Pune", "country": "India"},
+            ],
+        )
+    )
+    runner = InMemoryRunner(agent=StoreReport(name="report"), app_name="batch")
+    progress = []
+    out = tmp_path / "reports"
+
+    results = asyncio.run(
+        batch.run_batch(
+            profiles,
+            str(out),
+            concurrency=2,
+            runner=runner,
+            on_result=lambda result, done, total: progress.append((done, total)),
+        )
+    )
+
+    assert sorted(r["store_id"] for r in results) == ["fashion-bug-mumbai", "fashion-bug-pune", "fb-3"]
+    assert all(r["status"] == "ok" for r in results)
+    assert (out / "fashion-bug-mumbai.md").read_text() == "Report for Mumbai"
+    assert (out / "fb-3.md").read_text() == "Report for Pune"
+    assert len((out / "results.jsonl").read_text().splitlines()) == 3
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    # Progress goes to the callback and the log, the library prints nothing.
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,114 @@
+import asyncio
+
+from google.adk.events import Event, EventActions
+from google.genai import types
+from sqlalchemy import text
+
+from system_monitor_agent.sessions import SQLiteSessionService
+
+APP = "fashion"
+PAYLOAD = {"zeta": "z" * 600, "alpha": "a" * 600, "middle": [3, 1, 2]}
+
+
+def _tool_event(invocation_id, response):
+    part = types.Part(
+        function_response=types.FunctionResponse(name="get_retail_data", response=response)
+    )
+    return Event(
+        invocation_id=invocation_id,
+        author="RetailDataAgent",
+        content=types.Content(role="user", parts=[part]),
+        actions=EventActions(state_delta={"retail_data": "r" * 2000}),
+    )
+
+
+def _count(service, table):
+    with service.db_engine.connect() as connection:
+        return connection.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+async def _session_with(service, session_id, response):
+    session = await service.create_session(app_name=APP, user_id="u", session_id=session_id)
+    await service.append_event(session, _tool_event(f"inv-{session_id}", response))
+    await service.flush(APP, "u", session_id)
+
+
+def test_rehydrated_values_keep_their_key_order(tmp_path):
+    service = SQLiteSessionService(f"sqlite:///{tmp_path / 'sessions.db'}", blob_threshold=256)
+
+    async def run():
+        await _session_with(service, "s1", PAYLOAD)
+        return await service.get_session(app_name=APP, user_id="u", session_id="s1")
+
+    session = asyncio.run(run())
+    response = session.events[0].content.parts[0].function_response.response
+    assert response == PAYLOAD
+    assert list(response) == ["zeta", "alpha", "middle"]
+    assert session.events[0].actions.state_delta["retail_data"] == "r" * 2000
+    assert session.state["retail_data"] == "r" * 2000
+
+
+def test_same_value_in_another_key_order_is_stored_once(tmp_path):
+    service = SQLiteSessionService(f"sqlite:///{tmp_path / 'sessions.db'}", blob_threshold=256)
+    reordered = {key: PAYLOAD[key] for key in reversed(list(PAYLOAD))}
+
+    async def run():
+        await _session_with(service, "s1", PAYLOAD)
+        await _session_with(service, "s2", reordered)
+
+    asyncio.run(run())
+    # One blob for the tool response, one for the state value.
+    assert _count(service, "event_blobs") == 2
+
+
+def test_deleting_a_session_deletes_its_own_blobs_only(tmp_path):
+    service = SQLiteSessionService(f"sqlite:///{tmp_path / 'sessions.db'}", blob_threshold=256)
+    other = {"other": "o" * 1000}
+
+    async def run():
+        await _session_with(service, "shared-1", PAYLOAD)
+        await _session_with(service, "shared-2", PAYLOAD)
+        await _session_with(service, "own", other)
+        assert _count(service, "event_blobs") == 3
+
+        await service.delete_session(app_name=APP, user_id="u", session_id="own")
+        assert _count(service, "event_blobs") == 2
+        await service.delete_session(app_name=APP, user_id="u", session_id="shared-1")
+        assert _count(service, "event_blobs") == 2
+        session = await service.get_session(app_name=APP, user_id="u", session_id="shared-2")
+        assert session.events[0].content.parts[0].function_response.response == PAYLOAD
+
+        await service.delete_session(app_name=APP, user_id="u", session_id="shared-2")
+        assert _count(service, "event_blobs") == 0
+        assert _count(service, "event_blob_refs") == 0
+
+        # Deleted blobs are written again when a new event needs them.
+        await _session_with(service, "again", PAYLOAD)
+        session = await service.get_session(app_name=APP, user_id="u", session_id="again")
+        assert session.events[0].content.parts[0].function_response.response == PAYLOAD
+
+    asyncio.run(run())
+
+
+def test_references_of_older_databases_are_recorded(tmp_path):
+    url = f"sqlite:///{tmp_path / 'sessions.db'}"
+    service = SQLiteSessionService(url, blob_threshold=256)
+
+    async def write():
+        await _session_with(service, "old-1", PAYLOAD)
+        await _session_with(service, "old-2", PAYLOAD)
+
+    asyncio.run(write())
+    with service.db_engine.begin() as connection:
+        connection.execute(text("DROP TABLE event_blob_refs"))
+    service.db_engine.dispose()
+
+    reopened = SQLiteSessionService(url, blob_threshold=256)
+    assert _count(reopened, "event_blob_refs") == 4
+
+    async def delete():
+        await reopened.delete_session(app_name=APP, user_id="u", session_id="old-1")
+        return await reopened.get_session(app_name=APP, user_id="u", session_id="old-2")
+
+    session = asyncio.run(delete())
+    assert session.events[0].content.parts[0].function_response.response == PAYLOAD
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+
+from system_monitor_agent import cache as cache_module
+from system_monitor_agent.cache import LRUCache, SingleFlight, TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock.time)
+    cache = TTLCache(ttl=10)
+    cache.set("trends", "denim")
+    cache.set("news", "sale", ttl=30)
+
+    clock.now += 9
+    assert cache.get("trends") == "denim"
+    clock.now += 2
+    assert cache.get("trends") is None
+    assert cache.get("news") == "sale"
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_disk_entries_are_shared_and_expire(monkeypatch, tmp_path):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock.time)
+    path = str(tmp_path / "cache.db")
+    TTLCache(ttl=10, path=path).set(("Mumbai", "India"), {"results": [1, 2]})
+
+    other = TTLCache(ttl=10, path=path)
+    assert other.get(("Mumbai", "India")) == {"results": [1, 2]}
+    clock.now += 11
+    assert TTLCache(ttl=10, path=path).get(("Mumbai", "India")) is None
+
+
+def test_concurrent_misses_share_one_compute():
+    cache = TTLCache(ttl=60)
+    calls = []
+    started = threading.Barrier(8)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return "report"
+
+    def worker(results):
+        started.wait()
+        results.append(cache.get_or_compute("key", compute))
+
+    results = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["report"] * 8
+    assert len(calls) == 1
+    # Later calls are plain hits.
+    assert cache.get_or_compute("key", compute) == "report"
+    assert len(calls) == 1
+
+
+def test_single_flight_shares_the_error_of_the_leader():
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def fail():
+        release.wait()
+        raise RuntimeError("upstream down")
+
+    def worker():
+        try:
+            flight.do("key", fail)
+        except RuntimeError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    assert len({id(error) for error in errors}) == 1
+    # Nothing is left in flight: the next call runs again.
+    assert flight.do("key", lambda: "ok") == "ok"
+
+
+def test_lru_evicts_the_least_recently_used():
+    lru = LRUCache(2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1
+    assert lru.set("c", 3) == [("b", 2)]
+    assert "b" not in lru and lru.get("a") == 1 and lru.get("c") == 3
+    assert lru.evictions == 1
+
+
+def test_cache_files_live_in_the_cache_directory(tmp_path):
+    from system_monitor_agent.plugins.response_cache import DEFAULT_CACHE_PATH
+    from system_monitor_agent.subagents.local_news_agent.tools import news_cache
+    from system_monitor_agent.subagents.retail_data_agent.sql_store import DEFAULT_DB_PATH
+    from system_monitor_agent.subagents.trending_fashion_agent.snapshot import trends_cache
+
+    paths = [DEFAULT_CACHE_PATH, news_cache.path, DEFAULT_DB_PATH, trends_cache.path]
+    assert {os.path.dirname(path) for path in paths} == {cache_module.CACHE_DIR}
+
+    # The directory is created when the first cache file is opened.
+    path = str(tmp_path / "cache" / "news_cache.db")
+    cache = TTLCache(ttl=60, path=path)
+    cache.set("key", "value")
+    assert os.path.exists(path)
@@ -0,0 +1,87 @@
+from system_monitor_agent.subagents.synthesizer_agent.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock):
+    return CircuitBreaker(
+        "test", failure_threshold=3, open_seconds=30, slow_call_seconds=5, clock=clock
+    )
+
+
+def test_opens_after_consecutive_failures_only():
+    breaker = _breaker(Clock())
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success(0.1)
+    breaker.record_failure("timeout")
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_slow_calls_count_as_failures():
+    breaker = _breaker(Clock())
+    for _ in range(3):
+        breaker.record_success(5.0)
+    assert breaker.state == OPEN
+
+
+def test_half_open_lets_one_trial_through():
+    clock = Clock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now = 29.9
+    assert breaker.state == OPEN and not breaker.allow()
+    clock.now = 30.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success(0.2)
+    assert breaker.state == CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_trial_reopens_for_a_full_period():
+    clock = Clock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 31.0
+    assert breaker.allow()
+
+    breaker.record_failure("timeout")
+    assert breaker.state == OPEN
+    clock.now = 60.0
+    assert breaker.state == OPEN
+    clock.now = 61.0
+    assert breaker.state == HALF_OPEN
+
+
+def test_abandoned_trial_frees_the_slot():
+    clock = Clock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 30.0
+    assert breaker.allow()
+    breaker.abandon()
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
@@ -0,0 +1,42 @@
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from system_monitor_agent.compaction import ExtractiveEventSummarizer
+from system_monitor_agent.subagents.synthesizer_agent.prompt_budget import count_tokens
+
+
+def _report(index):
+    return "\n".join(
+        f"Product {index}-{line} sold {line * 7 + index} units in denim and linen"
+        for line in range(40)
+    )
+
+
+def _events(n_facts):
+    events = [
+        Event(
+            author="user",
+            content=types.Content(role="user", parts=[types.Part(text="How can I increase my sales?")]),
+        )
+    ]
+    for i in range(n_facts):
+        events.append(
+            Event(author=f"Agent{i}", actions=EventActions(state_delta={f"fact_{i}": _report(i)}))
+        )
+    return events
+
+
+def test_summary_stays_within_its_total_budget():
+    summarizer = ExtractiveEventSummarizer(fact_tokens=100, summary_tokens=400)
+    summary = summarizer.summarize(_events(12))
+    assert count_tokens(summary) <= 400
+    assert "How can I increase my sales?" in summary
+    for i in range(12):
+        assert f"[fact_{i}]" in summary
+
+
+def test_few_facts_keep_their_own_budget():
+    summarizer = ExtractiveEventSummarizer(fact_tokens=100, summary_tokens=400)
+    budgeted = summarizer.summarize(_events(2))
+    unbounded = ExtractiveEventSummarizer(fact_tokens=100, summary_tokens=10_000)
+    assert budgeted == unbounded.summarize(_events(2))
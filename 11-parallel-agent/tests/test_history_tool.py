@@ -0,0 +1,51 @@
+from system_monitor_agent.subagents.retail_data_agent import history
+from system_monitor_agent.subagents.retail_data_agent.agent import retail_data_agent
+
+
+def test_history_tool_is_only_offered_with_a_history_file():
+    assert not history.has_history()
+    names = [tool.__name__ for tool in retail_data_agent.tools]
+    assert "get_sales_history" not in names
+    assert "get_sales_history" not in retail_data_agent.instruction
+
+
+def test_imported_history_is_found(monkeypatch, tmp_path):
+    source = tmp_path / "sales.csv"
+    source.write_text(
+        "Date,ProductID,Name,Category,UnitsSold,Revenue\n"
+        "2024-01-01,P1,Jacket,Men,2,100.0\n"
+    )
+    path = tmp_path / "sales_history.bin"
+    monkeypatch.setenv("RETAIL_HISTORY_PATH", str(path))
+    assert not history.has_history()
+    history.import_csv(str(source), str(path))
+    assert history.has_history()
+    assert history.get_history().size == 1
+
+
+def test_reimport_leaves_an_open_history_intact(tmp_path):
+    source = tmp_path / "sales.csv"
+    source.write_text(
+        "Date,ProductID,Name,Category,UnitsSold,Revenue\n"
+        "2024-01-01,P1,Jacket,Men,2,100.0\n"
+        "2024-01-02,P2,Dress,Women,1,80.0\n"
+        "2024-01-02,P1,Jacket,Men,1,50.0\n"
+        "2024-01-04,P2,Dress,Women,3,240.0\n"
+    )
+    path = tmp_path / "sales_history.bin"
+    history.import_csv(str(source), str(path))
+    opened = history.SalesHistory(str(path))
+
+    day = history.to_day
+    assert len(opened.window(day("2024-01-02"), day("2024-01-03"))) == 2
+    assert len(opened.window(day("2024-01-01"), day("2024-01-04"))) == 4
+    assert len(opened.window(day("2024-01-03"), day("2024-01-03"))) == 0
+
+    source.write_text(
+        "Date,ProductID,Name,Category,UnitsSold,Revenue\n"
+        "2025-01-01,P3,Scarf,Women,1,20.0\n"
+    )
+    history.import_csv(str(source), str(path))
+    assert opened.summary(day("2024-01-01"), day("2024-01-04"))["Totals"]["Revenue"] == 470.0
+    assert history.SalesHistory(str(path)).size == 1
+    assert not (tmp_path / "sales_history.bin.tmp").exists()
@@ -0,0 +1,71 @@
+import time
+
+from system_monitor_agent.subagents.retail_data_agent import ingest
+from system_monitor_agent.subagents.retail_data_agent.ingest import RollingAggregates
+
+LINES = [
+    "Timestamp,ProductID,Category,UnitsSold,Price",
+    "2025-06-01T10:00:00,P1,Women,2,10.0",
+    "2025-06-01T11:00:00,P2,Men,1,40.0",
+    '{"Date": "2025-06-02", "ProductID": "P1", "UnitsSold": 3, "Revenue": 30}',
+    "not,a,valid,line,at all",
+]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_rolling_aggregates_per_window():
+    aggregates = RollingAggregates()
+    assert ingest.ingest(ingest.parse_lines(LINES), aggregates) == 3
+
+    day = aggregates.snapshot("day")
+    assert day["Period"] == "2025-06-02"
+    assert day["Totals"] == {"UnitsSold": 3, "Revenue": 30.0, "Lines": 1}
+    assert day["PreviousPeriod"] == {"Period": "2025-06-01", "UnitsSold": 3, "Revenue": 60.0}
+
+    month = aggregates.snapshot("month")
+    assert month["Totals"]["Revenue"] == 90.0
+    assert month["TopProducts"][0]["ProductID"] == "P1"
+    assert month["TopProducts"][0]["Category"] == "Women"
+
+
+def test_null_and_wrong_typed_fields_are_skipped():
+    lines = [
+        '{"Date": "2025-06-02", "ProductID": "P1", "UnitsSold": null, "Revenue": 30}',
+        '{"Date": null, "ProductID": "P1", "UnitsSold": 1, "Revenue": 30}',
+        '{"Date": "2025-06-02", "ProductID": "P1", "UnitsSold": [1], "Revenue": 30}',
+        '{"Date": "2025-06-02", "ProductID": "P2", "UnitsSold": 2, "Revenue": 20}',
+    ]
+    assert [t["ProductID"] for t in ingest.parse_lines(lines)] == ["P2"]
+
+
+def test_configured_stream_is_started_once(monkeypatch, tmp_path):
+    source = tmp_path / "pos.csv"
+    source.write_text("\n".join(LINES[:3]) + "\n")
+    aggregates = RollingAggregates()
+    started = []
+    start_ingestion = ingest.start_ingestion
+
+    def start(path, follow=True):
+        started.append(path)
+        return start_ingestion(path, follow=False, aggregates=aggregates)
+
+    monkeypatch.setattr(ingest, "POS_STREAM_SOURCE", str(source))
+    monkeypatch.setattr(ingest, "_configured", None)
+    monkeypatch.setattr(ingest, "start_ingestion", start)
+
+    thread = ingest.start_configured_ingestion()
+    assert ingest.start_configured_ingestion() is thread
+    assert started == [str(source)]
+    assert wait_for(lambda: aggregates.transactions == 2)
+
+
+def test_nothing_is_started_without_a_stream(monkeypatch):
+    monkeypatch.setattr(ingest, "POS_STREAM_SOURCE", "")
+    monkeypatch.setattr(ingest, "_configured", None)
+    assert ingest.start_configured_ingestion() is None
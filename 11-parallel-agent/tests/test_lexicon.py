@@ -0,0 +1,8 @@
+from system_monitor_agent.subagents.trend_match_agent.lexicon import STOPWORDS, tokenize
+
+
+def test_segment_words_are_kept():
+    assert tokenize("Women's floral dresses, kids' sneakers and men's hoodies") == [
+        "women", "floral", "dress", "kid", "sneaker", "men", "hoody"
+    ]
+    assert not {"men", "women", "kid", "unisex"} & STOPWORDS
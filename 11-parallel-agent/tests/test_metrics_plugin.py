@@ -0,0 +1,50 @@
+import asyncio
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from system_monitor_agent.metrics import MetricsRegistry
+from system_monitor_agent.parallel import DeadlineParallelAgent
+from system_monitor_agent.plugins.metrics import IN_FLIGHT, SPAN_DURATION, MetricsPlugin
+
+
+class SleepingAgent(BaseAgent):
+    seconds: float = 0
+
+    async def _run_async_impl(self, ctx):
+        await asyncio.sleep(self.seconds)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text="done")]),
+        )
+
+
+def test_spans_of_a_cancelled_branch_are_closed():
+    registry = MetricsRegistry()
+    plugin = MetricsPlugin(registry=registry)
+    agent = DeadlineParallelAgent(
+        name="gather",
+        default_budget=0.05,
+        sub_agents=[SleepingAgent(name="fast"), SleepingAgent(name="slow", seconds=10)],
+    )
+    runner = InMemoryRunner(agent=agent, app_name="test", plugins=[plugin])
+
+    async def run():
+        session = await runner.session_service.create_session(app_name="test", user_id="u")
+        message = types.Content(role="user", parts=[types.Part(text="go")])
+        async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            pass
+
+    asyncio.run(run())
+    assert plugin._open == {}
+    assert registry.value(IN_FLIGHT, {"kind": "agent"}) == 0
+    spans = {span["name"]: span for span in plugin.spans}
+    assert spans["slow"]["status"] == "cancelled"
+    assert "status" not in spans["fast"]
+    # The cancelled span's duration is not a real one.
+    assert registry.histogram(SPAN_DURATION, {"kind": "agent", "name": "slow"}) is None
+    assert registry.histogram(SPAN_DURATION, {"kind": "agent", "name": "fast"}).count == 1
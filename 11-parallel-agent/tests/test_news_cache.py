@@ -0,0 +1,56 @@
+import pytest
+
+from system_monitor_agent.cache import TTLCache
+from system_monitor_agent.subagents.local_news_agent import tools as news_tools
+
+
+@pytest.fixture
+def news_cache(monkeypatch, tmp_path):
+    cache = TTLCache(ttl=60, path=str(tmp_path / "news_cache.db"))
+    monkeypatch.setattr(news_tools, "news_cache", cache)
+    yield cache
+    news_tools.set_search_provider(news_tools.tavily_search)
+
+
+def test_error_payload_is_not_cached(news_cache):
+    answers = [{"error": "rate limited"}, {"results": [{"title": "Mumbai fashion week"}]}]
+    calls = []
+
+    def provider(query):
+        calls.append(query)
+        return answers[len(calls) - 1]
+
+    news_tools.set_search_provider(provider)
+    with pytest.raises(news_tools.SearchError):
+        news_tools.search_news("Mumbai", "India", "fashion")
+    assert news_tools.cached_news("Mumbai", "India", "fashion") is None
+
+    news = news_tools.search_news("Mumbai", "India", "fashion")
+    assert news == answers[1]
+    # The real result is cached, in memory and on disk.
+    assert news_tools.search_news("Mumbai", "India", "fashion") == answers[1]
+    assert len(calls) == 2
+    assert TTLCache(ttl=60, path=news_cache.path).get(
+        ("Mumbai", "India", "fashion", calls[0])
+    ) == answers[1]
+
+
+def test_results_are_cached_per_location(news_cache):
+    calls = []
+    news_tools.set_search_provider(lambda query: calls.append(query) or {"results": [query]})
+    news_tools.search_news("Mumbai", "India", "fashion")
+    news_tools.search_news("Mumbai", "India", "fashion")
+    news_tools.search_news("Pune", "India", "fashion")
+    assert len(calls) == 2
+
+
+def test_get_or_compute_does_not_cache_exceptions():
+    cache = TTLCache(ttl=60)
+
+    def fail():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("key", fail)
+    assert cache.get_or_compute("key", lambda: "value") == "value"
+    assert cache.get("key") == "value"
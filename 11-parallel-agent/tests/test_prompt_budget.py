@@ -0,0 +1,86 @@
+import pytest
+
+from system_monitor_agent.subagents.synthesizer_agent.prompt_budget import (
+    BudgetedInstruction,
+    allocate,
+    condense,
+    count_tokens,
+    shrink_structured,
+)
+
+
+def test_allocate_hands_unused_share_to_larger_values():
+    shares = allocate({"small": 100, "large": 5000, "medium": 900}, {}, 3000)
+    assert shares["small"] == 100
+    assert shares["medium"] == 900
+    assert shares["large"] == 2000
+
+
+def test_allocate_splits_by_weight_when_nothing_fits():
+    shares = allocate({"retail": 4000, "news": 4000}, {"retail": 3.0, "news": 1.0}, 2000)
+    assert shares == {"retail": 1500, "news": 500}
+
+
+def test_allocate_keeps_values_that_fit():
+    sizes = {"a": 10, "b": 20}
+    assert allocate(sizes, {"a": 5.0}, 100) == sizes
+
+
+def test_condense_keeps_headings_and_informative_lines_in_order():
+    lines = ["# Trends report"]
+    lines += [f"Filler sentence number {word} without much to say." for word in "abcdefghij"]
+    lines.insert(4, "Denim jackets sold 324 units, up 12% month over month.")
+    lines.append("## Outlook")
+    text = "\n".join(lines)
+
+    condensed = condense(text, 40)
+    assert count_tokens(condensed) <= 40
+    kept = condensed.splitlines()
+    assert kept[0] == "# Trends report"
+    assert "## Outlook" in kept
+    assert "Denim jackets sold 324 units, up 12% month over month." in kept
+    assert kept.index("Denim jackets sold 324 units, up 12% month over month.") < kept.index("## Outlook")
+    assert kept[-1].startswith("[condensed: kept")
+
+
+def test_condense_drops_near_duplicates_but_not_different_figures():
+    text = "\n".join(
+        ["Floral dresses are trending in Mumbai this summer season."] * 5
+        + [f"Product P00{i} sold {i * 100} units in June." for i in range(1, 4)]
+    )
+    kept = condense(text, count_tokens(text) - 1).splitlines()
+    assert kept.count("Floral dresses are trending in Mumbai this summer season.") == 1
+    assert sum(line.startswith("Product P00") for line in kept) == 3
+
+
+def test_condense_leaves_short_text_alone():
+    assert condense("Denim is back.", 100) == "Denim is back."
+
+
+def test_shrink_structured_cuts_the_longest_list():
+    value = {"matches": [{"name": f"Product {i}"} for i in range(50)], "note": "ok"}
+    text = shrink_structured(value, 60)
+    assert count_tokens(text) <= 60
+    assert '"note":"ok"' in text
+    assert '"Product 0"' in text and '"Product 49"' not in text
+
+
+def test_budgeted_instruction_fits_state_into_the_budget():
+    instruction = BudgetedInstruction(
+        "Retail:\n{retail_data}\nNews:\n{latest_news?}\nMissing:{other?}",
+        budget=200,
+        weights={"retail_data": 3.0},
+    )
+    state = {
+        "retail_data": "\n".join(f"Product {i} revenue {i * 10}" for i in range(200)),
+        "latest_news": "Monsoon sale starts next week.",
+    }
+    rendered = instruction.render(state)
+    assert "Monsoon sale starts next week." in rendered
+    assert rendered.endswith("Missing:")
+    report = instruction.last_report
+    assert report["keys"]["retail_data"]["injected_tokens"] <= 200
+    assert report["tokens_saved"] > 0
+
+    with pytest.raises(KeyError):
+        BudgetedInstruction("{retail_data}").render({})
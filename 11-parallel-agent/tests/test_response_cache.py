@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from system_monitor_agent.plugins import ResponseCachePlugin
+
+
+def _request(*tools):
+    return LlmRequest(
+        model="gemini-2.0-flash",
+        contents=[types.Content(role="user", parts=[types.Part(text="Latest fashion trends?")])],
+        config=types.GenerateContentConfig(tools=list(tools)),
+    )
+
+
+def _response(text, grounding=None):
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        grounding_metadata=grounding,
+    )
+
+
+async def _call(cache, request, response):
+    context = SimpleNamespace(invocation_id="inv", agent_name="TrendingFashionAgent")
+    cached = await cache.before_model_callback(callback_context=context, llm_request=request)
+    if cached is None:
+        await cache.after_model_callback(callback_context=context, llm_response=response)
+    return cached
+
+
+def test_plain_requests_are_cached():
+    cache = ResponseCachePlugin(disk_size=0)
+
+    async def run():
+        await _call(cache, _request(), _response("Denim is back."))
+        return await _call(cache, _request(), _response("unused"))
+
+    hit = asyncio.run(run())
+    assert hit.content.parts[0].text == "Denim is back."
+    assert cache.stores == 1
+
+
+def test_search_grounded_requests_are_not_cached():
+    cache = ResponseCachePlugin(disk_size=0)
+    search = types.Tool(google_search=types.GoogleSearch())
+
+    async def run():
+        await _call(cache, _request(search), _response("Denim is back."))
+        return await _call(cache, _request(search), _response("Linen is in."))
+
+    assert asyncio.run(run()) is None
+    assert cache.stores == 0
+    assert cache.stats()["misses"] == 0
+
+
+def test_grounded_responses_are_not_stored():
+    cache = ResponseCachePlugin(disk_size=0)
+    grounding = types.GroundingMetadata(web_search_queries=["fashion trends"])
+
+    async def run():
+        await _call(cache, _request(), _response("Denim is back.", grounding))
+        return await _call(cache, _request(), _response("Linen is in."))
+
+    assert asyncio.run(run()) is None
+    assert cache.stores == 1
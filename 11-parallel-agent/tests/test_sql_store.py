@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+from system_monitor_agent.subagents.retail_data_agent import sql_store, store
+
+
+def _line(product_id, month, units, price=10.0):
+    return {
+        "ProductID": product_id,
+        "Name": f"Product {product_id}",
+        "Category": "Women",
+        "Price": price,
+        "UnitsSold": units,
+        "Month": month,
+        "ProfitCategory": "Profitable",
+    }
+
+
+@pytest.fixture
+def data_file(monkeypatch, tmp_path):
+    path = tmp_path / "retail.json"
+    path.write_text(json.dumps([_line("P1", "2025-01", 30), _line("P1", "2025-02", 20)]))
+    monkeypatch.setenv("RETAIL_DATA_PATH", str(path))
+    monkeypatch.setenv("RETAIL_DB_PATH", str(tmp_path / "retail.db"))
+    store.reload_store()
+    yield path
+    monkeypatch.delenv("RETAIL_DATA_PATH")
+    store.reload_store()
+
+
+def test_table_follows_the_loaded_store_not_the_file(data_file):
+    assert sql_store.query_sales()["Count"] == 2
+
+    # The file changes on disk, the loaded store does not: same table.
+    data_file.write_text(json.dumps([_line("P2", "2025-01", 5), _line("P2", "2025-02", 4)]))
+    mtime = os.path.getmtime(data_file) + 10
+    os.utime(data_file, (mtime, mtime))
+    assert [p["ProductID"] for p in sql_store.query_sales()["Products"]] == ["P1", "P1"]
+
+    store.reload_store()
+    assert [p["ProductID"] for p in sql_store.query_sales()["Products"]] == ["P2", "P2"]
+
+
+def test_top_k_counts_product_month_lines(data_file):
+    page = sql_store.query_sales(top_k=1)
+    assert page["Count"] == 1
+    assert page["Products"][0]["Month"] == "2025-01"
+    assert page["NextCursor"] is None
+
+
+def test_cursor_is_bound_to_its_filters(data_file):
+    first = sql_store.query_sales(category="Women", page_size=1)
+    cursor = first["NextCursor"]
+    second = sql_store.query_sales(category="Women", page_size=1, cursor=cursor)
+    assert [p["Month"] for p in first["Products"] + second["Products"]] == ["2025-01", "2025-02"]
+
+    with pytest.raises(ValueError, match="other filters"):
+        sql_store.query_sales(category="Men", page_size=1, cursor=cursor)
+    with pytest.raises(ValueError, match="other filters"):
+        sql_store.query_sales(category="Women", month_from="2025-02", page_size=1, cursor=cursor)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        sql_store.query_sales(cursor="1:2.0:3")
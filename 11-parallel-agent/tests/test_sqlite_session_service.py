@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+
+from google.adk.events import Event, EventActions
+from google.genai import types
+from sqlalchemy import text
+
+from system_monitor_agent.sessions import SQLiteSessionService
+
+APP = "fashion"
+
+
+def _event(invocation_id, text_value, partial=False, **state):
+    return Event(
+        invocation_id=invocation_id,
+        author="RetailDataAgent",
+        partial=partial,
+        content=types.Content(role="model", parts=[types.Part(text=text_value)]),
+        actions=EventActions(state_delta=state),
+    )
+
+
+def _stored_events(service):
+    with service.db_engine.connect() as connection:
+        return connection.execute(text("SELECT COUNT(*) FROM events")).scalar()
+
+
+def _service(tmp_path, **kwargs):
+    return SQLiteSessionService(f"sqlite:///{tmp_path / 'sessions.db'}", **kwargs)
+
+
+def test_events_of_an_invocation_are_committed_together(tmp_path):
+    service = _service(tmp_path, flush_delay=60)
+
+    async def run():
+        session = await service.create_session(app_name=APP, user_id="u", session_id="s")
+        await service.append_event(session, _event("inv-1", "retail", retail_data="ok"))
+        await service.append_event(session, _event("inv-1", "part", partial=True))
+        await service.append_event(session, _event("inv-1", "trends", trending_info="denim"))
+        # Buffered, but the caller's session is up to date.
+        assert _stored_events(service) == 0
+        assert len(session.events) == 2
+        assert session.state["trending_info"] == "denim"
+
+        # A new invocation commits the previous one first.
+        await service.append_event(session, _event("inv-2", "news"))
+        assert _stored_events(service) == 2
+        await service.flush(APP, "u", "s")
+        assert _stored_events(service) == 3
+
+    asyncio.run(run())
+
+
+def test_reads_see_buffered_events(tmp_path):
+    service = _service(tmp_path, flush_delay=60)
+
+    async def run():
+        session = await service.create_session(app_name=APP, user_id="u", session_id="s")
+        await service.append_event(session, _event("inv-1", "retail", retail_data="ok"))
+        return await service.get_session(app_name=APP, user_id="u", session_id="s")
+
+    session = asyncio.run(run())
+    assert [event.content.parts[0].text for event in session.events] == ["retail"]
+    assert session.state["retail_data"] == "ok"
+
+
+def test_batch_size_and_delay_force_a_commit(tmp_path):
+    service = _service(tmp_path, max_batch=2, flush_delay=0.05)
+
+    async def run():
+        session = await service.create_session(app_name=APP, user_id="u", session_id="s")
+        await service.append_event(session, _event("inv-1", "one"))
+        await service.append_event(session, _event("inv-1", "two"))
+        assert _stored_events(service) == 2
+        await service.append_event(session, _event("inv-1", "three"))
+        assert _stored_events(service) == 2
+        await asyncio.sleep(0.2)
+        assert _stored_events(service) == 3
+
+    asyncio.run(run())
+
+
+def test_close_commits_what_is_left(tmp_path):
+    service = _service(tmp_path, flush_delay=60)
+
+    async def run():
+        session = await service.create_session(app_name=APP, user_id="u", session_id="s")
+        await service.append_event(session, _event("inv-1", "retail"))
+
+    asyncio.run(run())
+    assert _stored_events(service) == 0
+    service.close()
+    assert _stored_events(service) == 1
+
+
+def test_large_values_are_rehydrated_from_blobs(tmp_path):
+    service = _service(tmp_path, blob_threshold=256)
+    report = "## Report\n" + "Denim jackets lead the season. " * 40
+
+    async def run():
+        session = await service.create_session(app_name=APP, user_id="u", session_id="s")
+        await service.append_event(session, _event("inv-1", report, synthesis=report))
+        await service.flush(APP, "u", "s")
+        return await service.get_session(app_name=APP, user_id="u", session_id="s")
+
+    session = asyncio.run(run())
+    with service.db_engine.connect() as connection:
+        stored = connection.execute(text("SELECT content FROM events")).scalar()
+        blobs = connection.execute(text("SELECT COUNT(*) FROM event_blobs")).scalar()
+    assert "__blob__" in stored and report not in stored
+    # The text and the equal state value share one blob.
+    assert blobs == 1
+    assert session.events[0].content.parts[0].text == report
+    assert session.events[0].actions.state_delta["synthesis"] == report
+    assert session.state["synthesis"] == report
+
+
+def test_reads_do_not_wait_for_commits(tmp_path):
+    service = _service(tmp_path, flush_delay=60)
+
+    async def run():
+        session = await service.create_session(app_name=APP, user_id="u", session_id="s")
+        await service.append_event(session, _event("inv-1", "retail", retail_data="ok"))
+        # Hold the write lock, as a long commit of another session would.
+        service._write_lock.acquire()
+        try:
+            commit = asyncio.ensure_future(service.flush(APP, "u", "s"))
+            await asyncio.sleep(0.05)
+            assert not commit.done()
+            read = await asyncio.wait_for(
+                service.get_session(app_name=APP, user_id="u", session_id="s"), 1
+            )
+        finally:
+            service._write_lock.release()
+        await commit
+        return read
+
+    session = asyncio.run(run())
+    assert [event.content.parts[0].text for event in session.events] == ["retail"]
+    assert session.state["retail_data"] == "ok"
+
+
+def test_appending_to_a_stale_session_fails(tmp_path):
+    service = _service(tmp_path, flush_delay=60)
+
+    async def run():
+        await service.create_session(app_name=APP, user_id="u", session_id="s")
+        first = await service.get_session(app_name=APP, user_id="u", session_id="s")
+        second = await service.get_session(app_name=APP, user_id="u", session_id="s")
+        await service.append_event(first, _event("inv-1", "first", report="first"))
+        with pytest.raises(ValueError, match="stale session"):
+            await service.append_event(second, _event("inv-2", "second", report="second"))
+        # A session read after the append is current.
+        third = await service.get_session(app_name=APP, user_id="u", session_id="s")
+        await service.append_event(third, _event("inv-3", "third", report="third"))
+        await service.flush(APP, "u", "s")
+        return await service.get_session(app_name=APP, user_id="u", session_id="s")
+
+    session = asyncio.run(run())
+    assert [event.content.parts[0].text for event in session.events] == ["first", "third"]
+    assert session.state["report"] == "third"
+
+
+def test_commit_over_another_writer_fails(tmp_path):
+    url = f"sqlite:///{tmp_path / 'sessions.db'}"
+    service, other = SQLiteSessionService(url, flush_delay=60), SQLiteSessionService(url)
+
+    async def run():
+        await service.create_session(app_name=APP, user_id="u", session_id="s")
+        mine = await service.get_session(app_name=APP, user_id="u", session_id="s")
+        theirs = await other.get_session(app_name=APP, user_id="u", session_id="s")
+        # SQLite stores update times with one-second resolution.
+        await asyncio.sleep(1.1)
+        await other.append_event(theirs, _event("inv-1", "theirs", report="theirs"))
+        await other.flush(APP, "u", "s")
+
+        await service.append_event(mine, _event("inv-2", "mine", report="mine"))
+        with pytest.raises(ValueError, match="stale session"):
+            await service.flush(APP, "u", "s")
+        return await other.get_session(app_name=APP, user_id="u", session_id="s")
+
+    session = asyncio.run(run())
+    assert session.state["report"] == "theirs"
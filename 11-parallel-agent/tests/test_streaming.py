@@ -0,0 +1,57 @@
+import asyncio
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from system_monitor_agent.streaming import stream_report
+
+# (author, text, partial) in the order the agents produce them.
+SCRIPT = [
+    ("RetailDataAgent", "retail data", False),
+    ("FashionReportSynthesizer", "## Report ", True),
+    ("remote_news_agent", "News: ", True),
+    ("FashionReportSynthesizer", "## Report ", False),
+    ("remote_news_agent", "festival sale", True),
+    ("remote_news_agent", "News: festival sale", False),
+    ("remote_news_a2a_agent", " from the A2A server", False),
+]
+
+
+class ScriptedEvents(BaseAgent):
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        for author, text, partial in SCRIPT:
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=author,
+                partial=partial,
+                content=types.Content(role="model", parts=[types.Part(text=text)]),
+            )
+
+
+async def collect():
+    runner = InMemoryRunner(agent=ScriptedEvents(name="scripted"), app_name="streaming")
+    return [
+        chunk
+        async for chunk in stream_report(runner, "How can I increase my sales?", "u", "s")
+    ]
+
+
+def test_forwards_synthesizer_and_news_agents_once():
+    chunks = asyncio.run(collect())
+    deltas = [(c["author"], c["text"]) for c in chunks if c["type"] == "delta"]
+    assert deltas == [
+        ("FashionReportSynthesizer", "## Report "),
+        ("remote_news_agent", "News: "),
+        ("remote_news_agent", "festival sale"),
+        ("remote_news_a2a_agent", " from the A2A server"),
+    ]
+    done = chunks[-1]
+    assert done["type"] == "done"
+    assert done["chars"] == sum(len(text) for _, text in deltas)
+    assert 0 <= done["ttft_s"] <= done["ttlt_s"]
+    # Agents outside the report still show up as progress.
+    assert {"type": "agent", "author": "RetailDataAgent"} in chunks
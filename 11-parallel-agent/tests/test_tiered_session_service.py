@@ -0,0 +1,58 @@
+import asyncio
+import inspect
+
+import pytest
+from google.adk.events import Event, EventActions
+from google.adk.sessions import BaseSessionService
+from google.genai import types
+
+from system_monitor_agent.sessions import SQLiteSessionService, TieredSessionService
+
+APP = "fashion"
+
+
+def _event(invocation_id, text):
+    return Event(
+        invocation_id=invocation_id,
+        author="FashionReportSynthesizer",
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta={"report": text}),
+    )
+
+
+def test_evicted_session_keeps_its_buffered_events(tmp_path):
+    disk = SQLiteSessionService(f"sqlite:///{tmp_path / 'sessions.db'}", flush_delay=60)
+    service = TieredSessionService(disk, max_sessions=1)
+
+    async def run():
+        first = await service.create_session(app_name=APP, user_id="u", session_id="first")
+        await service.append_event(first, _event("inv-1", "first report"))
+        # Still buffered in the SQLite tier when the memory tier evicts it.
+        assert disk._pending
+        await service.create_session(app_name=APP, user_id="u", session_id="second")
+        assert service.stats()["evictions"] == 1
+        return await service.get_session(app_name=APP, user_id="u", session_id="first")
+
+    session = asyncio.run(run())
+    assert service.misses == 1
+    assert [event.content.parts[0].text for event in session.events] == ["first report"]
+    assert session.state["report"] == "first report"
+
+
+def test_delete_session_is_keyword_only_like_the_base_service(tmp_path):
+    disk = SQLiteSessionService(f"sqlite:///{tmp_path / 'sessions.db'}")
+    service = TieredSessionService(disk)
+    def kinds(method):
+        return [(p.name, p.kind) for p in inspect.signature(method).parameters.values()]
+
+    for implementation in (SQLiteSessionService, TieredSessionService):
+        assert kinds(implementation.delete_session) == kinds(BaseSessionService.delete_session)
+
+    async def run():
+        await service.create_session(app_name=APP, user_id="u", session_id="s")
+        with pytest.raises(TypeError):
+            await disk.delete_session(APP, "u", "s")
+        await service.delete_session(app_name=APP, user_id="u", session_id="s")
+        return await service.get_session(app_name=APP, user_id="u", session_id="s")
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from system_monitor_agent import app
+from system_monitor_agent.cache import TTLCache
+from system_monitor_agent.subagents.trending_fashion_agent import snapshot
+
+
+@pytest.fixture
+def refreshes(monkeypatch, tmp_path):
+    monkeypatch.setattr(snapshot, "trends_cache", TTLCache(ttl=60, path=str(tmp_path / "trends.db")))
+    monkeypatch.setattr(snapshot, "REFRESH_INTERVAL", "0.05")
+    monkeypatch.setattr(snapshot, "_refresh_task", None)
+    calls = []
+
+    async def refresh_trends(agent):
+        calls.append(agent.name)
+        snapshot.trends_cache.set(snapshot.SNAPSHOT_KEY, f"trends {len(calls)}")
+
+    monkeypatch.setattr(snapshot, "refresh_trends", refresh_trends)
+    return calls
+
+
+def test_runner_plugins_schedule_the_refresh(refreshes):
+    plugin = app.get_trends_refresh()
+    assert plugin in app.get_plugins()
+
+    async def run():
+        await plugin.before_run_callback(invocation_context=None)
+        await asyncio.sleep(0)
+        task = snapshot._refresh_task
+        await plugin.before_run_callback(invocation_context=None)
+        assert snapshot._refresh_task is task
+        await asyncio.sleep(0.12)
+        task.cancel()
+
+    asyncio.run(run())
+    # Missing snapshot: refreshed right away, then on schedule.
+    assert len(refreshes) >= 2
+    assert snapshot.get_snapshot() == f"trends {len(refreshes)}"
+
+
+def test_fresh_snapshot_waits_for_the_schedule(refreshes):
+    snapshot.trends_cache.set(snapshot.SNAPSHOT_KEY, "cached trends")
+
+    async def run():
+        task = snapshot.ensure_trends_refresh(app.get_trends_refresh().agent)
+        await asyncio.sleep(0.01)
+        assert refreshes == []
+        task.cancel()
+
+    asyncio.run(run())
+    assert snapshot.get_snapshot() == "cached trends"
+
+
+def test_refresh_can_be_turned_off(refreshes, monkeypatch):
+    monkeypatch.setattr(snapshot, "REFRESH_INTERVAL", "0")
+
+    async def run():
+        return snapshot.ensure_trends_refresh(app.get_trends_refresh().agent)
+
+    assert asyncio.run(run()) is None
@@ -1,63 +1,157 @@
-import json
-import requests
+"""
+A2A Server Launcher
+
+Serves the news agent of ``agent.py`` (``agent:app``) with uvicorn, in as
+many worker processes as asked, so the remote news agent can answer many
+synthesizer callers at once.
+
+The launcher polls the agent card with a short exponential backoff and
+reports how long the server took to become ready. On Ctrl+C or SIGTERM it
+asks uvicorn to shut down gracefully (in-flight requests finish) and only
+kills it after the grace period.
+
+Usage::
+
+    python a2a_server.py --port 8001 --workers 4
+"""
+
+import argparse
+import os
+import signal
 import subprocess
+import sys
 import time
-import uuid
-import os
+from typing import Optional, Tuple
+
+import httpx
+
+AGENT_CARD_PATH = "/.well-known/agent-card.json"
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_HOST = os.environ.get("A2A_HOST", "localhost")
+DEFAULT_PORT = int(os.environ.get("A2A_PORT", "8001"))
+DEFAULT_WORKERS = int(os.environ.get("A2A_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+def wait_until_ready(
+    url: str,
+    process: subprocess.Popen,
+    timeout: float = 60.0,
+    first_delay: float = 0.05,
+    max_delay: float = 1.0,
+) -> bool:
+    """
+    Poll ``url`` until it answers 200, backing off from ``first_delay`` up to
+    ``max_delay`` seconds. Returns False on timeout or if ``process`` exits.
+    """
+    deadline = time.monotonic() + timeout
+    delay = first_delay
+    with httpx.Client(timeout=1.0) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                return False
+            try:
+                if client.get(url).status_code == 200:
+                    return True
+            except httpx.HTTPError:
+                pass
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, max_delay)
+    return False
+
 
-from google.adk.agents import LlmAgent
-from google.adk.tools import google_search
-from google.adk.agents.remote_a2a_agent import (
-    RemoteA2aAgent,
-    AGENT_CARD_WELL_KNOWN_PATH,
-)
-
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
-from google.adk.models.google_llm import Gemini
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
-
-# Hide additional warnings in the notebook
-import warnings
-
-os.environ["GOOGLE_API_KEY"] = "<api-key>"
-
-server_process = subprocess.Popen(
-    [
-        "uvicorn",
-        "agent:app",  # Module:app format
-        "--host",
-        "localhost",
-        "--port",
-        "8001",
-    ],
-    cwd=".",  # Run from /tmp where the file is
-    stdout=subprocess.PIPE,
-    stderr=subprocess.PIPE,
-    env={**os.environ},  # Pass environment variables (including GOOGLE_API_KEY)
-)
-
-print("🚀 Starting Product Catalog Agent server...")
-print("   Waiting for server to be ready...")
-
-# Wait for server to start (poll until it responds)
-max_attempts = 30
-for attempt in range(max_attempts):
+def start_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = DEFAULT_WORKERS,
+    startup_timeout: float = 60.0,
+    graceful_timeout: float = 10.0,
+    quiet: bool = False,
+) -> Tuple[subprocess.Popen, Optional[float]]:
+    """
+    Start uvicorn serving ``agent:app`` and wait until the agent card answers.
+
+    Returns:
+        (process, startup seconds), the seconds being None if the server did
+        not become ready within ``startup_timeout``.
+    """
+    env = {
+        **os.environ,
+        # agent.py puts these in the agent card URL.
+        "A2A_HOST": host,
+        "A2A_PORT": str(port),
+    }
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "agent:app",
+            "--app-dir", HERE,
+            "--host", host,
+            "--port", str(port),
+            "--workers", str(workers),
+            "--timeout-graceful-shutdown", str(int(graceful_timeout)),
+        ],
+        cwd=HERE,
+        env=env,
+        # Inherit the output unless quiet: an unread pipe would fill up and
+        # block the server.
+        stdout=subprocess.DEVNULL if quiet else None,
+        stderr=subprocess.DEVNULL if quiet else None,
+    )
+    ready = wait_until_ready(f"http://{host}:{port}{AGENT_CARD_PATH}", process, startup_timeout)
+    return process, (time.perf_counter() - started) if ready else None
+
+
+def stop_server(process: subprocess.Popen, graceful_timeout: float = 10.0) -> int:
+    """SIGTERM the server, then SIGKILL it if it is still up after the grace period."""
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=graceful_timeout + 5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    return process.returncode
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--graceful-timeout", type=float, default=10.0)
+    parser.add_argument("--quiet", action="store_true", help="hide the uvicorn output")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GOOGLE_API_KEY", "<api-key>")
+
+    print(f"🚀 Starting news agent server with {args.workers} worker(s)...")
+    process, startup = start_server(
+        args.host, args.port, args.workers, args.startup_timeout, args.graceful_timeout, args.quiet
+    )
+    if startup is None:
+        print("\n⚠️  Server did not become ready, stopping it.")
+        stop_server(process, args.graceful_timeout)
+        return 1
+
+    print(f"\n✅ News agent server is running! (ready in {startup:.2f}s)")
+    print(f"   Server URL: http://{args.host}:{args.port}")
+    print(f"   Agent card: http://{args.host}:{args.port}{AGENT_CARD_PATH}")
+
+    def shutdown(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, shutdown)
     try:
-        response = requests.get(
-            "http://localhost:8001/.well-known/agent-card.json", timeout=1
-        )
-        if response.status_code == 200:
-            print(f"\n✅ Product Catalog Agent server is running!")
-            print(f"   Server URL: http://localhost:8001")
-            print(f"   Agent card: http://localhost:8001/.well-known/agent-card.json")
-            break
-    except requests.exceptions.RequestException:
-        time.sleep(5)
-        print(".", end="", flush=True)
-else:
-    print("\n⚠️  Server may not be ready yet. Check manually if needed.")
-
-# Store the process so we can stop it later
-globals()["product_catalog_server_process"] = server_process
\ No newline at end of file
+        return process.wait()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down (waiting for in-flight requests)...")
+        started = time.perf_counter()
+        code = stop_server(process, args.graceful_timeout)
+        print(f"   Stopped in {time.perf_counter() - started:.2f}s")
+        return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
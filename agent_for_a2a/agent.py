@@ -21,10 +21,12 @@ import os
 # Hide additional warnings in the notebook
 import warnings
 
+from response_cache import CachedAgent
+
 os.environ["GOOGLE_API_KEY"] = "<api-key>"
 
-agent_for_a2a = Agent(
-    name="agent_for_a2a",
+news_agent = Agent(
+    name="news_agent",
     model="gemini-2.0-flash",
     description="Agent to fetch latest news",
     instruction=""" You are an agent fetches local news in the city.
@@ -39,20 +41,32 @@ agent_for_a2a = Agent(
     tools=[google_search],
 )
 
+# Identical requests share one run of news_agent and repeats are answered
+# from cache for A2A_CACHE_TTL seconds (see response_cache.py)
+agent_for_a2a = CachedAgent(
+    name="agent_for_a2a",
+    description="Agent to fetch latest news",
+    sub_agents=[news_agent],
+)
+
 # Convert the agent to an A2A-compatible application
 # This creates a FastAPI/Starlette app that:
 #   1. Serves the agent at the A2A protocol endpoints
 #   2. Provides an auto-generated agent card
 #   3. Handles A2A communication protocol
+# Host and port come from the launcher (a2a_server.py) when it starts uvicorn
+A2A_HOST = os.environ.get("A2A_HOST", "localhost")
+A2A_PORT = int(os.environ.get("A2A_PORT", "8001"))
+
 agent_for_a2a_app = to_a2a(
-    agent_for_a2a, port=8001  # Port where this agent will be served
+    agent_for_a2a, host=A2A_HOST, port=A2A_PORT  # Where this agent will be served
 )
 
 # 👇 REQUIRED: Uvicorn expects this name
 app = agent_for_a2a_app
 
 print("✅ Product Catalog Agent is now A2A-compatible!")
-print("   Agent will be served at: http://localhost:8001")
-print("   Agent card will be at: http://localhost:8001/.well-known/agent-card.json")
+print(f"   Agent will be served at: http://{A2A_HOST}:{A2A_PORT}")
+print(f"   Agent card will be at: http://{A2A_HOST}:{A2A_PORT}/.well-known/agent-card.json")
 
 print("   Ready to start the server...")
@@ -0,0 +1,137 @@
+"""
+Response cache and request coalescing for the A2A news server
+
+``CachedAgent`` sits in front of the news agent. Requests are keyed on
+their normalized text (case and whitespace do not matter):
+
+- a repeat of a request answered less than ``ttl`` seconds ago is answered
+  from the cache, without a model call or a search;
+- identical requests arriving while the first one is still running wait for
+  it and share its answer, so N concurrent callers cost one execution.
+
+If the first execution fails or is cancelled, the callers waiting on it run
+the agent themselves. The cache lives in the worker process, so with
+several uvicorn workers each worker has its own.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+from pydantic import PrivateAttr
+
+CACHE_TTL = float(os.environ.get("A2A_CACHE_TTL", "600"))
+CACHE_SIZE = int(os.environ.get("A2A_CACHE_SIZE", "256"))
+
+
+def request_key(content: Optional[types.Content]) -> str:
+    """Cache key of a request: hash of its text, lowercased, whitespace collapsed."""
+    text = " ".join(part.text for part in (content.parts if content else None) or [] if part.text)
+    normalized = re.sub(r"\s+", " ", text).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class CachedAgent(BaseAgent):
+    """
+    Runs its only sub-agent once per distinct request within ``ttl`` seconds.
+
+    Attributes:
+        ttl: seconds an answer is served from the cache.
+        max_entries: answers kept; the least recently used go first.
+    """
+
+    ttl: float = CACHE_TTL
+    max_entries: int = CACHE_SIZE
+
+    # key -> (stored at, answer parts)
+    _answers: "OrderedDict[str, Tuple[float, List[types.Part]]]" = PrivateAttr(
+        default_factory=OrderedDict
+    )
+    _in_flight: Dict[str, asyncio.Future] = PrivateAttr(default_factory=dict)
+    _stats: Dict[str, int] = PrivateAttr(
+        default_factory=lambda: {"hits": 0, "misses": 0, "coalesced": 0}
+    )
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and coalesced request counters."""
+        return {**self._stats, "entries": len(self._answers), "in_flight": len(self._in_flight)}
+
+    def _lookup(self, key: str) -> Optional[List[types.Part]]:
+        entry = self._answers.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._answers[key]
+            return None
+        self._answers.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key: str, parts: List[types.Part]) -> None:
+        self._answers[key] = (time.monotonic(), parts)
+        self._answers.move_to_end(key)
+        while len(self._answers) > self.max_entries:
+            self._answers.popitem(last=False)
+
+    def _answer(self, ctx: InvocationContext, parts: List[types.Part], source: str) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.sub_agents[0].name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[part.model_copy() for part in parts]),
+            custom_metadata={"response_cache": source},
+        )
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        key = request_key(ctx.user_content)
+
+        parts = self._lookup(key)
+        if parts is not None:
+            self._stats["hits"] += 1
+            yield self._answer(ctx, parts, "hit")
+            return
+
+        while key in self._in_flight:
+            leader = self._in_flight[key]
+            # Our own cancellation propagates; a failed leader does not, the
+            # first waiter to wake up runs the agent instead.
+            await asyncio.wait({leader})
+            if not leader.cancelled() and leader.exception() is None and leader.result():
+                self._stats["coalesced"] += 1
+                yield self._answer(ctx, leader.result(), "coalesced")
+                return
+
+        self._stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        agent = self.sub_agents[0]
+        parts = None
+        try:
+            async for event in agent.run_async(ctx):
+                if (
+                    event.author == agent.name
+                    and event.is_final_response()
+                    and not event.error_message
+                    and event.content
+                    and any(part.text for part in event.content.parts or [])
+                ):
+                    parts = [part for part in event.content.parts if part.text]
+                yield event
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._in_flight[key]
+
+        if parts:
+            self._store(key, parts)
+        future.set_result(parts)